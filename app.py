@@ -1,19 +1,13 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
 from pathlib import Path
 import sys
-import requests
 import json
 
 # Add modules to path
 sys.path.append(str(Path(__file__).parent))
 
-from modules.psychometric_engine import PsychometricAssessment
-from modules.recommendation_engine import RecommendationEngine
-from modules.roi_calculator import ROICalculator
-from modules.uk_programmes import get_programmes_for_pathway
-from modules.uk_careers import get_careers_for_field
+# pandas, plotly, requests and the engines are imported by the step that needs them -
+# the landing page never does, so a fresh worker starts without them
 
 # ============= GOOGLE SHEETS INTEGRATION =============
 # Replace this URL with your Google Apps Script Web App URL
@@ -22,6 +16,8 @@ GOOGLE_SHEETS_URL = "https://script.google.com/macros/s/YOUR_DEPLOYMENT_ID/exec"
 def capture_email_to_sheet(email, name="", interest="", budget="", capture_point="", recommended_pathway="", roi_result=""):
     """Send email data to Google Sheets"""
     try:
+        import requests
+        
         payload = {
             "email": email,
             "name": name,
@@ -170,6 +166,65 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# ============= SHARED RESOURCES & CACHED COMPUTATIONS =============
+# Engines are built once per process and shared by every session and rerun;
+# pure computations are memoised on their inputs in bounded caches
+
+@st.cache_resource
+def get_assessment():
+    """Question bank and scoring rules (read-only)"""
+    from modules.psychometric_engine import PsychometricAssessment
+    return PsychometricAssessment()
+
+@st.cache_resource
+def get_recommender():
+    """Pathway rules (read-only)"""
+    from modules.recommendation_engine import RecommendationEngine
+    return RecommendationEngine()
+
+@st.cache_resource
+def get_roi_calculator():
+    """Shared calculator - it hot-swaps a newly calibrated salary table by itself"""
+    from modules.roi_calculator import ROICalculator
+    return ROICalculator()
+
+@st.cache_resource(max_entries=4)
+def get_adzuna_client(app_id, api_key, cache_ttl_hours, base_url=None):
+    """One Adzuna client per credentials/config, reusing its connection pool across reruns"""
+    from modules.adzuna_api import AdzunaAPI
+    from modules.adzuna_cache import get_shared_cache
+    from modules.job_history import get_shared_history
+    from modules.quota_scheduler import get_shared_scheduler
+    
+    return AdzunaAPI(
+        app_id,
+        api_key,
+        cache=get_shared_cache(ttl_seconds=cache_ttl_hours * 3600),
+        history=get_shared_history(),
+        base_url=base_url,
+        scheduler=get_shared_scheduler()
+    )
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def cached_cv_insights(text):
+    from modules.cv_analyzer import get_cv_insights
+    return get_cv_insights(text)
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def cached_merge_cv_with_quiz(quiz_scores, cv_text):
+    from modules.cv_analyzer import merge_cv_with_quiz
+    return merge_cv_with_quiz(quiz_scores, cv_text)
+
+@st.cache_data(max_entries=1024, show_spinner=False)
+def cached_recommendation(scores, budget, current_income):
+    """Keyed on the only profile fields the rules read - no names or emails in the cache"""
+    return get_recommender().get_recommendation(scores, {'budget': budget, 'current_income': current_income})
+
+@st.cache_data(max_entries=1024, show_spinner=False)
+def cached_roi_by_pathway(budget, current_income, field, country, salary_table_version):
+    """salary_table_version is part of the key so a newly published table isn't served stale"""
+    return get_roi_calculator().calculate_all_pathways(budget, current_income, field, country)
+
 def initialize_session_state():
     """Initialize session state variables"""
     if 'assessment_complete' not in st.session_state:
@@ -537,10 +592,8 @@ Tell us about:
         
         if user_text and len(user_text.strip()) > 20:
             # Show quick preview
-            from modules.cv_analyzer import get_cv_insights
-            
             with st.spinner("Analyzing your experience..."):
-                cv_analysis = get_cv_insights(user_text)
+                cv_analysis = cached_cv_insights(user_text)
                 
                 if cv_analysis['total_matches'] > 0:
                     st.success(f"✅ Found {cv_analysis['total_matches']} relevant skills/experiences!")
@@ -595,10 +648,8 @@ Tell us about:
                     st.success(f"✅ CV uploaded! Extracted {len(cv_text.split())} words")
                     
                     # Analyze the CV
-                    from modules.cv_analyzer import get_cv_insights
-                    
                     with st.spinner("Analyzing your CV..."):
-                        cv_analysis = get_cv_insights(cv_text)
+                        cv_analysis = cached_cv_insights(cv_text)
                         
                         if cv_analysis['total_matches'] > 0:
                             st.success(f"🎯 Found {cv_analysis['total_matches']} relevant skills/experiences in your CV!")
@@ -623,7 +674,7 @@ Tell us about:
     
     st.markdown("---")
     
-    assessment = PsychometricAssessment()
+    assessment = get_assessment()
     
     with st.form("psychometric_form"):
         responses = {}
@@ -650,9 +701,7 @@ Tell us about:
             
             if user_text and len(user_text.strip()) > 20:
                 # Merge quiz scores with CV text analysis
-                from modules.cv_analyzer import merge_cv_with_quiz
-                
-                merged_scores, cv_analysis = merge_cv_with_quiz(base_scores, user_text)
+                merged_scores, cv_analysis = cached_merge_cv_with_quiz(base_scores, user_text)
                 
                 # Store both for results page
                 st.session_state.assessment_scores = merged_scores
@@ -676,7 +725,12 @@ Tell us about:
             st.rerun()
 
 def render_results():
-    """Render results with ROI analysis, programmes, and careers"""
+    """
+    Render results with ROI analysis, programmes, and careers
+    
+    Every section is a fragment: a widget only reruns its own section, not the
+    recommendation, ROI model, charts and job market lookups around it
+    """
     st.markdown('<div style="text-align: center; padding: 2rem 0;"><div style="display: inline-block; padding: 0.5rem 1.5rem; background: #e8f5e9; border-radius: 20px; color: #2e7d32;">✅ Step 3 of 3: Your Complete Results</div></div>', unsafe_allow_html=True)
     
     user_data = st.session_state.user_data
@@ -698,7 +752,33 @@ def render_results():
     </div>
     """, unsafe_allow_html=True)
     
-    # Psychometric Profile
+    recommendation = cached_recommendation(scores, user_data['budget'], user_data['current_income'])
+    roi_data = get_results_roi(user_data)
+    
+    render_profile_section(scores)
+    render_roi_section(recommendation, roi_data)
+    render_programmes_section(user_data, scores, recommendation)
+    render_careers_section(user_data)
+    render_catalog_search_section()
+    render_outcome_consent_section(user_data, scores, recommendation, roi_data)
+    render_email_capture_section(user_data, recommendation, roi_data)
+    render_action_buttons()
+
+def get_results_roi(user_data):
+    """ROI for every pathway - memoised per profile and salary table version"""
+    roi_calc = get_roi_calculator()
+    roi_calc.refresh_salary_table()
+    return cached_roi_by_pathway(
+        user_data['budget'], 
+        user_data['current_income'], 
+        user_data['interests'][0] if user_data['interests'] else 'Technology & Software', 
+        user_data['target_country'],
+        roi_calc.salary_table_version
+    )
+
+@st.fragment
+def render_profile_section(scores):
+    """Psychometric scores and what the CV analysis found"""
     st.markdown("### 📊 Your Psychometric Profile")
     
     # Show if text analysis was used
@@ -743,10 +823,12 @@ def render_results():
                     </span>
                 </div>
                 """, unsafe_allow_html=True)
-    
-    # Get recommendation
-    recommender = RecommendationEngine()
-    recommendation = recommender.get_recommendation(scores, user_data)
+
+@st.fragment
+def render_roi_section(recommendation, roi_data):
+    """Recommended pathway, 5-year ROI chart and pathway comparison"""
+    import pandas as pd
+    import plotly.graph_objects as go
     
     st.markdown("---")
     st.markdown(f"### 🎓 Recommended Path: **{recommendation['pathway']}**")
@@ -756,14 +838,6 @@ def render_results():
     st.markdown("---")
     st.markdown("### 💰 5-Year Financial Projection (UK)")
     
-    roi_calc = ROICalculator()
-    roi_data = roi_calc.calculate_all_pathways(
-        user_data['budget'], 
-        user_data['current_income'], 
-        user_data['interests'][0] if user_data['interests'] else 'Technology & Software', 
-        user_data['target_country']
-    )
-    
     df = pd.DataFrame(roi_data).T.sort_values('net_wealth_year_5', ascending=False)
     
     # Visualize with £ symbols
@@ -806,12 +880,36 @@ def render_results():
         st.warning(f"⚠️ **LOW ROI**: ROI is only {recommended_roi['roi_multiple']:.2f}x")
     else:
         st.success(f"✅ **STRONG ROI**: Projected £{recommended_roi['net_wealth_year_5']:,.0f} net wealth after 5 years")
-    
-    # ============= NEW: TOP 3 PROGRAMMES =============
+
+# ============= NEW: TOP 3 PROGRAMMES =============
+@st.fragment
+def render_programmes_section(user_data, scores, recommendation):
+    """Top programmes for the recommended pathway - the ranking toggle reruns only this"""
     st.markdown("---")
     st.markdown(f"### 🎓 Top 3 {recommendation['pathway']} Programmes For You")
     
-    programmes = get_programmes_for_pathway(recommendation['pathway'], limit=3)
+    rank_choice = st.radio(
+        "Rank programmes by",
+        ["💰 10-year net wealth", "🧩 Best fit for your profile"],
+        horizontal=True,
+        key="programme_rank_by"
+    )
+    
+    try:
+        from modules.programme_roi import get_shared_programme_roi, profile_fit_tags
+        
+        programmes = get_shared_programme_roi().top_programmes(
+            user_data['interests'][0] if user_data['interests'] else 'Technology & Software',
+            k=3,
+            rank_by='fit' if rank_choice.endswith('profile') else 'net_wealth_10',
+            current_income=user_data['current_income'],
+            fit_tags=profile_fit_tags(scores),
+            pathway=recommendation['pathway']
+        )
+    except Exception as e:
+        print(f"Error ranking programmes: {e}")
+        from modules.uk_programmes import get_programmes_for_pathway
+        programmes = get_programmes_for_pathway(recommendation['pathway'], limit=3)
     
     if programmes:
         for prog in programmes:
@@ -831,6 +929,9 @@ def render_results():
                         st.write(f"**Total Cost:** {cost_display}")
                     
                     st.write(f"**Starting Salary (after completion):** £{prog['starting_salary']:,.0f}")
+                    
+                    if 'net_wealth_10' in prog:
+                        st.write(f"**Projected Net Wealth:** £{prog['net_wealth_5']:,.0f} after 5 years · £{prog['net_wealth_10']:,.0f} after 10 years")
                 
                 with col2:
                     if 'ranking' in prog:
@@ -839,36 +940,80 @@ def render_results():
                     st.link_button("📝 Apply Now", prog['application_link'], width='stretch')
     else:
         st.info("Programme database coming soon for this pathway.")
-    
-    # ============= NEW: CAREER PATHS WITH LIVE JOB DATA =============
+
+# ============= NEW: CAREER PATHS WITH LIVE JOB DATA =============
+@st.fragment
+def render_careers_section(user_data):
+    """Career paths with snapshot or live job market data"""
     st.markdown("---")
     st.markdown(f"### 💼 Career Paths in {user_data['interests'][0]}")
     
+    from modules.uk_careers import get_careers_for_field
     careers = get_careers_for_field(user_data['interests'][0], limit=5)
     
+    # Locally recorded demand history - powers the trend sparklines
+    try:
+        from modules.job_history import get_shared_history
+        job_history = get_shared_history()
+    except Exception as e:
+        job_history = None
+    
     # Try to get live job demand data from Adzuna
     use_live_data = False
     adzuna = None
     
     try:
-        from modules.adzuna_api import AdzunaAPI
+        from modules.job_market_snapshot import start_shared_refresher
         
         # Check for API keys in Streamlit secrets
         ADZUNA_APP_ID = st.secrets.get("ADZUNA_APP_ID", "")
         ADZUNA_API_KEY = st.secrets.get("ADZUNA_API_KEY", "")
         
         if ADZUNA_APP_ID and ADZUNA_API_KEY:
-            adzuna = AdzunaAPI(ADZUNA_APP_ID, ADZUNA_API_KEY)
+            # Shared across sessions and workers so reruns don't burn the monthly quota
+            adzuna = get_adzuna_client(
+                ADZUNA_APP_ID,
+                ADZUNA_API_KEY,
+                float(st.secrets.get("ADZUNA_CACHE_TTL_HOURS", 24)),
+                st.secrets.get("ADZUNA_BASE_URL") or None
+            )
             use_live_data = True
+            
+            # Keeps the prefetched snapshot fresh in the background
+            start_shared_refresher(adzuna)
     except Exception as e:
         use_live_data = False
     
-    if not use_live_data:
+    # Prefetched market data - served without touching the live API
+    try:
+        from modules.job_market_snapshot import get_current_snapshot
+        market_snapshot = get_current_snapshot()
+    except Exception as e:
+        market_snapshot = None
+    
+    if not use_live_data and not market_snapshot:
         st.info("💡 **Add Adzuna API keys to Streamlit Secrets to see live UK job market data** (sign up free at https://developer.adzuna.com/)")
     
     if careers:
         st.write("Based on your field of interest, here are career paths you could pursue:")
         
+        # Snapshot first; only careers missing from it go to the live API,
+        # in one parallel batch instead of one spinner per career
+        live_job_data = {}
+        if market_snapshot:
+            for career in careers:
+                snapshot_data = market_snapshot.get(career['title'])
+                if snapshot_data:
+                    live_job_data[career['title']] = snapshot_data
+        
+        missing_titles = [career['title'] for career in careers if career['title'] not in live_job_data]
+        if use_live_data and adzuna and missing_titles:
+            try:
+                with st.spinner("Fetching live UK job market data..."):
+                    live_job_data.update(adzuna.get_job_demand_many(missing_titles, 'UK'))
+            except Exception as e:
+                pass
+        
         for i, career in enumerate(careers, 1):
             with st.expander(f"**{i}. {career['title']}** - Entry: £{career['entry_salary']:,.0f} → Year 5: £{career['year_5_salary']:,.0f}", expanded=(i == 1)):
                 col1, col2 = st.columns([3, 2])
@@ -878,69 +1023,88 @@ def render_results():
                     st.write(f"Entry: £{career['entry_salary']:,.0f} → Year 5: £{career['year_5_salary']:,.0f} → Senior: £{career['senior_salary']:,.0f}")
                     st.write(f"**📈 Annual Growth Rate:** {career['growth_rate']*100:.0f}%")
                     
-                    # Show live job data if available
-                    if use_live_data and adzuna:
+                    # Show live job data if available (static data if the quota
+                    # scheduler or the API turned the request down)
+                    if (live_job_data.get(career['title']) or {}).get('success'):
                         try:
-                            with st.spinner(f"Fetching live job data for {career['title']}..."):
-                                job_data = adzuna.get_job_demand(career['title'], 'UK')
+                            job_data = live_job_data.get(career['title']) or {}
+                            
+                            if job_data.get('success') and job_data['total_jobs'] > 0:
+                                st.markdown("---")
+                                st.markdown(f"**📊 Live UK Job Market** (Updated {job_data['updated_at']})")
                                 
-                                if job_data['success'] and job_data['total_jobs'] > 0:
-                                    st.markdown("---")
-                                    st.markdown("**📊 Live UK Job Market** (Updated Today)")
-                                    
-                                    # Create metrics
-                                    metric_col1, metric_col2, metric_col3 = st.columns(3)
-                                    
-                                    with metric_col1:
+                                # Create metrics
+                                metric_col1, metric_col2, metric_col3 = st.columns(3)
+                                
+                                with metric_col1:
+                                    st.metric(
+                                        "Open Jobs",
+                                        f"{job_data['total_jobs']:,}",
+                                        help="Current UK job openings"
+                                    )
+                                
+                                with metric_col2:
+                                    # Compare market salary to our prediction
+                                    market_salary = job_data['avg_salary']
+                                    if market_salary > 0:
+                                        diff = market_salary - career['entry_salary']
                                         st.metric(
-                                            "Open Jobs",
-                                            f"{job_data['total_jobs']:,}",
-                                            help="Current UK job openings"
+                                            "Market Salary",
+                                            f"£{market_salary:,.0f}",
+                                            delta=f"{'+' if diff > 0 else ''}£{diff:,.0f}",
+                                            delta_color="normal",
+                                            help="Average from live postings"
                                         )
+                                
+                                with metric_col3:
+                                    # Demand indicator
+                                    total = job_data['total_jobs']
+                                    if total > 10000:
+                                        demand_emoji = "🔥"
+                                        demand_text = "Very High"
+                                    elif total > 5000:
+                                        demand_emoji = "✅"
+                                        demand_text = "High"
+                                    elif total > 2000:
+                                        demand_emoji = "⚠️"
+                                        demand_text = "Medium"
+                                    else:
+                                        demand_emoji = "❄️"
+                                        demand_text = "Low"
                                     
-                                    with metric_col2:
-                                        # Compare market salary to our prediction
-                                        market_salary = job_data['avg_salary']
-                                        if market_salary > 0:
-                                            diff = market_salary - career['entry_salary']
-                                            st.metric(
-                                                "Market Salary",
-                                                f"£{market_salary:,.0f}",
-                                                delta=f"{'+' if diff > 0 else ''}£{diff:,.0f}",
-                                                delta_color="normal",
-                                                help="Average from live postings"
-                                            )
-                                    
-                                    with metric_col3:
-                                        # Demand indicator
-                                        total = job_data['total_jobs']
-                                        if total > 10000:
-                                            demand_emoji = "🔥"
-                                            demand_text = "Very High"
-                                        elif total > 5000:
-                                            demand_emoji = "✅"
-                                            demand_text = "High"
-                                        elif total > 2000:
-                                            demand_emoji = "⚠️"
-                                            demand_text = "Medium"
-                                        else:
-                                            demand_emoji = "❄️"
-                                            demand_text = "Low"
+                                    st.metric(
+                                        "Demand",
+                                        f"{demand_emoji} {demand_text}",
+                                        help="Based on current job openings"
+                                    )
+                                
+                                # Spread of advertised pay, not just the average
+                                if job_data.get('salary_median'):
+                                    st.caption(
+                                        f"Typical advertised pay: £{job_data['salary_p25']:,.0f} – £{job_data['salary_p75']:,.0f} "
+                                        f"(median £{job_data['salary_median']:,.0f}, from {job_data['salaries_sampled']:,} postings)"
+                                    )
+                                
+                                # 12-month trend from locally recorded history (no API calls)
+                                if job_history:
+                                    trend = job_history.monthly_trend(career['title'], months=12)
+                                    if len(trend) >= 2:
+                                        import pandas as pd
                                         
-                                        st.metric(
-                                            "Demand",
-                                            f"{demand_emoji} {demand_text}",
-                                            help="Based on current job openings"
+                                        st.caption("Open jobs, last 12 months")
+                                        st.line_chart(
+                                            pd.DataFrame(trend).set_index('month')['total_jobs'],
+                                            height=120
                                         )
-                                    
-                                    # Top companies hiring
-                                    if job_data['top_companies']:
-                                        st.write(f"**🏢 Currently Hiring:** {', '.join(job_data['top_companies'][:5])}")
-                                    
-                                    # Hot job locations
-                                    if job_data['locations']:
-                                        st.write(f"**📍 Hot Locations:** {', '.join(job_data['locations'][:3])}")
                                 
+                                # Top companies hiring
+                                if job_data['top_companies']:
+                                    st.write(f"**🏢 Currently Hiring:** {', '.join(job_data['top_companies'][:5])}")
+                                
+                                # Hot job locations
+                                if job_data['locations']:
+                                    st.write(f"**📍 Hot Locations:** {', '.join(job_data['locations'][:3])}")
+                            
                         except Exception as e:
                             st.caption(f"Live data temporarily unavailable")
                     else:
@@ -960,10 +1124,79 @@ def render_results():
                         st.write(f"• {skill}")
                     
                     st.write(f"**🎓 Education:** {career['required_education']}")
+                    
+                    # Precomputed neighbour graph - a lookup, not a comparison per render
+                    try:
+                        from modules.related_careers import get_related_careers
+                        similar = get_related_careers(career['title'], limit=3)
+                    except Exception as e:
+                        print(f"Error loading related careers: {e}")
+                        similar = []
+                    
+                    if similar:
+                        st.write("**🔗 You might also consider:**")
+                        for other in similar:
+                            st.write(f"• {other['title']} ({other['field']}) - Entry £{other['entry_salary']:,.0f}")
+        
+        # Operator-only view of API health - enable with SHOW_API_METRICS in secrets
+        if adzuna and st.secrets.get("SHOW_API_METRICS", False):
+            with st.expander("🔧 Job market API metrics"):
+                metrics = adzuna.get_metrics()
+                quota = metrics['quota']
+                if quota:
+                    metric_col1, metric_col2, metric_col3 = st.columns(3)
+                    metric_col1.metric("Quota used", f"{quota['used']:,} / {quota['monthly_quota']:,}")
+                    metric_col2.metric("Burn rate", f"{quota['burn_rate_per_day']:,.0f}/day")
+                    metric_col3.metric("Projected exhaustion", quota['projected_exhaustion'] or "Not this month")
+                st.json(metrics)
     else:
         st.info("Career data coming soon for this field.")
+
+# ============= SEARCH ALL CAREERS & PROGRAMMES =============
+@st.fragment
+def render_catalog_search_section():
+    """Free-text search over every career and programme"""
+    st.markdown("---")
+    st.markdown("### 🔎 Explore Beyond Your Results")
+    
+    search_query = st.text_input(
+        "Search careers and programmes",
+        placeholder="e.g. nursing apprenticeship, cloud jobs, bootcamp in Manchester",
+        key="catalog_search_query"
+    )
     
-    # ============= EMAIL CAPTURE - MORE PROMINENT =============
+    if search_query.strip():
+        try:
+            from modules.catalog_search import search_catalog
+            hits = search_catalog(search_query, limit=8)
+        except Exception as e:
+            print(f"Error searching catalog: {e}")
+            hits = []
+    
+        if hits:
+            for hit in hits:
+                record = hit['record']
+                if hit['kind'] == 'career':
+                    st.write(f"💼 **{hit['title']}** ({hit['group']}) - Entry: £{record['entry_salary']:,.0f} → Year 5: £{record['year_5_salary']:,.0f}")
+                else:
+                    st.write(f"🎓 **{hit['title']}** - {record['location']} · {record['duration']} · Starting salary £{record['starting_salary']:,.0f}")
+        else:
+            st.caption("No matches - try a broader term like a skill, employer or city.")
+
+# ============= EMAIL CAPTURE - MORE PROMINENT =============
+def save_outcome_consent(consent):
+    """Record a change of mind on the stored decision (the scheduler skips rows without consent)"""
+    from modules.outcome_store import get_shared_outcome_store
+    try:
+        get_shared_outcome_store().update_decision(st.session_state['outcome_decision_id'],
+                                                   consent_to_follow_up=consent)
+        st.session_state['outcome_consent_saved'] = consent
+    except Exception as e:
+        print(f"Error updating outcome consent: {e}")
+
+@st.fragment
+def render_outcome_consent_section(user_data, scores, recommendation, roi_data):
+    """Outcome-tracking opt-in - the decision is only stored once the user ticks the box"""
     st.markdown("---")
     
     # NEW: Outcome tracking opt-in (THE MOAT)
@@ -996,7 +1229,7 @@ def render_results():
     with col2:
         outcome_tracking_consent = st.checkbox(
             "✓ Yes, follow up with me in 6 months to track my outcome",
-            value=True,  # Default checked
+            value=False,  # Opt-in - nothing is stored until the user ticks it
             key="outcome_tracking_consent"
         )
         
@@ -1022,13 +1255,38 @@ def render_results():
                 roi_data=roi_data
             )
             
+            tracking_data['consent_to_follow_up'] = True
+            # user_data has no address - use the one given on the landing page, if any,
+            # or the follow-up scheduler skips the decision for good
+            tracking_data['email'] = tracking_data.get('email') or st.session_state.get('user_email', '')
+
             # Store in session state (will be sent to Google Sheets)
             st.session_state['outcome_tracking_data'] = tracking_data
             # Note: outcome_tracking_consent is already set by the checkbox above
+
+            # Persist once per session - Streamlit reruns this block on every interaction
+            if 'outcome_decision_id' not in st.session_state:
+                from modules.outcome_store import get_shared_outcome_store
+                try:
+                    st.session_state['outcome_decision_id'] = get_shared_outcome_store().save_initial_decision(tracking_data)
+                    st.session_state['outcome_consent_saved'] = True
+                except Exception as e:
+                    print(f"Error saving outcome decision: {e}")
+            elif not st.session_state.get('outcome_consent_saved'):
+                save_outcome_consent(True)  # Re-ticked after withdrawing
+        else:
+            st.session_state.pop('outcome_tracking_data', None)
+            if st.session_state.get('outcome_consent_saved'):
+                save_outcome_consent(False)  # Withdrawn - no follow-ups for the stored decision
     
     st.markdown("""
     </div>
     """, unsafe_allow_html=True)
+
+@st.fragment
+def render_email_capture_section(user_data, recommendation, roi_data):
+    """Report email capture with GDPR consent"""
+    recommended_roi = roi_data[recommendation['pathway']]
     
     st.markdown("---")
     st.markdown("""
@@ -1107,7 +1365,19 @@ def render_results():
                 
                 if outcome_consent:
                     st.info("📅 We'll follow up in 6 months to track your outcome (helps future students!)")
-                
+
+                if 'outcome_decision_id' in st.session_state:
+                    # The decision may have been stored before we had an address to follow
+                    # up with. Consent stays with the opt-in box (save_outcome_consent)
+                    from modules.outcome_store import get_shared_outcome_store
+                    try:
+                        get_shared_outcome_store().update_decision(
+                            st.session_state['outcome_decision_id'],
+                            email=email
+                        )
+                    except Exception as e:
+                        print(f"Error updating outcome decision: {e}")
+
                 st.balloons()
                 st.session_state['user_email'] = email
                 st.session_state['marketing_consent'] = results_marketing
@@ -1130,8 +1400,11 @@ def render_results():
         </p>
     </div>
     """, unsafe_allow_html=True)
-    
-    # ============= NEW: ACTION BUTTONS =============
+
+# ============= NEW: ACTION BUTTONS =============
+@st.fragment
+def render_action_buttons():
+    """Report, consultation and restart buttons"""
     st.markdown("---")
     col1, col2, col3 = st.columns(3)
     
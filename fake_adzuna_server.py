@@ -0,0 +1,264 @@
+"""
+Fake Adzuna Server
+Local stand-in for the /v1/api/jobs/gb/search/{page} endpoint, for load testing and CI without network
+
+Serves recorded fixtures (fixtures/adzuna/<query>.json) or deterministic synthetic
+results, with configurable latency, error rate and 429 throttling.
+
+Run:        python fake_adzuna_server.py --port 8765 --latency-ms 150 --error-rate 0.05 --rate-limit 25
+Point at:   AdzunaAPI(app_id, app_key, base_url="http://127.0.0.1:8765/v1/api/jobs/gb/search")
+Benchmark:  python fake_adzuna_server.py --bench
+Record:     ADZUNA_APP_ID=... ADZUNA_API_KEY=... python fake_adzuna_server.py --record "Software Developer"
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures' / 'adzuna'
+SEARCH_PATH = re.compile(r'^/v1/api/jobs/gb/search/(\d+)$')
+
+SYNTHETIC_COMPANIES = ['Acme Ltd', 'Northwind', 'Globex UK', 'Initech', 'Hooli', 'Monzo', 'Sky', 'BBC', 'Ocado', 'Arm']
+SYNTHETIC_LOCATIONS = ['London', 'Manchester', 'Leeds', 'Bristol', 'Birmingham', 'Edinburgh', 'Glasgow', 'Cardiff']
+
+
+def fixture_name(query):
+    """File name a recorded response for `query` is stored under"""
+    return re.sub(r'[^a-z0-9]+', '_', query.casefold()).strip('_') + '.json'
+
+
+class FakeAdzunaState:
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, rate_limit_per_minute=None,
+                 fixtures_dir=FIXTURES_DIR, seed=None):
+        """
+        Behaviour knobs shared by every request handler thread
+
+        Args:
+            latency_ms: Base delay added to every response
+            jitter_ms: Extra uniformly random delay (0..jitter_ms)
+            error_rate: Fraction of requests answered with HTTP 500
+            rate_limit_per_minute: Sliding-window limit before answering 429 (None = unlimited)
+            fixtures_dir: Directory of recorded responses
+            seed: Seed for latency/error randomness (synthetic data is always deterministic)
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_per_minute = rate_limit_per_minute
+        self.fixtures_dir = Path(fixtures_dir)
+        self.random = random.Random(seed)
+
+        self._lock = threading.Lock()
+        self._recent = deque()  # Timestamps inside the rate-limit window
+        self.stats = {'requests': 0, 'served': 0, 'errors': 0, 'throttled': 0}
+
+    def admit(self):
+        """Decide the fate of one request: 'ok', 'error' or 'throttled'"""
+        with self._lock:
+            self.stats['requests'] += 1
+            now = time.monotonic()
+
+            if self.rate_limit_per_minute is not None:
+                while self._recent and now - self._recent[0] >= 60:
+                    self._recent.popleft()
+                if len(self._recent) >= self.rate_limit_per_minute:
+                    self.stats['throttled'] += 1
+                    return 'throttled', 60 - (now - self._recent[0])
+                self._recent.append(now)
+
+            if self.random.random() < self.error_rate:
+                self.stats['errors'] += 1
+                return 'error', 0
+
+            self.stats['served'] += 1
+            return 'ok', 0
+
+    def delay(self):
+        with self._lock:
+            jitter = self.random.uniform(0, self.jitter_ms) if self.jitter_ms else 0
+        if self.latency_ms or jitter:
+            time.sleep((self.latency_ms + jitter) / 1000)
+
+    def search(self, what, page, results_per_page):
+        """Build a search response from a fixture, or synthesise one"""
+        fixture_path = self.fixtures_dir / fixture_name(what)
+        if fixture_path.exists():
+            recorded = json.loads(fixture_path.read_text())
+            results = recorded.get('results', [])
+            start = (page - 1) * results_per_page
+            return {'count': recorded.get('count', len(results)), 'results': results[start:start + results_per_page]}
+
+        return synthetic_search(what, page, results_per_page)
+
+
+def synthetic_search(what, page, results_per_page):
+    """Deterministic fake results - the same query and page always give the same answer"""
+    seed = zlib.crc32(what.casefold().encode())
+    count = 200 + seed % 15000
+    base_salary = 20000 + seed % 40000
+
+    start = (page - 1) * results_per_page
+    rng = random.Random(seed * 1000003 + page)
+    results = []
+    for i in range(start, min(start + results_per_page, count)):
+        salary_min = round(base_salary * rng.uniform(0.8, 1.2), -2)
+        results.append({
+            'id': f"{seed}-{i}",
+            'title': what,
+            'company': {'display_name': rng.choice(SYNTHETIC_COMPANIES)},
+            'location': {'display_name': rng.choice(SYNTHETIC_LOCATIONS)},
+            'salary_min': salary_min,
+            'salary_max': round(salary_min * rng.uniform(1.1, 1.5), -2)
+        })
+
+    return {'count': count, 'results': results}
+
+
+class FakeAdzunaHandler(BaseHTTPRequestHandler):
+    state = None  # Set by make_server()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+
+        if url.path == '/stats':
+            return self._send_json(200, self.state.stats)
+
+        match = SEARCH_PATH.match(url.path)
+        if not match:
+            return self._send_json(404, {'exception': 'NOT_FOUND'})
+
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if not params.get('app_id') or not params.get('app_key'):
+            return self._send_json(401, {'exception': 'AUTH_FAIL', 'display': 'Missing app_id/app_key'})
+
+        self.state.delay()
+        outcome, retry_after = self.state.admit()
+
+        if outcome == 'throttled':
+            return self._send_json(429, {'exception': 'RATE_LIMIT'}, {'Retry-After': str(max(1, int(retry_after)))})
+        if outcome == 'error':
+            return self._send_json(500, {'exception': 'INTERNAL_ERROR'})
+
+        page = int(match.group(1))
+        results_per_page = min(int(params.get('results_per_page', 10)), 100)
+        self._send_json(200, self.state.search(params.get('what', ''), page, results_per_page))
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output readable
+
+
+def make_server(host='127.0.0.1', port=0, **state_options):
+    """Create a server (port 0 = pick a free one); state_options go to FakeAdzunaState"""
+    handler = type('BoundFakeAdzunaHandler', (FakeAdzunaHandler,), {'state': FakeAdzunaState(**state_options)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def start_fake_server(**options):
+    """
+    Start a fake server in a background thread
+
+    Returns:
+        (server, base_url) - pass base_url to AdzunaAPI, call server.shutdown() when done
+    """
+    server = make_server(**options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}/v1/api/jobs/gb/search"
+
+
+def record_fixture(query, pages=1, results_per_page=50):
+    """Save a real Adzuna response for `query` as a fixture (needs ADZUNA_APP_ID/ADZUNA_API_KEY)"""
+    import os
+    from modules.adzuna_api import AdzunaAPI
+
+    api = AdzunaAPI(os.environ['ADZUNA_APP_ID'], os.environ['ADZUNA_API_KEY'])
+    count = 0
+    results = []
+    for data in api.iter_result_pages(query, 'UK', results_per_page, max_pages=pages):
+        count = count or data.get('count', 0)
+        results.extend(data.get('results', []))
+
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    path = FIXTURES_DIR / fixture_name(query)
+    path.write_text(json.dumps({'count': count, 'results': results}, indent=1))
+    return path
+
+
+def run_benchmark():
+    """Time the AdzunaAPI client against the fake server under a few scenarios"""
+    from modules.adzuna_api import AdzunaAPI
+    from modules.adzuna_cache import JobDataCache
+    from modules.rate_limiter import RateLimiter
+
+    titles = ['Software Developer', 'Data Analyst', 'DevOps Engineer', 'Cloud Architect', 'Cybersecurity Analyst']
+
+    scenarios = [
+        ('Sequential, 200ms latency', {'latency_ms': 200}, False, 1),
+        ('Concurrent, 200ms latency', {'latency_ms': 200}, False, 5),
+        ('Concurrent + warm cache', {'latency_ms': 200}, True, 5),
+        ('Concurrent, 20% errors (retried)', {'latency_ms': 200, 'error_rate': 0.2, 'seed': 1}, False, 5),
+        ('Concurrent, throttled at 3/min', {'latency_ms': 50, 'rate_limit_per_minute': 3}, False, 5),
+    ]
+
+    print(f"{'Scenario':<36} {'Time':>8} {'Upstream':>9} {'OK':>4}")
+    print("-" * 60)
+
+    for name, options, warm_cache, workers in scenarios:
+        server, base_url = start_fake_server(**options)
+        cache = JobDataCache(path=None) if warm_cache else None
+        api = AdzunaAPI('bench', 'bench', base_url=base_url, cache=cache,
+                        limiter=RateLimiter([(10000, 60)]), max_retries=2)
+
+        if warm_cache:
+            api.get_job_demand_many(titles)
+            server.RequestHandlerClass.state.stats['requests'] = 0
+
+        started = time.perf_counter()
+        results = api.get_job_demand_many(titles, max_workers=workers)
+        elapsed = time.perf_counter() - started
+
+        ok = sum(1 for r in results.values() if r['success'])
+        upstream = server.RequestHandlerClass.state.stats['requests']
+        print(f"{name:<36} {elapsed:>7.2f}s {upstream:>9} {ok:>4}")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=int, default=None, help='Requests per minute before 429s')
+    parser.add_argument('--bench', action='store_true', help='Run the client benchmark and exit')
+    parser.add_argument('--record', metavar='QUERY', help='Record a real Adzuna response as a fixture')
+    args = parser.parse_args()
+
+    if args.bench:
+        run_benchmark()
+    elif args.record:
+        print(f"Saved {record_fixture(args.record)}")
+    else:
+        server = make_server(args.host, args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                             error_rate=args.error_rate, rate_limit_per_minute=args.rate_limit)
+        print(f"Fake Adzuna listening on http://{args.host}:{args.port}/v1/api/jobs/gb/search/{{page}}")
+        server.serve_forever()
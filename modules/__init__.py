@@ -1,13 +1,29 @@
-from .psychometric_engine import PsychometricAssessment
-from .recommendation_engine import RecommendationEngine
-from .roi_calculator import ROICalculator
-from .uk_programmes import get_programmes_for_pathway
-from .uk_careers import get_careers_for_field
-
-__all__ = [
-    'PsychometricAssessment',
-    'RecommendationEngine', 
-    'ROICalculator',
-    'get_programmes_for_pathway',
-    'get_careers_for_field'
-]
+"""
+Engine modules, loaded on first use: `from modules import ROICalculator` imports
+modules.roi_calculator only when the name is asked for (PEP 562), so a worker
+that never reaches a step never pays for its imports
+"""
+
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    'PsychometricAssessment': '.psychometric_engine',
+    'RecommendationEngine': '.recommendation_engine',
+    'ROICalculator': '.roi_calculator',
+    'get_programmes_for_pathway': '.uk_programmes',
+    'get_careers_for_field': '.uk_careers'
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
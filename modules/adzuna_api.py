@@ -6,107 +6,355 @@ Free tier: 5,000 requests/month
 Sign up: https://developer.adzuna.com/
 """
 
+import random
+import threading
+import time
 import requests
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .adzuna_cache import JobDataCache, SingleFlight
+from .job_history import JobHistoryStore
+from .quantile_sketch import QuantileSketch
+from .quota_scheduler import PRIORITY_COMPARE, PRIORITY_INTERACTIVE, QuotaScheduler
+from .rate_limiter import RateLimiter, get_shared_limiter
+
+DEFAULT_BASE_URL = "https://api.adzuna.com/v1/api/jobs/gb/search"  # + /{page}
+
+# Upper bound on simultaneous requests from one call - keeps bursts polite
+DEFAULT_MAX_WORKERS = 5
+
+# Retry policy for throttling and server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+DEFAULT_MAX_RETRIES = 3
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_CAP_SECONDS = 8.0
+
+# How long a request may wait for the per-minute limiter before giving up
+LIMITER_TIMEOUT_SECONDS = 10
+
+# Demand statistics are summarised from pages in date order - sorted by salary, the
+# sample only ever shows the top of the market. Page views read one page (one request
+# per title); the background snapshot build asks for more
+DEFAULT_SORT_BY = 'date'
+
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """Raised when the local rate limiter refuses a request"""
+
+
+# Process-wide, so identical lookups coalesce across clients and sessions
+_job_demand_flights = SingleFlight()
+
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+
+def get_shared_session() -> requests.Session:
+    """
+    Process-wide keep-alive session, so TCP/TLS connections to Adzuna are reused
+    across calls and Streamlit sessions
+    """
+    global _shared_session
+
+    with _shared_session_lock:
+        if _shared_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=DEFAULT_MAX_WORKERS * 2)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _shared_session = session
+        return _shared_session
 
 class AdzunaAPI:
-    def __init__(self, app_id: str, app_key: str):
+    def __init__(self,
+                 app_id: str,
+                 app_key: str,
+                 cache: Optional[JobDataCache] = None,
+                 session: Optional[requests.Session] = None,
+                 limiter: Optional[RateLimiter] = None,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 history: Optional[JobHistoryStore] = None,
+                 base_url: Optional[str] = None,
+                 scheduler: Optional[QuotaScheduler] = None):
         """
         Initialize Adzuna API client
         
         Args:
             app_id: Your Adzuna App ID
             app_key: Your Adzuna API Key
+            cache: Optional JobDataCache - repeated lookups are served from it
+                   and stale entries are returned if the API errors
+            session: HTTP session (defaults to the shared keep-alive pool)
+            limiter: Rate limiter (defaults to the process-wide Adzuna limiter)
+            max_retries: Retries on 429/5xx and connection errors
+            history: Optional JobHistoryStore - every live result is appended to it
+            base_url: Search endpoint without the page number (e.g. a local
+                      fake_adzuna_server.py for load tests)
+            scheduler: Optional QuotaScheduler - tracks the monthly quota and
+                       refuses low-priority requests as it runs low
         """
         self.app_id = app_id
         self.app_key = app_key
-        self.base_url = "https://api.adzuna.com/v1/api/jobs/gb/search/1"
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip('/')
+        self.cache = cache
+        self.session = session or get_shared_session()
+        self.limiter = limiter or get_shared_limiter()
+        self.max_retries = max_retries
+        self.history = history
+        self.scheduler = scheduler
     
     def get_job_demand(self, 
                        job_title: str, 
                        location: str = 'UK',
-                       results_per_page: int = 100) -> Dict:
+                       results_per_page: int = 100,
+                       max_pages: int = 1,
+                       priority: str = PRIORITY_INTERACTIVE,
+                       sort_by: str = DEFAULT_SORT_BY) -> Dict:
         """
         Get job demand statistics for a specific role
         
+        Salary statistics cover both ends of every advertised band on every page read
+        
+        Args:
+            max_pages: Result pages to stream (each page costs one API request)
+            priority: Quota class - PRIORITY_INTERACTIVE, PRIORITY_COMPARE or PRIORITY_BACKGROUND
+            sort_by: Adzuna ordering - 'date' or 'relevance' give a representative sample,
+                     'salary' only the best-paid postings
+        
         Returns:
             {
                 'total_jobs': int,
                 'avg_salary': float,
                 'salary_min': float,
                 'salary_max': float,
+                'salary_p25': float,
+                'salary_median': float,
+                'salary_p75': float,
+                'salaries_sampled': int,
                 'top_companies': List[str],
                 'locations': List[str],
                 'updated_at': str
             }
         """
         
+        cache_key = JobDataCache.make_key(job_title, location, results_per_page, max_pages, sort_by)
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached:
+                return cached
+        
+        # Identical concurrent lookups (e.g. many sessions rendering the same
+        # career list) share a single upstream request
+        result = _job_demand_flights.do(
+            cache_key,
+            lambda: self._load_job_demand(cache_key, job_title, location, results_per_page, max_pages, priority, sort_by)
+        )
+        return dict(result)
+    
+    def _load_job_demand(self,
+                         cache_key: str,
+                         job_title: str,
+                         location: str,
+                         results_per_page: int,
+                         max_pages: int,
+                         priority: str,
+                         sort_by: str = DEFAULT_SORT_BY) -> Dict:
+        """Fetch from the API, falling back to stale cache data or an empty result on failure"""
+        
+        try:
+            result = self._fetch_job_demand(job_title, location, results_per_page, max_pages, priority, sort_by)
+        except requests.exceptions.RequestException as e:
+            # Serve the last known answer rather than an empty card
+            if self.cache:
+                stale = self.cache.get_stale(cache_key)
+                if stale:
+                    stale['stale'] = True
+                    return stale
+            
+            return {
+                'total_jobs': 0,
+                'avg_salary': 0,
+                'salary_min': 0,
+                'salary_max': 0,
+                'salary_p25': 0,
+                'salary_median': 0,
+                'salary_p75': 0,
+                'salaries_sampled': 0,
+                'top_companies': [],
+                'locations': [],
+                'updated_at': 'N/A',
+                'success': False,
+                'error': str(e)
+            }
+        
+        if self.cache:
+            self.cache.set(cache_key, result)
+        
+        if self.history:
+            self.history.record(job_title, location, result)
+        
+        return result
+    
+    def iter_result_pages(self,
+                          job_title: str,
+                          location: str = 'UK',
+                          results_per_page: int = 100,
+                          max_pages: Optional[int] = None,
+                          sort_by: str = DEFAULT_SORT_BY,
+                          priority: str = PRIORITY_INTERACTIVE) -> Iterator[Dict]:
+        """
+        Lazily stream raw search result pages (raises RequestException on failure)
+        
+        The next page is only requested when the consumer asks for it, and
+        streaming stops at `max_pages`, an empty page or the reported total.
+        """
+        
         params = {
             'app_id': self.app_id,
             'app_key': self.app_key,
             'what': job_title,
             'where': location,
             'results_per_page': results_per_page,
-            'sort_by': 'salary'
+            'sort_by': sort_by
         }
         
-        try:
-            response = requests.get(self.base_url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Extract insights
-            total_jobs = data.get('count', 0)
+        page = 1
+        fetched = 0
+        while max_pages is None or page <= max_pages:
+            data = self._get_with_retry(f"{self.base_url}/{page}", params, priority)
             results = data.get('results', [])
+            if not results:
+                if page == 1:
+                    yield data  # Still carries the total count
+                return
+            
+            yield data
+            
+            fetched += len(results)
+            if fetched >= data.get('count', 0):
+                return
+            page += 1
+    
+    def iter_job_results(self, job_title: str, location: str = 'UK', **page_options) -> Iterator[Dict]:
+        """Lazily stream individual job postings across pages"""
+        for data in self.iter_result_pages(job_title, location, **page_options):
+            yield from data.get('results', [])
+    
+    def _fetch_job_demand(self,
+                          job_title: str,
+                          location: str,
+                          results_per_page: int,
+                          max_pages: int,
+                          priority: str,
+                          sort_by: str = DEFAULT_SORT_BY) -> Dict:
+        """Stream the search pages and summarise them (raises RequestException on failure)"""
+        
+        total_jobs = 0
+        
+        # Running salary stats - memory stays constant however many postings we read
+        salary_sketch = QuantileSketch()
+        
+        # First 10 distinct companies and locations
+        companies = {}
+        locations = {}
+        
+        for data in self.iter_result_pages(job_title, location, results_per_page, max_pages,
+                                           sort_by=sort_by, priority=priority):
+            total_jobs = total_jobs or data.get('count', 0)
             
-            # Calculate salary stats
-            salaries = [
-                job.get('salary_max', 0) 
-                for job in results 
-                if job.get('salary_max')
-            ]
+            for job in data.get('results', []):
+                job_min = job.get('salary_min') or 0
+                job_max = job.get('salary_max') or 0
+                
+                # Both ends of the band; a single advertised figure counts for both, so
+                # every posting carries the same weight
+                salary_sketch.add(job_min or job_max)
+                salary_sketch.add(job_max or job_min)
+                
+                company = job.get('company', {}).get('display_name')
+                if company and len(companies) < 10:
+                    companies[company] = True
+                
+                place = job.get('location', {}).get('display_name')
+                if place and len(locations) < 10:
+                    locations[place] = True
+        
+        quantiles = salary_sketch.summary()
+        
+        return {
+            'total_jobs': total_jobs,
+            'avg_salary': quantiles['mean'],
+            'salary_min': round(salary_sketch.min, 0) if salary_sketch.count else 0,
+            'salary_max': round(salary_sketch.max, 0) if salary_sketch.count else 0,
+            'salary_p25': quantiles['p25'],
+            'salary_median': quantiles['median'],
+            'salary_p75': quantiles['p75'],
+            'salaries_sampled': quantiles['count'] // 2,  # Postings, not band ends
+            'top_companies': list(companies),
+            'locations': list(locations),
+            'updated_at': 'Today',
+            'success': True
+        }
+    
+    def _get_with_retry(self, url: str, params: Dict, priority: str = PRIORITY_INTERACTIVE) -> Dict:
+        """
+        GET a JSON response through the rate limiter and quota scheduler,
+        retrying 429/5xx and connection errors with jittered exponential backoff
+        """
+        
+        for attempt in range(self.max_retries + 1):
+            if not self.limiter.acquire(timeout=LIMITER_TIMEOUT_SECONDS, priority=priority):
+                raise RateLimitExceeded("Adzuna rate limit reached - try again later")
             
-            avg_salary = sum(salaries) / len(salaries) if salaries else 0
-            salary_min = min(salaries) if salaries else 0
-            salary_max = max(salaries) if salaries else 0
+            # Every attempt is a real request, so each one counts against the quota.
+            # A refused request isn't sent, so its per-minute token goes back
+            if self.scheduler and not self.scheduler.try_acquire(priority):
+                self.limiter.release()
+                raise RateLimitExceeded(f"Monthly Adzuna quota reserved for higher priority than '{priority}'")
             
-            # Top companies
-            companies = list(set([
-                job['company']['display_name'] 
-                for job in results 
-                if job.get('company', {}).get('display_name')
-            ]))[:10]
+            last_attempt = attempt == self.max_retries
             
-            # Top locations
-            locations = list(set([
-                job.get('location', {}).get('display_name', '')
-                for job in results
-                if job.get('location', {}).get('display_name')
-            ]))[:10]
+            try:
+                response = self.session.get(url, params=params, timeout=10)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if last_attempt:
+                    raise
+                time.sleep(self._backoff_delay(attempt))
+                continue
             
-            return {
-                'total_jobs': total_jobs,
-                'avg_salary': round(avg_salary, 0),
-                'salary_min': round(salary_min, 0),
-                'salary_max': round(salary_max, 0),
-                'top_companies': companies,
-                'locations': locations,
-                'updated_at': 'Today',
-                'success': True
-            }
+            if response.status_code in RETRY_STATUS_CODES and not last_attempt:
+                time.sleep(self._backoff_delay(attempt, response.headers.get('Retry-After')))
+                continue
             
-        except requests.exceptions.RequestException as e:
-            return {
-                'total_jobs': 0,
-                'avg_salary': 0,
-                'salary_min': 0,
-                'salary_max': 0,
-                'top_companies': [],
-                'locations': [],
-                'updated_at': 'N/A',
-                'success': False,
-                'error': str(e)
-            }
+            response.raise_for_status()
+            return response.json()
+    
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when the server sends one"""
+        if retry_after:
+            try:
+                return min(float(retry_after), BACKOFF_CAP_SECONDS)
+            except ValueError:
+                pass  # HTTP-date form - fall back to our own schedule
+        
+        return random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+    
+    def cache_stats(self) -> Dict:
+        """Hit/miss counters of the attached cache plus coalesced request count"""
+        stats = self.cache.stats() if self.cache else {}
+        stats['coalesced_requests'] = _job_demand_flights.coalesced
+        return stats
+    
+    def get_metrics(self) -> Dict:
+        """Cache, rate limiter and quota metrics in one place for monitoring"""
+        return {
+            'cache': self.cache_stats(),
+            'rate_limiter': self.limiter.remaining(),
+            'quota': self.scheduler.metrics() if self.scheduler else {}
+        }
     
     def get_skills_demand(self, skill: str) -> Dict:
         """
@@ -119,7 +367,10 @@ class AdzunaAPI:
             Demand level and job count
         """
         
-        result = self.get_job_demand(skill)
+        return self._summarise_skill_demand(skill, self.get_job_demand(skill, priority=PRIORITY_COMPARE))
+    
+    def _summarise_skill_demand(self, skill: str, result: Dict) -> Dict:
+        """Turn a raw job demand result into a skill demand summary"""
         total_jobs = result['total_jobs']
         
         # Categorize demand
@@ -141,6 +392,58 @@ class AdzunaAPI:
             'avg_salary': result['avg_salary']
         }
     
+    def get_job_demand_many(self,
+                            job_titles: Iterable[str],
+                            location: str = 'UK',
+                            max_workers: int = DEFAULT_MAX_WORKERS,
+                            max_pages: int = 1,
+                            priority: str = PRIORITY_INTERACTIVE) -> Dict[str, Dict]:
+        """
+        Fetch job demand for several titles concurrently
+        
+        Total latency is bounded by the slowest single call rather than
+        the sum of all calls. Duplicate titles are only fetched once.
+        
+        Returns:
+            Dict mapping each title to its get_job_demand() result
+        """
+        
+        titles = list(dict.fromkeys(job_titles))
+        if not titles:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(titles)))) as pool:
+            futures = {
+                title: pool.submit(self.get_job_demand, title, location, max_pages=max_pages, priority=priority)
+                for title in titles
+            }
+            return {title: future.result() for title, future in futures.items()}
+    
+    def get_market_overview(self,
+                            career_titles: Iterable[str],
+                            skills: Iterable[str] = (),
+                            location: str = 'UK',
+                            max_workers: int = DEFAULT_MAX_WORKERS) -> Dict:
+        """
+        Fetch careers and skills in one parallel batch
+        
+        Returns:
+            {
+                'careers': Dict[title, get_job_demand() result],
+                'skills': Dict[skill, get_skills_demand() result]
+            }
+        """
+        
+        career_titles = list(career_titles)
+        skills = list(skills)
+        
+        results = self.get_job_demand_many(career_titles + skills, location, max_workers, priority=PRIORITY_COMPARE)
+        
+        return {
+            'careers': {title: results[title] for title in career_titles},
+            'skills': {skill: self._summarise_skill_demand(skill, results[skill]) for skill in skills}
+        }
+    
     def compare_careers(self, career_titles: List[str]) -> List[Dict]:
         """
         Compare multiple careers by job availability
@@ -153,9 +456,9 @@ class AdzunaAPI:
         """
         
         comparisons = []
+        demand = self.get_job_demand_many(career_titles, priority=PRIORITY_COMPARE)
         
-        for title in career_titles:
-            data = self.get_job_demand(title)
+        for title, data in demand.items():
             comparisons.append({
                 'career': title,
                 'total_jobs': data['total_jobs'],
@@ -216,7 +519,7 @@ if __name__ == "__main__":
     print("=" * 60)
     
     skills = ['Python', 'JavaScript', 'React', 'AWS', 'Docker']
+    overview = api.get_market_overview(careers, skills)
     
-    for skill in skills:
-        skill_data = api.get_skills_demand(skill)
+    for skill, skill_data in overview['skills'].items():
         print(f"{skill}: {skill_data['total_jobs']:,} jobs ({skill_data['demand_level']} demand)")
@@ -0,0 +1,241 @@
+"""
+Adzuna Response Cache
+Two-tier TTL cache for job market lookups: in-memory LRU in front of SQLite on disk
+The SQLite tier is shared by every worker process on the same machine
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / '.cache' / 'adzuna_cache.sqlite3'
+DEFAULT_TTL_SECONDS = 24 * 60 * 60  # Job counts move slowly - one refresh a day is plenty
+DEFAULT_MEMORY_ENTRIES = 512
+
+
+class JobDataCache:
+    def __init__(self,
+                 path: Optional[Path] = DEFAULT_CACHE_PATH,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_memory_entries: int = DEFAULT_MEMORY_ENTRIES):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite file for the shared tier (None = memory only)
+            ttl_seconds: How long an entry counts as fresh
+            max_memory_entries: LRU capacity of the in-process tier
+        """
+        self.path = Path(path) if path else None
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+
+        self._memory = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.stale_served = 0
+
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                conn = self._connection()
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS job_cache ('
+                    'key TEXT PRIMARY KEY, stored_at REAL NOT NULL, value TEXT NOT NULL)'
+                )
+                conn.commit()
+            except sqlite3.Error:
+                # Read-only or broken disk - carry on with the memory tier only
+                self.path = None
+
+    @staticmethod
+    def make_key(job_title: str, location: str, results_per_page: int, max_pages: int = 1,
+                 sort_by: str = 'date') -> str:
+        """Normalised cache key for a (job_title, location, results_per_page, max_pages, sort_by) query"""
+        return json.dumps([job_title.strip().lower(), location.strip().lower(), int(results_per_page), int(max_pages),
+                           sort_by])
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a fresh cached value, or None on a miss"""
+        entry = self._lookup(key)
+
+        if entry and time.time() - entry[0] <= self.ttl_seconds:
+            with self._lock:
+                self.hits += 1
+            return dict(entry[1])
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def get_stale(self, key: str) -> Optional[Dict]:
+        """Return the last cached value regardless of age (used when the API is failing)"""
+        entry = self._lookup(key)
+        if not entry:
+            return None
+
+        with self._lock:
+            self.stale_served += 1
+        return dict(entry[1])
+
+    def set(self, key: str, value: Dict):
+        """Store a value in both tiers"""
+        stored_at = time.time()
+        self._remember(key, stored_at, value)
+
+        if self.path:
+            try:
+                conn = self._connection()
+                conn.execute(
+                    'INSERT OR REPLACE INTO job_cache (key, stored_at, value) VALUES (?, ?, ?)',
+                    (key, stored_at, json.dumps(value))
+                )
+                conn.commit()
+            except sqlite3.Error:
+                pass  # Memory tier still has it
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+
+        if self.path:
+            conn = self._connection()
+            conn.execute('DELETE FROM job_cache')
+            conn.commit()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'stale_served': self.stale_served,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'memory_entries': len(self._memory)
+            }
+
+    def _lookup(self, key):
+        """
+        Find (stored_at, value) in memory first, then on disk
+
+        An expired memory entry still goes to disk - another worker may already have
+        refreshed the row, and serving that beats refetching from the API
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry:
+                self._memory.move_to_end(key)
+                if time.time() - entry[0] <= self.ttl_seconds:
+                    return entry
+
+        if not self.path:
+            return entry
+
+        try:
+            row = self._connection().execute(
+                'SELECT stored_at, value FROM job_cache WHERE key = ?', (key,)
+            ).fetchone()
+        except sqlite3.Error:
+            return entry
+
+        if not row or (entry and row[0] <= entry[0]):
+            return entry  # Nothing newer on disk - the caller decides whether stale will do
+
+        stored_at, value = row[0], json.loads(row[1])
+        self._remember(key, stored_at, value)
+        with self._lock:
+            self.disk_hits += 1
+        return stored_at, value
+
+    def _remember(self, key, stored_at, value):
+        with self._lock:
+            self._memory[key] = (stored_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def _connection(self):
+        # sqlite3 connections can't be shared between threads - one per thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=5)
+            self._local.conn = conn
+        return conn
+
+
+class SingleFlight:
+    def __init__(self):
+        """
+        Coalesce concurrent identical calls: while one call for a key is in
+        flight, every other caller with that key waits for its result
+        instead of issuing its own request
+        """
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> _Call
+        self.coalesced = 0
+
+    def do(self, key: str, fn):
+        """Run fn() once per in-flight key and hand the result to every waiter"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.leader_done.wait()
+            if call.error:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.leader_done.set()
+
+        return call.result
+
+
+class _Call:
+    def __init__(self):
+        self.leader_done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache(path: Optional[Path] = DEFAULT_CACHE_PATH,
+                     ttl_seconds: float = DEFAULT_TTL_SECONDS) -> JobDataCache:
+    """
+    Process-wide cache instance, so every Streamlit session shares one LRU
+    Arguments only take effect on the first call
+    """
+    global _shared_cache
+
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = JobDataCache(path=path, ttl_seconds=ttl_seconds)
+        return _shared_cache
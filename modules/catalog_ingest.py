@@ -0,0 +1,354 @@
+"""
+Catalog Ingestion
+Streams programme or career exports (CSV, or XLSX with openpyxl installed) row by
+row, validates and normalises each field, merges near-duplicates on a normalised
+key, writes the result back to the data/*.json source and recompiles the catalog
+the app serves from it
+
+Run:  python -m modules.catalog_ingest programmes export.csv [--replace]
+"""
+
+import csv
+import json
+import os
+import re
+import tempfile
+import time
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from .catalog_store import DEFAULT_ARTIFACT_PATH, SOURCE_PATHS, compile_sources, get_catalog_store
+from .programme_search import normalise_locations
+from .uk_careers import DEMAND_RANK
+
+CHUNK_SIZE = 10000  # Rows per progress report
+MAX_REPORTED_ERRORS = 50
+
+# column -> (parser, required)
+PROGRAMME_SCHEMA = {
+    'pathway': ('text', True),
+    'name': ('text', True),
+    'type': ('text', True),
+    'location': ('text', True),
+    'duration': ('text', True),
+    'cost': ('money', True),
+    'entry_requirements': ('text', False),
+    'starting_salary': ('money', True),
+    'application_link': ('url', False),
+    'fit_tags': ('tags', False),
+    'ranking': ('ranking', False)
+}
+CAREER_SCHEMA = {
+    'field': ('text', True),
+    'title': ('text', True),
+    'entry_salary': ('money', True),
+    'year_5_salary': ('money', True),
+    'senior_salary': ('money', True),
+    'growth_rate': ('rate', True),
+    'required_education': ('list', False),
+    'top_companies': ('list', False),
+    'demand': ('demand', False),
+    'remote_friendly': ('bool', False),
+    'skills': ('list', False),
+    'job_openings_uk': ('text', False)
+}
+SCHEMAS = {'programmes': PROGRAMME_SCHEMA, 'careers': CAREER_SCHEMA}
+GROUP_FIELDS = {'programmes': 'pathway', 'careers': 'field'}
+
+# Export headers -> schema columns (after lower-casing and underscoring)
+HEADER_ALIASES = {
+    'programme': 'name', 'programme_name': 'name', 'course': 'name',
+    'career': 'title', 'job_title': 'title', 'role': 'title',
+    'link': 'application_link', 'url': 'application_link',
+    'tags': 'fit_tags', 'education': 'required_education', 'companies': 'top_companies',
+    'remote': 'remote_friendly', 'openings': 'job_openings_uk'
+}
+PATHWAY_ALIASES = {'Bootcamp/Micro-Credential': 'Micro-Credentials'}
+
+TRUE_VALUES = {'true', 'yes', 'y', '1'}
+FALSE_VALUES = {'false', 'no', 'n', '0'}
+DEMAND_LEVELS = {level.casefold(): level for level in DEMAND_RANK}
+MONEY_JUNK = str.maketrans('', '', '£$€, ')
+
+
+def _text(value):
+    return ' '.join(str(value).split())
+
+
+def _money(value):
+    if isinstance(value, (int, float)):
+        return int(round(value))
+    text = str(value).translate(MONEY_JUNK).casefold()
+    multiplier = 1000 if text.endswith('k') else 1
+    return int(round(float(text.rstrip('k')) * multiplier))
+
+
+def _rate(value):
+    # '12%' or 0.12 - a bare number is always a fraction, so '2' can't quietly mean 2%
+    text = str(value).strip()
+    if text.endswith('%'):
+        return round(float(text[:-1]) / 100, 4)
+    rate = float(text)
+    if abs(rate) > 1:
+        raise ValueError(f"{value!r} is ambiguous - give a fraction (0.12) or a percentage (12%)")
+    return round(rate, 4)
+
+
+def _list(value):
+    text = str(value)
+    separator = ';' if ';' in text else '|' if '|' in text else ','
+    return [_text(item) for item in text.split(separator) if item.strip()]
+
+
+def _tags(value):
+    return [re.sub(r'[\s-]+', '_', tag.casefold()) for tag in _list(value)]
+
+
+def _bool(value):
+    text = str(value).strip().casefold()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError(f"expected yes/no, got {value!r}")
+
+
+def _url(value):
+    text = str(value).strip()
+    if not re.match(r'^https?://\S+$', text):
+        raise ValueError(f"not a URL: {value!r}")
+    return text
+
+
+def _ranking(value):
+    text = _text(value)
+    return int(text) if text.isdigit() else text
+
+
+def _demand(value):
+    level = DEMAND_LEVELS.get(_text(value).casefold())
+    if level is None:
+        raise ValueError(f"demand must be one of {', '.join(DEMAND_RANK)}")
+    return level
+
+
+PARSERS = {
+    'text': _text, 'money': _money, 'rate': _rate, 'list': _list, 'tags': _tags,
+    'bool': _bool, 'url': _url, 'ranking': _ranking, 'demand': _demand
+}
+
+
+# Exports repeat the same cell values (types, locations, tags) across thousands of
+# rows - parse each distinct one once. Lists are cached as tuples so records can't
+# end up sharing a mutable value
+@lru_cache(maxsize=65536)
+def _parse_cached(parser, value):
+    parsed = PARSERS[parser](value)
+    return tuple(parsed) if isinstance(parsed, list) else parsed
+
+
+def parse_value(parser: str, value):
+    if not isinstance(value, str):
+        return PARSERS[parser](value)
+    parsed = _parse_cached(parser, value)
+    return list(parsed) if isinstance(parsed, tuple) else parsed
+
+
+@lru_cache(maxsize=65536)
+def normalise_key(text: str) -> str:
+    """'Le Wagon – Full-Stack Web Dev.' and 'le wagon full stack web dev' give the same key"""
+    return ' '.join(re.sub(r'[^0-9a-z]+', ' ', str(text).casefold().replace('&', ' and ')).split())
+
+
+def record_key(kind: str, group: str, record: Dict) -> Tuple:
+    """Identity used for de-duplication - a later row with the same key replaces the earlier one"""
+    if kind == 'careers':
+        return (normalise_key(record['title']),)
+    # Same course in the same city, however the location is spelled ('Leeds, UK', 'Leeds (+ Remote)')
+    places = tuple(place for place in normalise_locations(record.get('location')) if place != 'remote')
+    return (normalise_key(group), normalise_key(record['name']), places)
+
+
+def normalise_row(kind: str, row: Dict) -> Tuple[str, Dict]:
+    """
+    Validate and normalise one export row
+
+    Returns:
+        (group, record) - the pathway or field, and the catalog record
+
+    Raises:
+        ValueError: With every problem found in the row
+    """
+    record = {}
+    problems = []
+    for column, (parser, required) in SCHEMAS[kind].items():
+        value = row.get(column)
+        if value is None or (isinstance(value, str) and not value.strip()):
+            if required:
+                problems.append(f"{column} is required")
+            continue
+        try:
+            record[column] = parse_value(parser, value)
+        except (ValueError, TypeError) as e:
+            problems.append(f"{column}: {e}")
+
+    if problems:
+        raise ValueError('; '.join(problems))
+
+    group = record.pop(GROUP_FIELDS[kind])
+    return PATHWAY_ALIASES.get(group, group), record
+
+
+def read_rows(path: Path) -> Iterator[Tuple[int, Dict]]:
+    """(line number, {column: raw value}) from a CSV or XLSX export, one row at a time"""
+    path = Path(path)
+    if path.suffix.casefold() in ('.xlsx', '.xlsm'):
+        rows = _xlsx_rows(path)
+    else:
+        rows = _csv_rows(path)
+
+    header = None
+    for line, values in rows:
+        if header is None:
+            header = [_column_name(value) for value in values]
+            continue
+        if any(value not in (None, '') for value in values):
+            yield line, dict(zip(header, values))
+
+
+def _csv_rows(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        yield from enumerate(csv.reader(f), 1)
+
+
+def _xlsx_rows(path):
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise ImportError("Reading .xlsx exports needs openpyxl (pip install openpyxl)") from e
+
+    # read_only streams rows from the zip instead of loading the whole sheet
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from enumerate(workbook.active.iter_rows(values_only=True), 1)
+    finally:
+        workbook.close()
+
+
+def _column_name(header):
+    name = re.sub(r'[^0-9a-z]+', '_', str(header or '').casefold()).strip('_')
+    return HEADER_ALIASES.get(name, name)
+
+
+def ingest(kind: str, path: Path, replace: bool = False, source_paths: Dict[str, Path] = SOURCE_PATHS,
+           artifact_path: Path = DEFAULT_ARTIFACT_PATH, progress: Optional[Callable[[int], None]] = None) -> Dict:
+    """
+    Ingest an export into the data files and publish a new catalog version
+
+    The merged table replaces source_paths[kind] and the artifact is compiled from the
+    data files, so they stay the source of truth: a later hand edit to data/*.json is
+    still picked up by the store's staleness check
+
+    Memory is bounded by the de-duplicated catalog, not the file: rows are parsed and
+    folded into the keyed catalog one at a time
+
+    Args:
+        kind: 'programmes' or 'careers'
+        path: CSV or XLSX export with a header row
+        replace: Start from an empty table instead of merging into the current data file
+        source_paths: {'careers': json path, 'programmes': json path} to merge into and compile
+        artifact_path: Compiled catalog to publish
+        progress: Called with the running row count every CHUNK_SIZE rows
+
+    Returns:
+        {'rows', 'accepted', 'rejected', 'duplicates' (within the export), 'updated' (existing
+         records replaced), 'records', 'version', 'seconds', 'errors': [(line, message)]}
+    """
+    if kind not in SCHEMAS:
+        raise ValueError(f"Unknown catalog: {kind} (expected one of {', '.join(SCHEMAS)})")
+
+    started = time.perf_counter()
+    source = Path(source_paths[kind])
+
+    catalog = {}  # key -> (group, record), in first-seen order
+    if not replace:
+        with open(source, encoding='utf-8') as f:
+            current = json.load(f)
+        for group, records in current.items():
+            for record in records:
+                catalog[record_key(kind, group, record)] = (group, record)
+
+    report = {'rows': 0, 'accepted': 0, 'rejected': 0, 'duplicates': 0, 'updated': 0, 'errors': []}
+    seen = set()  # Keys this export has already supplied
+    rows = read_rows(path)
+    while True:
+        chunk = list(islice(rows, CHUNK_SIZE))
+        if not chunk:
+            break
+        for line, row in chunk:
+            try:
+                group, record = normalise_row(kind, row)
+            except ValueError as e:
+                report['rejected'] += 1
+                if len(report['errors']) < MAX_REPORTED_ERRORS:
+                    report['errors'].append((line, str(e)))
+                continue
+
+            key = record_key(kind, group, record)
+            if key in seen:
+                report['duplicates'] += 1
+            elif key in catalog:
+                report['updated'] += 1
+            seen.add(key)
+            catalog[key] = (group, record)
+            report['accepted'] += 1
+        report['rows'] += len(chunk)
+        if progress:
+            progress(report['rows'])
+
+    grouped = {}
+    for group, record in catalog.values():
+        grouped.setdefault(group, []).append(record)
+
+    write_source(grouped, source)
+    report['version'] = compile_sources(source_paths, artifact_path)
+    report['records'] = len(catalog)
+    report['seconds'] = round(time.perf_counter() - started, 2)
+    store = get_catalog_store()
+    if Path(artifact_path) == store.artifact_path:
+        store.refresh(force=True)  # Swap this process over now; others follow within CHECK_SECONDS
+    return report
+
+
+def write_source(groups: Dict[str, list], path: Path):
+    """Replace a data/*.json file atomically, in the same layout as the hand-maintained files"""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(groups, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)  # mkstemp creates 0600
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+if __name__ == "__main__":
+    import sys
+
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if len(args) != 2:
+        print("Usage: python -m modules.catalog_ingest {programmes|careers} EXPORT.csv|.xlsx [--replace]")
+        sys.exit(2)
+
+    result = ingest(args[0], Path(args[1]), replace='--replace' in sys.argv,
+                    progress=lambda rows: print(f"  {rows:,} rows..."))
+    for line, message in result.pop('errors'):
+        print(f"  line {line}: {message}")
+    print(f"Updated {SOURCE_PATHS[args[0]]} and published catalog version {result['version']}: {result}")
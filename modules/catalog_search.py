@@ -0,0 +1,251 @@
+"""
+Catalog Search
+BM25 full-text search over programmes and careers, built once per catalog version
+Query terms are stemmed, the last one is matched as a prefix (search-as-you-type)
+and unknown terms fall back to close spellings from the vocabulary
+"""
+
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from .catalog_store import as_catalog_table
+
+# BM25 parameters (the usual defaults)
+K1 = 1.2
+B = 0.75
+
+# Per-field term weights - a match in a title counts for more than one in a company list
+PROGRAMME_FIELDS = {'name': 3.0, 'type': 1.5, 'location': 1.5, 'pathway': 1.0}
+CAREER_FIELDS = {'title': 3.0, 'skills': 2.0, 'top_companies': 1.0, 'field': 1.0}
+
+PREFIX_WEIGHT = 0.8  # Discount on completions of a partly typed last word
+FUZZY_WEIGHT = 0.6  # Discount on spelling corrections
+MAX_EXPANSIONS = 20  # Vocabulary terms one query word can expand to
+QUERY_CACHE_SIZE = 2048
+
+STOPWORDS = {'a', 'an', 'and', 'at', 'for', 'in', 'near', 'of', 'on', 'or', 'the', 'to', 'with'}
+SUFFIXES = [('ies', 'y'), ('ing', ''), ('es', ''), ('ed', ''), ('s', ''), ('e', '')]
+
+
+@lru_cache(maxsize=65536)
+def stem(token: str) -> str:
+    """Light suffix stripping so 'nurse', 'nurses' and 'nursing' meet on 'nurs'"""
+    if len(token) <= 4 or token.endswith('ss'):
+        return token
+    for suffix, replacement in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[:-len(suffix)] + replacement
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in re.findall(r'[a-z0-9+#]+', (text or '').casefold()) if token not in STOPWORDS]
+
+
+def max_edits(term: str) -> int:
+    """Typos tolerated for a word of this length - none for short words, which collide too easily"""
+    if len(term) < 4:
+        return 0
+    return 1 if len(term) < 8 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (transpositions count once), or limit + 1 if over limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+def _deletes(term, depth):
+    """Every string reachable from term by deleting up to depth characters"""
+    variants = {term}
+    frontier = {term}
+    for _ in range(depth):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))}
+        variants |= frontier
+    return variants
+
+
+class CatalogSearch:
+    def __init__(self, careers, programmes):
+        """
+        Build the inverted index from the catalog's text columns - the index is
+        read-only afterwards, so any number of sessions can query it concurrently
+        without locking, and records are only decoded for the hits returned
+
+        Args:
+            careers: Careers table, or {field: [career, ...]} (UK_CAREERS shape)
+            programmes: Programmes table, or {pathway: [programme, ...]} (UK_PROGRAMMES shape)
+        """
+        self.docs = []  # (kind, table, row, title); the doc id is the position
+        self.postings = defaultdict(list)  # term -> [(doc_id, weighted term frequency)]
+        lengths = []
+
+        for kind, catalog, fields, group_field, title_field in [
+            ('programme', programmes, PROGRAMME_FIELDS, 'pathway', 'name'),
+            ('career', careers, CAREER_FIELDS, 'field', 'title')
+        ]:
+            table = as_catalog_table(catalog)
+            groups = table.groups()
+            columns = {field: groups if field == group_field else table.column(field) for field in fields}
+            titles = table.column(title_field)
+            for row in range(len(table)):
+                self.docs.append((kind, table, row, titles[row]))
+                lengths.append(self._add({field: column[row] for field, column in columns.items()}, fields))
+
+        self.postings = dict(self.postings)
+        average = sum(lengths) / len(lengths) if lengths else 1.0
+        # Length normalisation is fixed per document, so fold it in now
+        self._norms = [K1 * (1 - B + B * length / average) for length in lengths]
+        total = len(self.docs)
+        self.idf = {
+            term: math.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+        self._vocabulary = sorted(self.postings)
+        self._spellings = defaultdict(set)  # deletion variant -> vocabulary terms (symmetric delete)
+        for term in self._vocabulary:
+            for variant in _deletes(term, max_edits(term)):
+                self._spellings[variant].add(term)
+
+        self._cached_search = lru_cache(maxsize=QUERY_CACHE_SIZE)(self._search)
+
+    def search(self, query: str, kind: Optional[str] = None, limit: int = 10, prefix: bool = True) -> List[Dict]:
+        """
+        Ranked matches for a free-text query
+
+        Args:
+            query: e.g. "nursing apprenticeship in Leeds", "cloud jobs", "sofware"
+            kind: 'programme' or 'career' to restrict results (default: both)
+            limit: Results to return
+            prefix: Treat the last word as unfinished (search-as-you-type)
+
+        Returns:
+            [{'kind', 'title', 'group', 'score', 'record'}, ...] best first
+        """
+        normalised = ' '.join(tokenize(query))
+        if not normalised:
+            return []
+        # Cache hits are shared by every session typing the same thing
+        return [dict(hit) for hit in self._cached_search(normalised, kind, limit, prefix)]
+
+    def expand(self, token: str, prefix: bool = False) -> Dict[str, float]:
+        """Vocabulary terms a query word matches, with their weights"""
+        term = stem(token)
+        matches = {}
+        if term in self.postings:
+            matches[term] = 1.0
+        elif token in self.postings:
+            matches[token] = 1.0
+
+        if prefix:
+            start = bisect_left(self._vocabulary, token)
+            for candidate in self._vocabulary[start:start + MAX_EXPANSIONS]:
+                if not candidate.startswith(token):
+                    break
+                matches.setdefault(candidate, PREFIX_WEIGHT)
+
+        if not matches:
+            limit = max_edits(term)
+            candidates = set()
+            for variant in _deletes(term, limit):
+                candidates |= self._spellings.get(variant, set())
+            for candidate in sorted(candidates):
+                distance = edit_distance(term, candidate, limit)
+                if distance <= limit:
+                    matches[candidate] = FUZZY_WEIGHT ** distance
+        return dict(sorted(matches.items(), key=lambda item: -item[1])[:MAX_EXPANSIONS])
+
+    def __len__(self):
+        return len(self.docs)
+
+    def _search(self, normalised, kind, limit, prefix):
+        tokens = normalised.split()
+        scores = defaultdict(float)
+
+        for position, token in enumerate(tokens):
+            is_last = prefix and position == len(tokens) - 1
+            best = {}  # Best contribution per doc for this query word across its expansions
+            for term, weight in self.expand(token, prefix=is_last).items():
+                idf = self.idf[term] * weight
+                for doc_id, tf in self.postings[term]:
+                    score = idf * tf * (K1 + 1) / (tf + self._norms[doc_id])
+                    if score > best.get(doc_id, 0):
+                        best[doc_id] = score
+            for doc_id, score in best.items():
+                scores[doc_id] += score
+
+        if kind:
+            scores = {doc_id: score for doc_id, score in scores.items() if self.docs[doc_id][0] == kind}
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        hits = []
+        for doc_id, score in ranked:
+            kind, table, row, title = self.docs[doc_id]
+            hits.append({
+                'kind': kind,
+                'title': title,
+                'group': table.groups()[row],
+                'score': round(score, 4),
+                'record': table.row(row)
+            })
+        return tuple(hits)
+
+    def _add(self, values, fields):
+        doc_id = len(self.docs) - 1
+
+        frequencies = defaultdict(float)
+        length = 0
+        for field, weight in fields.items():
+            value = values[field]
+            text = ' '.join(value) if isinstance(value, list) else value
+            for token in tokenize(text):
+                frequencies[stem(token)] += weight
+                length += 1
+
+        for term, tf in frequencies.items():
+            self.postings[term].append((doc_id, tf))
+        return length
+
+
+_shared_search = (None, None)  # (catalog version, CatalogSearch)
+_shared_search_lock = threading.Lock()
+
+
+def get_catalog_search() -> CatalogSearch:
+    """Search index over the current catalog - rebuilt when a new version is published"""
+    global _shared_search
+    from .catalog_store import get_catalog_store
+
+    store = get_catalog_store()
+    version, careers = store.table('careers')
+    _, programmes = store.table('programmes')
+    with _shared_search_lock:
+        if _shared_search[0] != version:
+            _shared_search = (version, CatalogSearch(careers, programmes))
+        return _shared_search[1]
+
+
+def search_catalog(query: str, **kwargs) -> List[Dict]:
+    """Full-text search over careers and programmes - see CatalogSearch.search"""
+    return get_catalog_search().search(query, **kwargs)
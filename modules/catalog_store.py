@@ -0,0 +1,573 @@
+"""
+Catalog Store
+Careers and programmes live in data/*.json and are compiled into one columnar file
+that every process memory-maps read-only (the OS shares the pages between workers)
+Records are decoded from the mapping only when a caller reads them, indexes are
+built from whole columns, and a newly published file is swapped in without a restart
+
+Run:  python -m modules.catalog_store   (compile data/*.json and publish)
+"""
+
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from collections.abc import Mapping, Sequence
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows - publishing is then only serialised within one process
+    fcntl = None
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = ROOT_DIR / 'data'
+SOURCE_PATHS = {
+    'careers': DATA_DIR / 'uk_careers.json',
+    'programmes': DATA_DIR / 'uk_programmes.json'
+}
+DEFAULT_ARTIFACT_PATH = ROOT_DIR / '.cache' / 'catalog.bin'
+CHECK_SECONDS = 5  # How often readers stat the artifact for a new version
+
+MAGIC = b'CATALOG1'
+PREAMBLE = struct.Struct('<8sQ')  # magic, header length
+ALIGNMENT = 8
+MISSING_STR = b'\xff'  # Never produced by UTF-8 encoding, so it can't clash with a real value
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _column_kind(values):
+    """'num', 'bool', 'str' or 'json' (lists and mixed types) for a column's non-null values"""
+    present = [v for v in values if v is not None]
+    if present and all(isinstance(v, bool) for v in present):
+        return 'bool'
+    if present and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return 'num'
+    if all(isinstance(v, str) for v in present):
+        return 'str'
+    return 'json'
+
+
+def _encode_strings(values, kind):
+    offsets = array('q', [0])
+    blob = bytearray()
+    for value in values:
+        if value is None:
+            blob += MISSING_STR if kind == 'str' else b''
+        else:
+            blob += (value if kind == 'str' else json.dumps(value, ensure_ascii=False)).encode('utf-8')
+        offsets.append(len(blob))
+    return offsets.tobytes(), bytes(blob)
+
+
+def encode_table(groups: Dict[str, list]) -> Tuple[Dict, list]:
+    """
+    Lay a {group: [record, ...]} catalog out as columns
+
+    Numbers are float64 (NaN = missing), booleans int8 (-1 = missing), strings and
+    lists are offset arrays into a UTF-8 blob. The group key is one more string column
+
+    Returns:
+        (table spec for the header, [column buffers])
+    """
+    names = []
+    for records in groups.values():
+        for record in records:
+            names.extend(key for key in record if key not in names)
+
+    group_values = [group for group, records in groups.items() for _ in records]
+    records = [record for records in groups.values() for record in records]
+
+    columns = {}
+    buffers = []
+    for name in names:
+        values = [record.get(name) for record in records]
+        kind = _column_kind(values)
+        spec = {'kind': kind}
+
+        if kind == 'num':
+            spec['integral'] = all(isinstance(v, int) for v in values if v is not None)
+            buffers.append([array('d', [math.nan if v is None else v for v in values]).tobytes()])
+        elif kind == 'bool':
+            buffers.append([array('b', [-1 if v is None else int(v) for v in values]).tobytes()])
+        else:
+            buffers.append(list(_encode_strings(values, kind)))
+        columns[name] = spec
+
+    buffers.append(list(_encode_strings(group_values, 'str')))
+    return {'rows': len(records), 'columns': columns, 'digest': _table_digest(columns, buffers)}, buffers
+
+
+def _table_digest(columns, buffers):
+    """
+    Content hash of an encoded table - the same records give the same digest in any
+    artifact, unlike the version number, which restarts when the artifact is deleted
+    """
+    digest = hashlib.sha256(json.dumps(columns, sort_keys=True).encode('utf-8'))
+    for column_buffers in buffers:
+        for buffer in column_buffers:
+            digest.update(buffer)
+    return digest.hexdigest()
+
+
+def layout_tables(tables: Dict[str, Dict[str, list]]) -> Tuple[Dict, list, int]:
+    """
+    Encode catalogs and place every column buffer at an aligned offset
+
+    Returns:
+        ({table: spec with extents}, [(offset, buffer)], total data size)
+    """
+    specs = {}
+    chunks = []
+    offset = 0
+    for name, groups in tables.items():
+        spec, buffers = encode_table(groups)
+        for column, column_buffers in zip(list(spec['columns'].values()) + [None], buffers):
+            extents = []
+            for buffer in column_buffers:
+                extents.append([offset, len(buffer)])
+                chunks.append((offset, buffer))
+                offset = _align(offset + len(buffer))
+            if column is None:
+                spec['group'] = extents
+            else:
+                column['extents'] = extents
+        specs[name] = spec
+    return specs, chunks, offset
+
+
+_publish_thread_lock = threading.Lock()  # Still serialises threads where fcntl isn't available
+
+
+@contextmanager
+def publish_lock(path: Path = DEFAULT_ARTIFACT_PATH):
+    """
+    Exclusive lock on <artifact>.lock for the whole read-version / compile / replace
+    sequence, so two workers can't both publish "version N+1" with different contents
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _publish_thread_lock, open(path.with_name(path.name + '.lock'), 'a') as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)  # Released when the file closes
+        yield
+
+
+def write_catalog(tables: Dict[str, Dict[str, list]], path: Path = DEFAULT_ARTIFACT_PATH,
+                  sources: Optional[Dict[str, int]] = None) -> int:
+    """
+    Compile catalogs into a new artifact version and publish it atomically
+
+    Args:
+        tables: {'careers': {field: [career, ...]}, 'programmes': {pathway: [programme, ...]}}
+        path: Artifact to replace - open readers keep the old inode until they swap
+        sources: {source path: mtime_ns} the artifact was built from; readers recompile
+                 when one of them changes
+
+    Returns:
+        The published version number
+    """
+    with publish_lock(path):
+        return _publish(tables, path, sources)
+
+
+def _publish(tables, path, sources):
+    path = Path(path)
+    previous = _read_header(path)
+    specs, chunks, offset = layout_tables(tables)
+    header = {
+        'version': (previous['version'] + 1) if previous else 1,
+        'compiled_at': datetime.now().isoformat(),
+        'byteorder': sys.byteorder,
+        'sources': sources or {},
+        'tables': specs
+    }
+
+    header_bytes = json.dumps(header).encode('utf-8')
+    data_start = _align(PREAMBLE.size + len(header_bytes))
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(PREAMBLE.pack(MAGIC, len(header_bytes)))
+            f.write(header_bytes)
+            for chunk_offset, buffer in chunks:
+                f.seek(data_start + chunk_offset)
+                f.write(buffer)
+            f.truncate(data_start + offset)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)  # mkstemp creates 0600; app workers may run as another user
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    return header['version']
+
+
+def compile_sources(source_paths: Dict[str, Path] = SOURCE_PATHS, path: Path = DEFAULT_ARTIFACT_PATH) -> int:
+    """Compile the JSON data files into the runtime artifact"""
+    with publish_lock(path):
+        return _compile(source_paths, path)
+
+
+def _compile(source_paths, path):
+    tables = {}
+    sources = {}
+    for name, source in source_paths.items():
+        sources[str(source)] = os.stat(source).st_mtime_ns
+        with open(source, encoding='utf-8') as f:
+            tables[name] = json.load(f)
+    return _publish(tables, path, sources)
+
+
+def _read_header(path):
+    try:
+        with open(path, 'rb') as f:
+            magic, length = PREAMBLE.unpack(f.read(PREAMBLE.size))
+            return json.loads(f.read(length)) if magic == MAGIC else None
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+class CatalogTable:
+    def __init__(self, buffer: memoryview, spec: Dict, swap_bytes: bool = False):
+        """Columnar view over one table of a mapped artifact - nothing is decoded up front"""
+        self._buffer = buffer
+        self._swap_bytes = swap_bytes
+        self.rows = spec['rows']
+        self.kinds = {name: column['kind'] for name, column in spec['columns'].items()}
+        self._integral = {name for name, column in spec['columns'].items() if column.get('integral')}
+        self._views = {name: self._view(column['kind'], column['extents']) for name, column in spec['columns'].items()}
+        self._groups = self._view('str', spec['group'])
+        self._group_names = None
+        self._grouped_view = None
+        self._decoded = None
+        self._spec = spec
+        self._digest = spec.get('digest')
+
+    @classmethod
+    def from_groups(cls, groups: Dict[str, list]) -> 'CatalogTable':
+        """Same columnar table built in memory from a {group: [record, ...]} catalog"""
+        if isinstance(groups, GroupedRecords):
+            return groups.table
+        specs, chunks, size = layout_tables({'table': groups})
+        buffer = bytearray(size)
+        for offset, chunk in chunks:
+            buffer[offset:offset + len(chunk)] = chunk
+        return cls(memoryview(bytes(buffer)), specs['table'])
+
+    def __len__(self):
+        return self.rows
+
+    @property
+    def digest(self) -> str:
+        """Content hash of the table (see _table_digest) - what derived indexes are keyed on"""
+        if self._digest is None:  # Artifact compiled before digests were recorded
+            columns = {name: {key: value for key, value in column.items() if key != 'extents'}
+                       for name, column in self._spec['columns'].items()}
+            extents = [column['extents'] for column in self._spec['columns'].values()] + [self._spec['group']]
+            buffers = [[self._buffer[offset:offset + length] for offset, length in column] for column in extents]
+            self._digest = _table_digest(columns, buffers)
+        return self._digest
+
+    def column(self, name: str):
+        """
+        A whole column - numbers come back as a zero-copy float64 memoryview over the
+        shared mapping (NaN = missing), strings and lists decoded into a list
+        (all None when no record has the field)
+        """
+        if name not in self._views:
+            return [None] * self.rows
+        view = self._views[name]
+        if self.kinds[name] in ('num', 'bool'):
+            return view
+        return [self._string(view, self.kinds[name], i) for i in range(self.rows)]
+
+    def groups(self) -> list:
+        """Group (pathway / field) of every row"""
+        if self._group_names is None:
+            self._group_names = [self._string(self._groups, 'str', i) for i in range(self.rows)]
+        return self._group_names
+
+    def records(self, rows: Iterable[int] = None) -> 'RecordView':
+        """Rows as a sequence of records, decoded from the mapping only when read"""
+        return RecordView(self, array('i', range(self.rows) if rows is None else rows))
+
+    def view(self) -> 'GroupedRecords':
+        """The catalog in {group: [record, ...]} shape without decoding any record"""
+        if self._grouped_view is None:
+            rows = {}
+            for i, group in enumerate(self.groups()):
+                rows.setdefault(group, array('i')).append(i)
+            self._grouped_view = GroupedRecords(self, rows)
+        return self._grouped_view
+
+    def row(self, i: int) -> Dict:
+        """One record as the original dict (missing fields left out)"""
+        record = {}
+        for name, view in self._views.items():
+            kind = self.kinds[name]
+            if kind == 'num':
+                value = view[i]
+                if math.isnan(value):
+                    continue
+                record[name] = int(value) if name in self._integral else value
+            elif kind == 'bool':
+                if view[i] >= 0:
+                    record[name] = bool(view[i])
+            else:
+                value = self._string(view, kind, i)
+                if value is not None:
+                    record[name] = value
+        return record
+
+    def grouped(self) -> Dict[str, list]:
+        """
+        The catalog fully decoded into {group: [record, ...]}, in compiled order - for
+        exports, merges and the legacy UK_CAREERS / UK_PROGRAMMES names (decoded once)
+        """
+        if self._decoded is None:
+            groups = {}
+            for i, group in enumerate(self.groups()):
+                groups.setdefault(group, []).append(self.row(i))
+            self._decoded = groups
+        return self._decoded
+
+    def _view(self, kind, extents):
+        slices = [self._buffer[offset:offset + length] for offset, length in extents]
+        if kind == 'num':
+            return self._cast(slices[0], 'd')
+        if kind == 'bool':
+            return slices[0].cast('b')
+        return self._cast(slices[0], 'q'), slices[1]
+
+    def _cast(self, view, code):
+        if not self._swap_bytes:
+            return view.cast(code)
+        values = array(code, view.tobytes())  # Artifact from the other endianness - copy once
+        values.byteswap()
+        return values
+
+    @staticmethod
+    def _string(view, kind, i):
+        offsets, blob = view
+        raw = blob[offsets[i]:offsets[i + 1]]
+        if kind == 'str':
+            return None if raw == MISSING_STR else str(raw, 'utf-8')
+        return json.loads(str(raw, 'utf-8')) if len(raw) else None
+
+
+class RecordView(Sequence):
+    def __init__(self, table: CatalogTable, rows: array):
+        """Read-only list of records backed by table rows - each access decodes one row"""
+        self.table = table
+        self.rows = rows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return RecordView(self.table, self.rows[index])
+        return self.table.row(self.rows[index])
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, RecordView)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    # Concatenating or repeating materialises a plain list, as it did before
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __mul__(self, times):
+        return list(self) * times
+
+    __rmul__ = __mul__
+
+    def __repr__(self):
+        return f"RecordView({len(self)} records)"
+
+
+class GroupedRecords(Mapping):
+    def __init__(self, table: CatalogTable, rows: Dict[str, array]):
+        """{group: RecordView} over a table - the UK_CAREERS / UK_PROGRAMMES shape"""
+        self.table = table
+        self._rows = rows
+
+    def __getitem__(self, group):
+        return RecordView(self.table, self._rows[group])
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+
+def as_catalog_table(catalog) -> CatalogTable:
+    """Index builders take a mapped table, or a {group: [record, ...]} dict compiled in memory"""
+    return catalog if isinstance(catalog, CatalogTable) else CatalogTable.from_groups(catalog)
+
+
+class CatalogReader:
+    def __init__(self, path: Path = DEFAULT_ARTIFACT_PATH):
+        """
+        Map an artifact read-only
+
+        The mapping outlives the file: once a new version replaces it, this reader keeps
+        serving the old inode until the last reference to it goes away
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, length = PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a catalog artifact: {self.path}")
+
+        self.header = json.loads(self._mmap[PREAMBLE.size:PREAMBLE.size + length])
+        self.version = self.header['version']
+        self._data = memoryview(self._mmap)[_align(PREAMBLE.size + length):]
+        self._swap_bytes = self.header.get('byteorder', sys.byteorder) != sys.byteorder
+        self._tables = {}
+
+    def table(self, name: str) -> CatalogTable:
+        if name not in self._tables:
+            self._tables[name] = CatalogTable(self._data, self.header['tables'][name], self._swap_bytes)
+        return self._tables[name]
+
+    @property
+    def tables(self) -> Iterable[str]:
+        return list(self.header['tables'])
+
+
+class CatalogStore:
+    def __init__(self, artifact_path: Path = DEFAULT_ARTIFACT_PATH,
+                 source_paths: Optional[Dict[str, Path]] = SOURCE_PATHS,
+                 check_seconds: float = CHECK_SECONDS):
+        """
+        Initialize the store
+
+        Args:
+            artifact_path: Compiled catalog to serve
+            source_paths: JSON data files to recompile from when they change (None = serve
+                          the artifact as published)
+            check_seconds: Minimum gap between stat() calls on the hot path
+        """
+        self.artifact_path = Path(artifact_path)
+        self.source_paths = source_paths
+        self.check_seconds = check_seconds
+        self._reader = None
+        self._file_key = None
+        self._checked_at = 0.0
+        self._lock = threading.RLock()
+
+    @property
+    def version(self) -> int:
+        return self.reader().version
+
+    def reader(self) -> CatalogReader:
+        self.refresh()
+        return self._reader
+
+    def snapshot(self, table: str) -> Tuple[int, GroupedRecords]:
+        """
+        (version, {group: [record, ...]}) for the current artifact
+
+        A view over the mapping: only the records a caller reads are decoded
+        """
+        version, catalog_table = self.table(table)
+        return version, catalog_table.view()
+
+    def table(self, name: str) -> Tuple[int, CatalogTable]:
+        """
+        (version, columnar table) for the current artifact - what indexes are built
+        from; callers compare the version to know when to rebuild
+        """
+        self.refresh()
+        with self._lock:
+            reader = self._reader
+            return reader.version, reader.table(name)
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Swap in a newly published artifact, recompiling first if a data file changed
+
+        Returns:
+            True if a new version was swapped in
+        """
+        now = time.monotonic()
+        if not force and self._reader is not None and now - self._checked_at < self.check_seconds:
+            return False
+
+        with self._lock:
+            self._checked_at = now
+            if self.source_paths and self._stale():
+                with publish_lock(self.artifact_path):
+                    if self._stale():  # Another worker may have compiled while we waited
+                        _compile(self.source_paths, self.artifact_path)
+
+            stat = os.stat(self.artifact_path)
+            key = (stat.st_mtime_ns, stat.st_ino)
+            if key == self._file_key:
+                return False
+
+            reader = CatalogReader(self.artifact_path)
+            # Single reference swap - requests already holding the old snapshot finish on it
+            self._reader, self._file_key = reader, key
+            return True
+
+    def _stale(self):
+        header = _read_header(self.artifact_path)
+        if header is None:
+            return True
+
+        recorded = header.get('sources') or {}
+        for source in self.source_paths.values():
+            if str(source) in recorded:
+                try:
+                    if os.stat(source).st_mtime_ns != recorded[str(source)]:
+                        return True
+                except OSError:
+                    pass
+        return False
+
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def get_catalog_store() -> CatalogStore:
+    """Process-wide catalog store"""
+    global _shared_store
+
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = CatalogStore()
+        return _shared_store
+
+
+if __name__ == "__main__":
+    version = compile_sources()
+    reader = CatalogReader()
+    counts = {name: len(reader.table(name)) for name in reader.tables}
+    print(f"Published catalog version {version} ({counts}) to {DEFAULT_ARTIFACT_PATH}")
@@ -0,0 +1,117 @@
+"""
+Follow-up Scheduler
+Turns due 6/12/24-month follow-ups into rendered emails in a local outbox (JSONL)
+A mail sender drains the outbox; this only decides who is due and what they get
+
+Run:  python -m modules.follow_up_scheduler [--loop]
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .outcome_store import get_shared_outcome_store
+from .outcome_tracker import create_outcome_tracking_link, generate_follow_up_email_template
+
+DEFAULT_OUTBOX_PATH = Path(__file__).resolve().parent.parent / '.cache' / 'follow_up_outbox.jsonl'
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_TICK_SECONDS = 15 * 60
+
+STATUS_QUEUED = 'queued'
+STATUS_SKIPPED = 'skipped'  # No consent or no email address
+
+
+class FollowUpScheduler:
+    def __init__(self, store=None, outbox_path: Path = DEFAULT_OUTBOX_PATH, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Initialize the scheduler
+
+        Args:
+            store: OutcomeStore with the follow_ups due-date index (default: shared store)
+            outbox_path: JSONL file rendered emails are appended to
+            batch_size: Follow-ups claimed per transaction
+        """
+        self.store = store or get_shared_outcome_store()
+        self.outbox_path = Path(outbox_path)
+        self.outbox_path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+
+    def tick(self, now: Optional[datetime] = None) -> Dict:
+        """
+        Process every follow-up due by `now`, one batch per transaction
+
+        Returns:
+            {'queued': int, 'skipped': int}
+        """
+        counts = {STATUS_QUEUED: 0, STATUS_SKIPPED: 0}
+
+        def handle(rows):
+            statuses = self._deliver(rows)
+            for status in statuses.values():
+                counts[status] += 1
+            return statuses
+
+        while self.store.process_due_follow_ups(handle, now=now, limit=self.batch_size) == self.batch_size:
+            pass
+
+        return counts
+
+    def run_forever(self, interval_seconds: float = DEFAULT_TICK_SECONDS):
+        while True:
+            try:
+                counts = self.tick()
+                if counts[STATUS_QUEUED] or counts[STATUS_SKIPPED]:
+                    print(f"Follow-ups: {counts}")
+            except Exception as e:
+                print(f"Error processing follow-ups: {e}")
+            time.sleep(interval_seconds)
+
+    def _deliver(self, rows: List[Dict]) -> Dict:
+        """Render a batch and append it to the outbox with a single write"""
+        statuses = {}
+        lines = []
+        queued_at = datetime.now().isoformat()
+
+        for row in rows:
+            key = (row['decision_id'], row['months_elapsed'])
+            if not row['consent_to_follow_up'] or not row['email']:
+                statuses[key] = STATUS_SKIPPED
+                continue
+
+            email = generate_follow_up_email_template(
+                row['name'] or 'there', row['recommended_pathway'] or 'your pathway', row['months_elapsed']
+            )
+            lines.append(json.dumps({
+                'to': row['email'],
+                'subject': email['subject'],
+                'body': email['body'],
+                'survey_link': create_outcome_tracking_link(row['email'], row['decision_id']),
+                'decision_id': row['decision_id'],
+                'months_elapsed': row['months_elapsed'],
+                'due_at': row['due_at'],
+                'queued_at': queued_at
+            }))
+            statuses[key] = STATUS_QUEUED
+
+        if lines:
+            # Durable before the rows are marked processed - a crash can repeat a
+            # batch, never lose one
+            with open(self.outbox_path, 'a', encoding='utf-8') as outbox:
+                outbox.write('\n'.join(lines) + '\n')
+                outbox.flush()
+                os.fsync(outbox.fileno())
+
+        return statuses
+
+
+if __name__ == "__main__":
+    import sys
+
+    scheduler = FollowUpScheduler()
+    if '--loop' in sys.argv:
+        scheduler.run_forever()
+    else:
+        print(f"Follow-ups: {scheduler.tick()} -> {scheduler.outbox_path}")
@@ -0,0 +1,131 @@
+"""
+Job Demand History
+Append-only time series of job demand per title, so trends come from local data
+instead of extra Adzuna calls
+
+Stored row-per-observation in a clustered SQLite table rather than per-metric
+columns: at one row per title per day the whole series for a title is a few
+pages read in one seek, every trend query wants most of the metrics anyway, and
+SQLite gives the append-only insert and multi-worker safety for free
+"""
+
+import sqlite3
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_HISTORY_PATH = Path(__file__).resolve().parent.parent / '.cache' / 'job_history.sqlite3'
+
+# Stored per (title, location, day) - a clustered primary key keeps each title's
+# rows contiguous on disk, so a range query is a single index seek + scan
+HISTORY_METRICS = ['total_jobs', 'avg_salary', 'salary_median', 'salary_p25', 'salary_p75']
+
+
+class JobHistoryStore:
+    def __init__(self, path: Path = DEFAULT_HISTORY_PATH):
+        """
+        Initialize the store
+
+        Args:
+            path: SQLite file shared by every worker process
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS job_history ('
+            'title_key TEXT NOT NULL, location TEXT NOT NULL, day TEXT NOT NULL, '
+            'total_jobs INTEGER NOT NULL, avg_salary REAL, salary_median REAL, '
+            'salary_p25 REAL, salary_p75 REAL, '
+            'PRIMARY KEY (title_key, location, day)) WITHOUT ROWID'
+        )
+        conn.commit()
+
+    def record(self, title: str, location: str, result: Dict, day: Optional[date] = None):
+        """
+        Append one get_job_demand() result
+
+        Append-only: the first observation of a title on a given day is kept
+        and later ones that day are ignored
+        """
+        if not result.get('success'):
+            return
+
+        day = day or date.today()
+        values = [result.get(metric) or 0 for metric in HISTORY_METRICS]
+
+        try:
+            conn = self._connection()
+            conn.execute(
+                'INSERT OR IGNORE INTO job_history '
+                '(title_key, location, day, total_jobs, avg_salary, salary_median, salary_p25, salary_p75) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [title.casefold(), location.casefold(), day.isoformat()] + values
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error recording job history: {e}")
+
+    def get_series(self, title: str, start: date, end: date, location: str = 'UK') -> List[Dict]:
+        """Daily observations for a title between start and end (inclusive), oldest first"""
+        rows = self._connection().execute(
+            'SELECT day, total_jobs, avg_salary, salary_median, salary_p25, salary_p75 '
+            'FROM job_history WHERE title_key = ? AND location = ? AND day BETWEEN ? AND ? '
+            'ORDER BY day',
+            (title.casefold(), location.casefold(), start.isoformat(), end.isoformat())
+        ).fetchall()
+
+        return [dict(zip(['day'] + HISTORY_METRICS, row)) for row in rows]
+
+    def monthly_trend(self, title: str, months: int = 12, location: str = 'UK') -> List[Dict]:
+        """
+        Monthly averages for the last `months` months, oldest first
+
+        Returns:
+            [{'month': 'YYYY-MM', 'total_jobs': float, 'avg_salary': float, 'salary_median': float}, ...]
+        """
+        end = date.today()
+        year, month = divmod(end.year * 12 + end.month - 1 - (months - 1), 12)
+        start = date(year, month + 1, 1)
+
+        rows = self._connection().execute(
+            'SELECT substr(day, 1, 7) AS month, AVG(total_jobs), AVG(avg_salary), AVG(salary_median) '
+            'FROM job_history WHERE title_key = ? AND location = ? AND day BETWEEN ? AND ? '
+            'GROUP BY month ORDER BY month',
+            (title.casefold(), location.casefold(), start.isoformat(), end.isoformat())
+        ).fetchall()
+
+        return [
+            {
+                'month': month,
+                'total_jobs': round(total_jobs, 0),
+                'avg_salary': round(avg_salary or 0, 0),
+                'salary_median': round(salary_median or 0, 0)
+            }
+            for month, total_jobs, avg_salary, salary_median in rows
+        ]
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=5)
+            self._local.conn = conn
+        return conn
+
+
+_shared_history = None
+_shared_history_lock = threading.Lock()
+
+
+def get_shared_history(path: Path = DEFAULT_HISTORY_PATH) -> JobHistoryStore:
+    """Process-wide history store (path only takes effect on the first call)"""
+    global _shared_history
+
+    with _shared_history_lock:
+        if _shared_history is None:
+            _shared_history = JobHistoryStore(path)
+        return _shared_history
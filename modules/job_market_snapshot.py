@@ -0,0 +1,264 @@
+"""
+Job Market Snapshot
+Prefetches Adzuna demand for every career title and skill in UK_CAREERS into a
+compact, versioned snapshot file, so the results page never waits on the live API
+
+Build once:      python -m modules.job_market_snapshot
+Keep refreshing: python -m modules.job_market_snapshot --loop
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows - builds are then only coordinated within one process
+    fcntl = None
+
+from .quota_scheduler import PRIORITY_BACKGROUND
+from .catalog_store import as_catalog_table, get_catalog_store
+
+SNAPSHOT_VERSION = 2
+DEFAULT_SNAPSHOT_PATH = Path(__file__).resolve().parent.parent / '.cache' / 'job_market_snapshot.json.gz'
+
+# ~75 queries x 3 pages per build - weekly keeps us well inside 5,000 requests/month
+DEFAULT_REFRESH_SECONDS = 7 * 24 * 60 * 60
+
+# How often readers check whether another process rotated the file
+RELOAD_CHECK_SECONDS = 60
+
+# Back-off after a failed build (e.g. disk full) so we don't burn quota retrying
+FAILED_BUILD_RETRY_SECONDS = 60 * 60
+
+# Background builds can afford a deeper salary sample than page views
+DEFAULT_SNAPSHOT_PAGES = 3
+
+# Only these fields are kept - everything else in a result is per-request noise
+SNAPSHOT_FIELDS = [
+    'total_jobs', 'avg_salary', 'salary_min', 'salary_max',
+    'salary_p25', 'salary_median', 'salary_p75', 'salaries_sampled',
+    'top_companies', 'locations'
+]
+
+
+def collect_queries(careers: Optional[Dict] = None) -> List[str]:
+    """
+    Every career title and skill in the catalog, de-duplicated case-insensitively
+    (first spelling wins), titles first
+    """
+    table = as_catalog_table(careers) if careers is not None else get_catalog_store().table('careers')[1]
+    queries = {}
+
+    for title in table.column('title'):
+        queries.setdefault(title.casefold(), title)
+
+    for skills in table.column('skills'):
+        for skill in skills or []:
+            queries.setdefault(skill.casefold(), skill)
+
+    return list(queries.values())
+
+
+class JobMarketSnapshot:
+    def __init__(self, data: Dict, mtime: float = 0.0):
+        """Read-only view over a loaded snapshot file"""
+        self.version = data['version']
+        self.generated_at = data['generated_at']
+        self.entries = data['entries']
+        self.mtime = mtime
+
+    def get(self, query: str) -> Optional[Dict]:
+        """Demand data for a title or skill in get_job_demand() format, or None"""
+        entry = self.entries.get(query.casefold())
+        if entry is None:
+            return None
+
+        result = dict(entry)
+        result['updated_at'] = datetime.fromisoformat(self.generated_at).strftime('%d %b %Y')
+        result['success'] = True
+        return result
+
+    def age_seconds(self) -> float:
+        return (datetime.now() - datetime.fromisoformat(self.generated_at)).total_seconds()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def load_snapshot(path: Path = DEFAULT_SNAPSHOT_PATH) -> Optional[JobMarketSnapshot]:
+    """Load a snapshot file, or None if it is missing, unreadable or from another format version"""
+    path = Path(path)
+
+    try:
+        mtime = path.stat().st_mtime
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if data.get('version') != SNAPSHOT_VERSION:
+        return None
+
+    return JobMarketSnapshot(data, mtime)
+
+
+def build_snapshot(api,
+                   path: Path = DEFAULT_SNAPSHOT_PATH,
+                   queries: Optional[List[str]] = None,
+                   max_pages: int = DEFAULT_SNAPSHOT_PAGES) -> JobMarketSnapshot:
+    """
+    Fetch every query through `api` (an AdzunaAPI) and atomically replace the snapshot file
+
+    Queries that fail keep their entry from the previous snapshot, so a bad
+    run (quota exhausted, API down) never wipes out good data
+    """
+    path = Path(path)
+    queries = queries if queries is not None else collect_queries()
+
+    previous = load_snapshot(path)
+    entries = dict(previous.entries) if previous else {}
+
+    results = api.get_job_demand_many(queries, max_pages=max_pages, priority=PRIORITY_BACKGROUND)
+    for query, result in results.items():
+        if result.get('success') and not result.get('stale'):
+            entries[query.casefold()] = {field: result[field] for field in SNAPSHOT_FIELDS}
+
+    data = {
+        'version': SNAPSHOT_VERSION,
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'entries': entries
+    }
+
+    # Write to a temp file then rename - readers only ever see a complete file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+    return JobMarketSnapshot(data, path.stat().st_mtime)
+
+
+@contextmanager
+def build_lock(path: Path = DEFAULT_SNAPSHOT_PATH):
+    """
+    Exclusive, non-blocking lock on <snapshot>.lock - yields False instead of
+    waiting when another process is already building
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + '.lock'), 'a') as f:
+        if fcntl:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)  # Released when the file closes
+            except BlockingIOError:
+                yield False
+                return
+        yield True
+
+
+class SnapshotRefresher(threading.Thread):
+    def __init__(self, api, path: Path = DEFAULT_SNAPSHOT_PATH, interval_seconds: float = DEFAULT_REFRESH_SECONDS):
+        """
+        Background thread that rebuilds the snapshot whenever it is older than
+        `interval_seconds`
+
+        Every worker process runs one, so builds go through build_lock: one worker
+        builds, the others see the lock taken and pick up its file on the next
+        check, and the age is read again under the lock so a build that just
+        finished isn't repeated
+        """
+        super().__init__(name='job-market-snapshot-refresher', daemon=True)
+        self.api = api
+        self.path = Path(path)
+        self.interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            snapshot = load_snapshot(self.path)
+
+            if self._stale(snapshot):
+                try:
+                    with build_lock(self.path) as acquired:
+                        if not acquired:
+                            self._stop_event.wait(RELOAD_CHECK_SECONDS)  # Another worker is building
+                            continue
+                        snapshot = load_snapshot(self.path)
+                        if self._stale(snapshot):
+                            snapshot = build_snapshot(self.api, self.path)
+                except Exception as e:
+                    print(f"Error refreshing job market snapshot: {e}")
+                    self._stop_event.wait(FAILED_BUILD_RETRY_SECONDS)
+                    continue
+
+            wait = self.interval_seconds - snapshot.age_seconds()
+            self._stop_event.wait(max(wait, RELOAD_CHECK_SECONDS))
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _stale(self, snapshot):
+        return snapshot is None or snapshot.age_seconds() >= self.interval_seconds
+
+
+_current_snapshot = None
+_last_checked = 0.0
+_refresher = None
+_snapshot_lock = threading.Lock()
+
+
+def get_current_snapshot(path: Path = DEFAULT_SNAPSHOT_PATH) -> Optional[JobMarketSnapshot]:
+    """
+    Process-wide snapshot, loaded once and swapped in when the file on disk is rotated
+    """
+    global _current_snapshot, _last_checked
+
+    with _snapshot_lock:
+        now = time.monotonic()
+        if _current_snapshot is None or now - _last_checked >= RELOAD_CHECK_SECONDS:
+            _last_checked = now
+            try:
+                mtime = Path(path).stat().st_mtime
+            except OSError:
+                mtime = None
+
+            if mtime is not None and (_current_snapshot is None or mtime != _current_snapshot.mtime):
+                _current_snapshot = load_snapshot(path) or _current_snapshot
+
+        return _current_snapshot
+
+
+def start_shared_refresher(api, path: Path = DEFAULT_SNAPSHOT_PATH,
+                           interval_seconds: float = DEFAULT_REFRESH_SECONDS) -> SnapshotRefresher:
+    """Start the process-wide refresher thread (no-op if it is already running)"""
+    global _refresher
+
+    with _snapshot_lock:
+        if _refresher is None or not _refresher.is_alive():
+            _refresher = SnapshotRefresher(api, path, interval_seconds)
+            _refresher.start()
+        return _refresher
+
+
+if __name__ == "__main__":
+    import sys
+    from .adzuna_api import AdzunaAPI
+    from .quota_scheduler import get_shared_scheduler
+
+    api = AdzunaAPI(os.environ['ADZUNA_APP_ID'], os.environ['ADZUNA_API_KEY'], scheduler=get_shared_scheduler())
+
+    if '--loop' in sys.argv:
+        refresher = SnapshotRefresher(api)
+        refresher.start()
+        refresher.join()
+    else:
+        snapshot = build_snapshot(api)
+        print(f"Wrote {len(snapshot)} entries to {DEFAULT_SNAPSHOT_PATH} ({snapshot.generated_at})")
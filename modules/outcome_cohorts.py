@@ -0,0 +1,95 @@
+"""
+Outcome Cohorts
+Pre-aggregated evidence cells keyed by pathway x (grit, hands-on) score bins
+Cells are updated as outcomes are ingested, so evidence is a sum over a fixed
+handful of cells and never touches raw outcome rows
+"""
+
+import math
+from typing import Dict, Iterable, List, Tuple
+
+from .outcome_index import SIMILARITY_RADIUS
+
+BIN_WIDTH = 1.0  # Score points per bin
+SATISFIED_THRESHOLD = 7
+
+# Running totals held by every cell, in storage order
+CELL_FIELDS = [
+    'count', 'satisfaction_sum', 'satisfaction_sumsq', 'satisfied',
+    'salary_count', 'salary_sum', 'salary_sumsq'
+]
+CELL_TYPES = {field: 'INTEGER' if field in ('count', 'satisfied', 'salary_count') else 'REAL' for field in CELL_FIELDS}
+
+
+def score_bin(score: float) -> int:
+    return math.floor(score / BIN_WIDTH)
+
+
+def neighbour_bins(score: float, radius: float = SIMILARITY_RADIUS) -> List[int]:
+    """Bins whose centre lies within `radius` of score - the binned version of |diff| < radius"""
+    return [
+        b for b in range(score_bin(score - radius), score_bin(score + radius) + 1)
+        if abs((b + 0.5) * BIN_WIDTH - score) < radius
+    ]
+
+
+def cell_key(row: Dict) -> Tuple[str, int, int]:
+    return row['pathway'], score_bin(row['grit_score']), score_bin(row['hands_on_score'])
+
+
+def cell_delta(row: Dict) -> List[float]:
+    """One outcome row's contribution to its cell (negate to remove it)"""
+    satisfaction = row.get('satisfaction_score') or 0
+    salary = row.get('current_salary') or 0
+    return [
+        1, satisfaction, satisfaction * satisfaction, 1 if satisfaction >= SATISFIED_THRESHOLD else 0,
+        1 if salary else 0, salary, salary * salary
+    ]
+
+
+class CohortAggregates:
+    def __init__(self, cells: Iterable[Tuple] = ()):
+        """
+        Initialize the aggregates
+
+        Args:
+            cells: (pathway, grit_bin, hands_on_bin, *CELL_FIELDS) tuples,
+                   e.g. loaded from OutcomeStore's cohort_cells table
+        """
+        self._cells = {}  # (pathway, grit_bin, hands_on_bin) -> [totals in CELL_FIELDS order]
+        self._size = 0
+        for pathway, grit_bin, hands_on_bin, *totals in cells:
+            self._cells[(pathway, grit_bin, hands_on_bin)] = list(totals)
+            self._size += totals[0]
+
+    def add(self, row: Dict):
+        """Ingest one outcome row"""
+        self._apply(cell_key(row), cell_delta(row))
+
+    def remove(self, row: Dict):
+        """Undo add() for a row that was corrected or deleted"""
+        self._apply(cell_key(row), [-value for value in cell_delta(row)])
+
+    def totals(self, pathway: str, grit: float, hands_on: float) -> Dict:
+        """Summed CELL_FIELDS over the cells neighbouring a profile"""
+        summed = [0] * len(CELL_FIELDS)
+        for g in neighbour_bins(grit):
+            for h in neighbour_bins(hands_on):
+                cell = self._cells.get((pathway, g, h))
+                if cell:
+                    summed = [a + b for a, b in zip(summed, cell)]
+        return dict(zip(CELL_FIELDS, summed))
+
+    def cells(self) -> Iterable[Tuple]:
+        """(pathway, grit_bin, hands_on_bin, *CELL_FIELDS) tuples - the constructor's input format"""
+        for key, totals in self._cells.items():
+            yield key + tuple(totals)
+
+    def __len__(self):
+        return self._size
+
+    def _apply(self, key, delta):
+        cell = self._cells.setdefault(key, [0] * len(CELL_FIELDS))
+        for i, value in enumerate(delta):
+            cell[i] += value
+        self._size += delta[0]
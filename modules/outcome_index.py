@@ -0,0 +1,60 @@
+"""
+Outcome Index
+Grid index over (pathway, grit_score, hands_on_score) so similar-profile lookups
+only visit the few cells around a profile instead of every outcome row
+"""
+
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator
+
+SIMILARITY_RADIUS = 2  # build_evidence_statement: |score difference| < 2 on both axes
+
+
+class OutcomeIndex:
+    def __init__(self, rows: Iterable[Dict] = (), cell_size: float = SIMILARITY_RADIUS):
+        """
+        Initialize the index
+
+        Args:
+            rows: Outcome rows with 'pathway', 'grit_score' and 'hands_on_score'
+            cell_size: Grid cell width in score points (>= the query radius keeps
+                       every query to a 3x3 block of cells)
+        """
+        self.cell_size = cell_size
+        self._cells = defaultdict(list)  # (pathway, grit_cell, hands_on_cell) -> [row, ...]
+        self._size = 0
+        self.extend(rows)
+
+    @classmethod
+    def from_store(cls, store, pathway=None):
+        """Build an index from an OutcomeStore's evidence rows"""
+        return cls(store.iter_evidence_rows(pathway=pathway))
+
+    def add(self, row: Dict):
+        if row.get('grit_score') is None or row.get('hands_on_score') is None:
+            return
+        self._cells[self._cell(row['pathway'], row['grit_score'], row['hands_on_score'])].append(row)
+        self._size += 1
+
+    def extend(self, rows: Iterable[Dict]):
+        for row in rows:
+            self.add(row)
+
+    def similar(self, pathway: str, grit: float, hands_on: float,
+                radius: float = SIMILARITY_RADIUS) -> Iterator[Dict]:
+        """Rows on `pathway` whose grit and hands-on scores are both within (exclusive) `radius`"""
+        span = math.ceil(radius / self.cell_size)
+        _, grit_cell, hands_on_cell = self._cell(pathway, grit, hands_on)
+
+        for g in range(grit_cell - span, grit_cell + span + 1):
+            for h in range(hands_on_cell - span, hands_on_cell + span + 1):
+                for row in self._cells.get((pathway, g, h), ()):
+                    if abs(row['grit_score'] - grit) < radius and abs(row['hands_on_score'] - hands_on) < radius:
+                        yield row
+
+    def __len__(self):
+        return self._size
+
+    def _cell(self, pathway, grit, hands_on):
+        return pathway, math.floor(grit / self.cell_size), math.floor(hands_on / self.cell_size)
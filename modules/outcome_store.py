@@ -0,0 +1,419 @@
+"""
+Outcome Store
+Persistent, indexed storage for initial decisions and follow-up outcomes
+Cohort evidence cells are kept up to date in the same transaction as each outcome
+SQLite in WAL mode: many Streamlit workers can write while analytics jobs read
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .outcome_cohorts import CELL_FIELDS, CELL_TYPES, CohortAggregates, cell_delta, cell_key
+
+DEFAULT_OUTCOME_PATH = Path(__file__).resolve().parent.parent / '.cache' / 'outcomes.sqlite3'
+
+# Columns copied straight from OutcomeTracker.capture_initial_decision()
+DECISION_COLUMNS = [
+    'timestamp', 'email', 'name',
+    'grit_score', 'hands_on_score', 'structure_score', 'risk_tolerance_score',
+    'interest_field', 'budget', 'age', 'location',
+    'recommended_pathway', 'predicted_roi', 'predicted_salary_year_5',
+    'follow_up_6_months', 'follow_up_12_months', 'follow_up_24_months',
+    'outcome_captured', 'consent_to_follow_up'
+]
+
+# Fields that may change after the decision is captured
+UPDATABLE_COLUMNS = {'email', 'name', 'consent_to_follow_up', 'outcome_captured'}
+
+FOLLOW_UP_MONTHS = [6, 12, 24]  # follow_up_<n>_months columns
+
+# Survey answers that map onto the indexed outcome columns, in order of preference
+# (question ids differ between the 6, 12 and 24 month surveys)
+OUTCOME_SOURCES = {
+    'pathway': ['pathway_followed'],
+    'satisfaction_score': ['satisfaction_score', 'job_satisfaction', 'overall_satisfaction'],
+    'current_salary': ['current_salary', 'current_earnings', 'final_salary'],
+    'net_wealth': ['net_wealth'],
+    'final_salary': ['final_salary']
+}
+
+SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS initial_decisions (
+        id INTEGER PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        email TEXT,
+        name TEXT,
+        grit_score REAL,
+        hands_on_score REAL,
+        structure_score REAL,
+        risk_tolerance_score REAL,
+        interest_field TEXT,
+        budget REAL,
+        age INTEGER,
+        location TEXT,
+        recommended_pathway TEXT,
+        predicted_roi REAL,
+        predicted_salary_year_5 REAL,
+        follow_up_6_months TEXT,
+        follow_up_12_months TEXT,
+        follow_up_24_months TEXT,
+        outcome_captured INTEGER NOT NULL DEFAULT 0,
+        consent_to_follow_up INTEGER NOT NULL DEFAULT 0
+    )''',
+    'CREATE INDEX IF NOT EXISTS idx_decisions_pathway ON initial_decisions (recommended_pathway)',
+    'CREATE INDEX IF NOT EXISTS idx_decisions_field ON initial_decisions (interest_field)',
+    'CREATE INDEX IF NOT EXISTS idx_decisions_grit ON initial_decisions (grit_score)',
+    'CREATE INDEX IF NOT EXISTS idx_decisions_hands_on ON initial_decisions (hands_on_score)',
+    'CREATE INDEX IF NOT EXISTS idx_decisions_structure ON initial_decisions (structure_score)',
+    'CREATE INDEX IF NOT EXISTS idx_decisions_risk ON initial_decisions (risk_tolerance_score)',
+    '''CREATE TABLE IF NOT EXISTS outcomes (
+        id INTEGER PRIMARY KEY,
+        decision_id INTEGER NOT NULL REFERENCES initial_decisions (id),
+        months_elapsed INTEGER NOT NULL,
+        recorded_at TEXT NOT NULL,
+        pathway TEXT,
+        satisfaction_score REAL,
+        current_salary REAL,
+        net_wealth REAL,
+        final_salary REAL,
+        responses TEXT NOT NULL,
+        UNIQUE (decision_id, months_elapsed)
+    )''',
+    'CREATE INDEX IF NOT EXISTS idx_outcomes_pathway ON outcomes (pathway)',
+    '''CREATE TABLE IF NOT EXISTS follow_ups (
+        decision_id INTEGER NOT NULL REFERENCES initial_decisions (id),
+        months_elapsed INTEGER NOT NULL,
+        due_at TEXT NOT NULL,
+        processed_at TEXT,
+        status TEXT,
+        PRIMARY KEY (decision_id, months_elapsed)
+    )''',
+    # Partial index: only pending follow-ups, ordered by due date
+    'CREATE INDEX IF NOT EXISTS idx_follow_ups_due ON follow_ups (due_at) WHERE processed_at IS NULL',
+    f'''CREATE TABLE IF NOT EXISTS cohort_cells (
+        pathway TEXT NOT NULL,
+        grit_bin INTEGER NOT NULL,
+        hands_on_bin INTEGER NOT NULL,
+        {', '.join(f'{field} {CELL_TYPES[field]} NOT NULL' for field in CELL_FIELDS)},
+        PRIMARY KEY (pathway, grit_bin, hands_on_bin)
+    ) WITHOUT ROWID'''
+]
+
+
+class OutcomeStore:
+    def __init__(self, path: Path = DEFAULT_OUTCOME_PATH):
+        """
+        Initialize the store
+
+        Args:
+            path: SQLite database file (created with its schema on first use)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        with conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    def save_initial_decision(self, tracking_data: Dict) -> int:
+        """
+        Persist a capture_initial_decision() dict
+
+        Returns:
+            The new decision id (keep it to attach follow-up outcomes)
+        """
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(
+                f"INSERT INTO initial_decisions ({', '.join(DECISION_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(DECISION_COLUMNS))})",
+                _decision_values(tracking_data)
+            )
+            self._schedule_follow_ups(conn, cursor.lastrowid, cursor.lastrowid)
+        return cursor.lastrowid
+
+    def save_initial_decisions(self, rows: List[Dict]):
+        """Bulk insert (imports, backfills) in a single transaction"""
+        conn = self._connection()
+        with conn:
+            first_id = conn.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM initial_decisions').fetchone()[0]
+            conn.executemany(
+                f"INSERT INTO initial_decisions ({', '.join(DECISION_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(DECISION_COLUMNS))})",
+                (_decision_values(row) for row in rows)
+            )
+            self._schedule_follow_ups(conn, first_id)
+
+    def schedule_follow_ups(self, since_id: int = 0):
+        """Queue follow-ups for decisions stored before the follow_ups table existed"""
+        conn = self._connection()
+        with conn:
+            self._schedule_follow_ups(conn, since_id)
+
+    def process_due_follow_ups(self, handler, now: Optional[datetime] = None, limit: int = 500) -> int:
+        """
+        Hand up to `limit` due follow-ups to handler() and mark them processed
+
+        Uses the partial due-date index, so the cost depends on how many are due,
+        not how many are tracked. Rows are claimed under the write lock and only
+        marked once handler() returns - two workers never process the same row.
+
+        Args:
+            handler: Called with the due rows (follow-up joined to its decision);
+                     returns {(decision_id, months_elapsed): status}
+            now: Treat follow-ups due at or before this time as due
+
+        Returns:
+            Number of rows processed (0 when nothing is due)
+        """
+        now = (now or datetime.now()).isoformat()
+        conn = self._connection()
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            cursor = conn.execute(
+                'SELECT f.decision_id, f.months_elapsed, f.due_at, d.email, d.name, '
+                'd.recommended_pathway, d.consent_to_follow_up '
+                'FROM follow_ups f JOIN initial_decisions d ON d.id = f.decision_id '
+                'WHERE f.processed_at IS NULL AND f.due_at <= ? ORDER BY f.due_at LIMIT ?',
+                (now, limit)
+            )
+            names = [description[0] for description in cursor.description]
+            rows = [dict(zip(names, row)) for row in cursor.fetchall()]
+
+            if rows:
+                statuses = handler(rows)
+                conn.executemany(
+                    'UPDATE follow_ups SET processed_at = ?, status = ? WHERE decision_id = ? AND months_elapsed = ?',
+                    ((now, status, decision_id, months) for (decision_id, months), status in statuses.items())
+                )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+        return len(rows)
+
+    def update_decision(self, decision_id: int, **fields):
+        """Update contact/consent fields of a stored decision"""
+        unknown = set(fields) - UPDATABLE_COLUMNS
+        if unknown:
+            raise ValueError(f"Cannot update: {', '.join(sorted(unknown))}")
+        if not fields:
+            return
+
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                f"UPDATE initial_decisions SET {', '.join(f'{k} = ?' for k in fields)} WHERE id = ?",
+                list(fields.values()) + [decision_id]
+            )
+
+    def record_outcome(self, decision_id: int, months_elapsed: int, responses: Dict) -> int:
+        """
+        Store follow-up survey answers (one row per decision per follow-up)
+
+        Args:
+            decision_id: Id returned by save_initial_decision()
+            months_elapsed: 6, 12 or 24
+            responses: Answers keyed by question id from generate_follow_up_questions()
+        """
+        columns = {
+            column: next((responses[key] for key in sources if responses.get(key) not in (None, '')), None)
+            for column, sources in OUTCOME_SOURCES.items()
+        }
+
+        conn = self._connection()
+        with conn:
+            decision = conn.execute(
+                'SELECT recommended_pathway, grit_score, hands_on_score FROM initial_decisions WHERE id = ?',
+                (decision_id,)
+            ).fetchone() or (None, None, None)
+            if columns['pathway'] is None:
+                # Not asked after 6 months - fall back to what we recommended
+                columns['pathway'] = decision[0]
+
+            # Re-submitted surveys replace the earlier answer - take it out of its cohort first
+            previous = conn.execute(
+                'SELECT pathway, satisfaction_score, current_salary FROM outcomes '
+                'WHERE decision_id = ? AND months_elapsed = ?',
+                (decision_id, months_elapsed)
+            ).fetchone()
+            if previous:
+                self._update_cohort(conn, previous + decision[1:], -1)
+
+            # Upsert rather than REPLACE: the row keeps its id, so incremental readers
+            # (SalaryCalibrator.ingest_store) don't see a resubmission as a new outcome
+            outcome_id = conn.execute(
+                'INSERT INTO outcomes (decision_id, months_elapsed, recorded_at, pathway, '
+                'satisfaction_score, current_salary, net_wealth, final_salary, responses) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (decision_id, months_elapsed) DO UPDATE SET '
+                'recorded_at = excluded.recorded_at, pathway = excluded.pathway, '
+                'satisfaction_score = excluded.satisfaction_score, current_salary = excluded.current_salary, '
+                'net_wealth = excluded.net_wealth, final_salary = excluded.final_salary, '
+                'responses = excluded.responses '
+                'RETURNING id',
+                (decision_id, months_elapsed, datetime.now().isoformat(), columns['pathway'],
+                 columns['satisfaction_score'], columns['current_salary'],
+                 columns['net_wealth'], columns['final_salary'], json.dumps(responses))
+            ).fetchone()[0]
+            conn.execute('UPDATE initial_decisions SET outcome_captured = 1 WHERE id = ?', (decision_id,))
+            self._update_cohort(
+                conn, (columns['pathway'], columns['satisfaction_score'], columns['current_salary']) + decision[1:], 1
+            )
+        return outcome_id
+
+    def cohorts(self) -> CohortAggregates:
+        """Load the pre-aggregated evidence cells (small - one row per occupied cell)"""
+        rows = self._connection().execute(
+            f"SELECT pathway, grit_bin, hands_on_bin, {', '.join(CELL_FIELDS)} FROM cohort_cells"
+        ).fetchall()
+        return CohortAggregates(rows)
+
+    def rebuild_cohorts(self):
+        """Recompute every cohort cell from the raw outcomes (backfills, repairs)"""
+        aggregates = CohortAggregates()
+        for row in self.iter_evidence_rows():
+            if _cohort_ready(row):
+                aggregates.add(row)
+
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM cohort_cells')
+            conn.executemany(
+                f"INSERT INTO cohort_cells VALUES ({', '.join('?' * (3 + len(CELL_FIELDS)))})",
+                aggregates.cells()
+            )
+
+    def get_decision(self, decision_id: int) -> Optional[Dict]:
+        rows = self._query('SELECT * FROM initial_decisions WHERE id = ?', (decision_id,))
+        return next(rows, None)
+
+    def iter_decisions(self, pathway: Optional[str] = None, interest_field: Optional[str] = None,
+                       batch_size: int = 5000) -> Iterator[Dict]:
+        """Stream decisions (optionally filtered on indexed columns) without loading them all"""
+        sql, params = 'SELECT * FROM initial_decisions WHERE 1 = 1', []
+        if pathway:
+            sql += ' AND recommended_pathway = ?'
+            params.append(pathway)
+        if interest_field:
+            sql += ' AND interest_field = ?'
+            params.append(interest_field)
+
+        return self._query(sql + ' ORDER BY id', params, batch_size)
+
+    def iter_evidence_rows(self, pathway: Optional[str] = None, batch_size: int = 5000) -> Iterator[Dict]:
+        """
+        Outcomes joined to their profile scores, in the shape
+        OutcomeTracker.build_evidence_statement() consumes
+        """
+        sql = (
+            'SELECT o.decision_id, o.months_elapsed, o.pathway, o.satisfaction_score, o.current_salary, '
+            'd.grit_score, d.hands_on_score, d.structure_score, d.risk_tolerance_score, d.interest_field '
+            'FROM outcomes o JOIN initial_decisions d ON d.id = o.decision_id'
+        )
+        params = []
+        if pathway:
+            sql += ' WHERE o.pathway = ?'
+            params.append(pathway)
+
+        return self._query(sql, params, batch_size)
+
+    def query(self, sql: str, params=(), batch_size: int = 5000) -> Iterator[Dict]:
+        """Stream the rows of a read query as dicts, fetching batch_size at a time"""
+        return self._query(sql, params, batch_size)
+
+    def fetch_columns(self, sql: str, params=()) -> Dict[str, list]:
+        """
+        Run a read query and return it column-wise ({column: [values]}) -
+        the bulk format analytics code (e.g. pandas.DataFrame) wants
+        """
+        cursor = self._connection().execute(sql, params)
+        names = [description[0] for description in cursor.description]
+        columns = {name: [] for name in names}
+        for row in cursor:
+            for name, value in zip(names, row):
+                columns[name].append(value)
+        return columns
+
+    def count(self, table: str = 'initial_decisions') -> int:
+        if table not in ('initial_decisions', 'outcomes'):
+            raise ValueError(f"Unknown table: {table}")
+        return self._connection().execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+
+    def _schedule_follow_ups(self, conn, first_id, last_id=None):
+        for months in FOLLOW_UP_MONTHS:
+            conn.execute(
+                f'INSERT OR IGNORE INTO follow_ups (decision_id, months_elapsed, due_at) '
+                f'SELECT id, {months}, follow_up_{months}_months FROM initial_decisions '
+                f'WHERE id BETWEEN ? AND ? AND follow_up_{months}_months IS NOT NULL',
+                (first_id, last_id if last_id is not None else 2 ** 63 - 1)
+            )
+
+    def _update_cohort(self, conn, values, sign):
+        row = dict(zip(['pathway', 'satisfaction_score', 'current_salary', 'grit_score', 'hands_on_score'], values))
+        if not _cohort_ready(row):
+            return
+
+        delta = [sign * value for value in cell_delta(row)]
+        conn.execute(
+            f"INSERT INTO cohort_cells (pathway, grit_bin, hands_on_bin, {', '.join(CELL_FIELDS)}) "
+            f"VALUES ({', '.join('?' * (3 + len(CELL_FIELDS)))}) "
+            f"ON CONFLICT (pathway, grit_bin, hands_on_bin) DO UPDATE SET "
+            f"{', '.join(f'{field} = {field} + excluded.{field}' for field in CELL_FIELDS)}",
+            cell_key(row) + tuple(delta)
+        )
+
+    def _query(self, sql, params=(), batch_size=1000):
+        cursor = self._connection().execute(sql, params)
+        names = [description[0] for description in cursor.description]
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield dict(zip(names, row))
+
+    def _connection(self):
+        # One connection per thread; busy timeout lets concurrent writers queue
+        # for the WAL write lock instead of failing
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=10)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+
+def _cohort_ready(row):
+    return all(row.get(key) is not None for key in ('pathway', 'grit_score', 'hands_on_score', 'satisfaction_score'))
+
+
+def _decision_values(tracking_data):
+    values = dict(tracking_data)
+    values['timestamp'] = values.get('timestamp') or datetime.now().isoformat()
+    values['outcome_captured'] = int(bool(values.get('outcome_captured')))
+    values['consent_to_follow_up'] = int(bool(values.get('consent_to_follow_up')))
+    return [values.get(column) for column in DECISION_COLUMNS]
+
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def get_shared_outcome_store(path: Path = DEFAULT_OUTCOME_PATH) -> OutcomeStore:
+    """Process-wide outcome store (path only takes effect on the first call)"""
+    global _shared_store
+
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = OutcomeStore(path)
+        return _shared_store
@@ -6,8 +6,12 @@ This is THE moat. The data that makes you irreplaceable.
 """
 
 from datetime import datetime, timedelta
+from string import Template
 import json
 
+from .outcome_cohorts import CohortAggregates
+from .outcome_index import OutcomeIndex
+
 class OutcomeTracker:
     def __init__(self):
         """Initialize outcome tracking system"""
@@ -274,11 +278,80 @@ class OutcomeTracker:
             'prediction_error': abs(predicted_roi - actual_net_wealth)
         }
     
+    def calculate_prediction_accuracy_batch(self, store, months_elapsed=24):
+        """
+        calculate_prediction_accuracy over every stored decision at once
+        Shows where the ROICalculator tables are miscalibrated
+        
+        Args:
+            store: OutcomeStore holding the decisions and outcomes
+            months_elapsed: Which follow-up to score (24 = final salary/net wealth)
+        
+        Returns: {
+            'rows': DataFrame with roi_accuracy, salary_accuracy, prediction_error per outcome,
+            'summary': overall means,
+            'breakdowns': {'pathway' | 'interest_field' | 'grit_band' | 'hands_on_band': DataFrame}
+        }
+        """
+        import pandas as pd  # Heavy - only analytics jobs pay for the import
+        
+        frame = pd.DataFrame(store.fetch_columns(
+            'SELECT d.id AS decision_id, o.pathway, d.interest_field, d.grit_score, d.hands_on_score, '
+            'd.predicted_roi, d.predicted_salary_year_5, o.net_wealth, o.final_salary '
+            'FROM outcomes o JOIN initial_decisions d ON d.id = o.decision_id '
+            'WHERE o.months_elapsed = ?',
+            (months_elapsed,)
+        ))
+        
+        # Same formulas as calculate_prediction_accuracy, on whole columns
+        # (missing answers stay NaN and drop out of the means instead of scoring 0)
+        predicted_roi = frame['predicted_roi'].astype(float).fillna(0)
+        predicted_salary = frame['predicted_salary_year_5'].astype(float).fillna(0)
+        actual_net_wealth = frame['net_wealth'].astype(float)
+        actual_salary = frame['final_salary'].astype(float)
+        
+        frame['prediction_error'] = (predicted_roi - actual_net_wealth).abs()
+        frame['roi_accuracy'] = (1 - frame['prediction_error'] / predicted_roi.abs().clip(lower=1)).clip(0, 1)
+        frame['salary_accuracy'] = (1 - (predicted_salary - actual_salary).abs() / predicted_salary.clip(lower=1)).clip(0, 1)
+        frame['salary_bias'] = actual_salary - predicted_salary  # > 0: we under-predicted
+        
+        # Same bands as PsychometricAssessment.get_profile_interpretation
+        bands = [float('-inf'), 4, 7, float('inf')]
+        frame['grit_band'] = pd.cut(frame['grit_score'], bands, right=False, labels=['low', 'moderate', 'high'])
+        frame['hands_on_band'] = pd.cut(frame['hands_on_score'], bands, right=False, labels=['low', 'moderate', 'high'])
+        
+        metrics = {
+            'outcomes': ('decision_id', 'count'),
+            'roi_accuracy': ('roi_accuracy', 'mean'),
+            'salary_accuracy': ('salary_accuracy', 'mean'),
+            'prediction_error': ('prediction_error', 'mean'),
+            'salary_bias': ('salary_bias', 'mean')
+        }
+        breakdowns = {
+            column: frame.groupby(column, observed=True).agg(**metrics).round(3)
+            for column in ['pathway', 'interest_field', 'grit_band', 'hands_on_band']
+        }
+        
+        return {
+            'rows': frame,
+            'summary': {
+                'outcomes': len(frame),
+                'roi_accuracy': round(frame['roi_accuracy'].mean(), 3),
+                'salary_accuracy': round(frame['salary_accuracy'].mean(), 3),
+                'prediction_error': round(frame['prediction_error'].mean(), 0),
+                'salary_bias': round(frame['salary_bias'].mean(), 0)
+            },
+            'breakdowns': breakdowns
+        }
+    
     def build_evidence_statement(self, profile_type, pathway, outcomes_data):
         """
         Generate evidence-based recommendation from outcome data
         This is what Claude CAN'T do - you have real evidence
         
+        outcomes_data: list of outcome rows, an OutcomeIndex, or CohortAggregates
+                       (binned cohorts - O(1), the fastest for large datasets)
+        
         Example: "83% of high-grit, hands-on students who chose apprenticeships
                  report 9/10 satisfaction after 12 months, with average salary of £28k"
         """
@@ -286,31 +359,62 @@ class OutcomeTracker:
         if not outcomes_data or len(outcomes_data) < 10:
             return None  # Need minimum 10 data points
         
-        # Filter outcomes for similar profiles
-        similar_outcomes = [
-            o for o in outcomes_data 
-            if o['pathway'] == pathway 
-            and abs(o['grit_score'] - profile_type['grit']) < 2
-            and abs(o['hands_on_score'] - profile_type['hands_on']) < 2
-        ]
-        
-        if len(similar_outcomes) < 5:
+        if isinstance(outcomes_data, CohortAggregates):
+            # Pre-aggregated cells - no raw rows needed
+            totals = outcomes_data.totals(pathway, profile_type['grit'], profile_type['hands_on'])
+            sample_size = totals['count']
+            satisfaction_total = totals['satisfaction_sum']
+            satisfaction_sumsq = totals['satisfaction_sumsq']
+            satisfied = totals['satisfied']
+            salary_total = totals['salary_sum']
+            salary_count = totals['salary_count']
+        else:
+            # Filter outcomes for similar profiles (grid lookup when given an OutcomeIndex)
+            if isinstance(outcomes_data, OutcomeIndex):
+                similar_outcomes = outcomes_data.similar(pathway, profile_type['grit'], profile_type['hands_on'])
+            else:
+                similar_outcomes = (
+                    o for o in outcomes_data 
+                    if o['pathway'] == pathway 
+                    and abs(o['grit_score'] - profile_type['grit']) < 2
+                    and abs(o['hands_on_score'] - profile_type['hands_on']) < 2
+                )
+            
+            # Calculate statistics in a single pass
+            sample_size = 0
+            satisfaction_total = 0
+            satisfaction_sumsq = 0
+            satisfied = 0
+            salary_total = 0
+            salary_count = 0
+            for o in similar_outcomes:
+                sample_size += 1
+                satisfaction_total += o['satisfaction_score']
+                satisfaction_sumsq += o['satisfaction_score'] ** 2
+                if o['satisfaction_score'] >= 7:
+                    satisfied += 1
+                if o.get('current_salary'):
+                    salary_total += o['current_salary']
+                    salary_count += 1
+        
+        if sample_size < 5:
             return None
         
-        # Calculate statistics
-        avg_satisfaction = sum(o['satisfaction_score'] for o in similar_outcomes) / len(similar_outcomes)
-        avg_salary = sum(o['current_salary'] for o in similar_outcomes if o.get('current_salary')) / len([o for o in similar_outcomes if o.get('current_salary')])
-        success_rate = len([o for o in similar_outcomes if o['satisfaction_score'] >= 7]) / len(similar_outcomes)
+        avg_satisfaction = satisfaction_total / sample_size
+        satisfaction_std = max(satisfaction_sumsq / sample_size - avg_satisfaction ** 2, 0) ** 0.5
+        avg_salary = salary_total / salary_count if salary_count else 0
+        success_rate = satisfied / sample_size
         
         evidence = {
-            'sample_size': len(similar_outcomes),
+            'sample_size': sample_size,
             'avg_satisfaction': round(avg_satisfaction, 1),
+            'satisfaction_std': round(satisfaction_std, 1),
             'avg_salary': round(avg_salary, 0),
             'success_rate': round(success_rate * 100, 0),
-            'confidence': 'high' if len(similar_outcomes) > 20 else 'moderate',
+            'confidence': 'high' if sample_size > 20 else 'moderate',
             
             'statement': f"""
-            Based on {len(similar_outcomes)} students with similar profiles who chose {pathway}:
+            Based on {sample_size} students with similar profiles who chose {pathway}:
             
             • {round(success_rate * 100)}% report high satisfaction (7+/10)
             • Average salary after 12 months: £{int(avg_salary):,}
@@ -336,20 +440,15 @@ def create_outcome_tracking_link(user_email, tracking_id):
     return f"https://education-path-finder.streamlit.app/outcome-survey?id={unique_id}"
 
 
-def generate_follow_up_email_template(user_name, pathway_chosen, months_elapsed=6):
-    """
-    Email template for outcome tracking
-    Critical: This builds your data moat
-    """
-    
-    if months_elapsed == 6:
-        subject = f"Quick check-in: How's {pathway_chosen.lower()} going?"
-        
-        body = f"""
-        Hi {user_name},
+# Compiled once at import - the follow-up scheduler renders these in bulk
+FOLLOW_UP_TEMPLATES = {
+    6: {
+        'subject': Template("Quick check-in: How's ${pathway_lower} going?"),
+        'body': Template("""
+        Hi ${user_name},
         
         It's been 6 months since you used Education Path Finder. We recommended 
-        {pathway_chosen} based on your profile, and we'd love to know how it's going!
+        ${pathway_chosen} based on your profile, and we'd love to know how it's going!
         
         WHY WE'RE ASKING:
         Your feedback helps future students like you make better decisions. We're 
@@ -372,15 +471,14 @@ def generate_follow_up_email_template(user_name, pathway_chosen, months_elapsed=
         Education Path Finder Team
         
         P.S. Your data is anonymized for research. We'll never share your personal details.
-        """
-    
-    elif months_elapsed == 12:
-        subject = "One year on: Share your journey (+ see our predictions vs reality)"
+        """)
+    },
+    12: {
+        'subject': Template("One year on: Share your journey (+ see our predictions vs reality)"),
+        'body': Template("""
+        Hi ${user_name},
         
-        body = f"""
-        Hi {user_name},
-        
-        A year ago, we predicted {pathway_chosen} would work well for you.
+        A year ago, we predicted ${pathway_chosen} would work well for you.
         
         Were we right?
         
@@ -403,10 +501,59 @@ def generate_follow_up_email_template(user_name, pathway_chosen, months_elapsed=
         
         Cheers,
         Education Path Finder Team
-        """
+        """)
+    },
+    24: {
+        'subject': Template("Two years on: Your final outcome check-in"),
+        'body': Template("""
+        Hi ${user_name},
+        
+        Two years ago you used Education Path Finder, and we recommended ${pathway_chosen}.
+        This is our final check-in - and the most valuable one.
+        
+        Two years is long enough to see how a pathway really pays off. Your answers
+        become part of the evidence future students see when they make the same choice.
+        
+        FINAL SURVEY (4 minutes):
+        → Current job and salary
+        → Remaining debt and rough net wealth
+        → Overall satisfaction with your choice
+        → What you'd tell your 18-year-old self
+        
+        [Complete your 2-year survey]
+        
+        YOU'LL GET:
+        • Your full 2-year report: our predictions vs. your reality
+        • How your outcome compares to students with a similar profile
+        • Entered to win £250 Amazon voucher
+        
+        Thank you for sticking with us - this is how we prove what works.
+        
+        Education Path Finder Team
+        
+        P.S. Your data is anonymized for research. We'll never share your personal details.
+        """)
+    }
+}
+
+
+def generate_follow_up_email_template(user_name, pathway_chosen, months_elapsed=6):
+    """
+    Email template for outcome tracking
+    Critical: This builds your data moat
+    
+    months_elapsed: 6, 12 or 24
+    """
+    
+    template = FOLLOW_UP_TEMPLATES[months_elapsed]
+    fields = {
+        'user_name': user_name,
+        'pathway_chosen': pathway_chosen,
+        'pathway_lower': pathway_chosen.lower()
+    }
     
     return {
-        'subject': subject,
-        'body': body,
+        'subject': template['subject'].substitute(fields),
+        'body': template['body'].substitute(fields),
         'send_date': datetime.now() + timedelta(days=30 * months_elapsed)
     }
@@ -0,0 +1,229 @@
+"""
+Programme ROI
+5- and 10-year net wealth for every programme in the catalogue, ranked per student
+Uses the same year-by-year model as ROICalculator, in closed form, over whole columns
+"""
+
+import heapq
+import math
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from .programme_search import get_programme_search
+
+HORIZONS = (5, 10)
+RANK_BY = ('net_wealth_5', 'net_wealth_10', 'fit')
+DEFAULT_FIELD = 'Technology & Software'  # ROICalculator's fallback for unknown fields
+
+# Programme fit_tags that suit each end of the psychometric scales
+HIGH_SCORE_TAGS = {
+    'grit': ['high_grit', 'intensive', 'fast_paced'],
+    'hands_on': ['hands_on', 'practical'],
+    'structure': ['high_structure', 'structured'],
+    'risk_tolerance': ['career_switcher', 'modern']
+}
+LOW_SCORE_TAGS = {
+    'hands_on': ['theoretical'],
+    'structure': ['self_directed', 'flexible'],
+    'risk_tolerance': ['prestige', 'prestigious', 'russell_group', 'degree_included']
+}
+
+
+def profile_fit_tags(scores: Dict) -> List[str]:
+    """Programme tags that match a student's scores (same >= 7 / < 4 bands as the profile text)"""
+    tags = []
+    for dimension, score in scores.items():
+        if score >= 7:
+            tags += HIGH_SCORE_TAGS.get(dimension, [])
+        elif score < 4:
+            tags += LOW_SCORE_TAGS.get(dimension, [])
+    return tags
+
+
+class ProgrammeROI:
+    def __init__(self, roi_calculator, search=None):
+        """
+        Initialize the ranker
+
+        Args:
+            roi_calculator: ROICalculator whose salary_data growth rates are used
+                            (a hot-swapped calibrated table is picked up automatically)
+            search: ProgrammeSearch over the catalogue (default: the shared engine, which
+                    follows catalog hot-swaps)
+        """
+        self.roi_calculator = roi_calculator
+        self._search = search
+        self._columns = {}  # (field, salary table version, search) -> base ROI columns (see _compute)
+        self._lock = threading.Lock()
+
+    @property
+    def search(self):
+        return self._search or get_programme_search()
+
+    def roi_columns(self, field: str, current_income: float = 0) -> Dict[str, List[float]]:
+        """
+        ROI for every programme, as columns aligned with the search engine's doc ids
+
+        Computed once per (field, salary table version, catalogue); the income given up
+        while studying only shifts net wealth, so it's applied per request
+
+        Returns:
+            {'net_wealth_5', 'net_wealth_10', 'salary_5', 'salary_10': [value per programme]}
+        """
+        base = self._roi_columns(self.search, field)
+        columns = {}
+        for horizon in HORIZONS:
+            net_wealth = _net_wealth(base, horizon, current_income)
+            columns[f'net_wealth_{horizon}'] = [net_wealth(i) for i in range(len(base['opportunity_years']))]
+        for horizon in HORIZONS:
+            columns[f'salary_{horizon}'] = base[f'salary_{horizon}']
+        return columns
+
+    def _roi_columns(self, search, field):
+        self.roi_calculator.refresh_salary_table()
+        salary_data = self.roi_calculator.salary_data
+        # Unknown fields share the fallback's columns, so the cache holds at most one
+        # entry per field in the salary table
+        field = field if field in salary_data else DEFAULT_FIELD
+        key = (field, self.roi_calculator.salary_table_version, search)
+
+        with self._lock:
+            columns = self._columns.get(key)
+        if columns is None:
+            columns = self._compute(search, salary_data[field])
+            with self._lock:
+                # Drop columns for stale salary tables and catalogue versions
+                self._columns = {k: v for k, v in self._columns.items() if k[1:] == key[1:]}
+                self._columns[key] = columns
+        return columns
+
+    def top_programmes(self, field: str, k: int = 3, rank_by: str = 'net_wealth_10',
+                       current_income: float = 0, fit_tags: Optional[Iterable[str]] = None,
+                       **filters) -> List[Dict]:
+        """
+        Best k programmes for a student
+
+        Args:
+            field: The student's interest field (picks the salary growth rates)
+            rank_by: 'net_wealth_5', 'net_wealth_10' or 'fit' (fit-tag matches, then 10-year wealth)
+            current_income: Income given up while studying
+            fit_tags: Tags describing the student (see profile_fit_tags) - used by rank_by='fit'
+            **filters: ProgrammeSearch.match_ids filters (pathway, max_cost, ...)
+
+        Returns:
+            Programme dicts with pathway, net_wealth_5/10, salary_5/10 and fit_score added
+        """
+        if rank_by not in RANK_BY:
+            raise ValueError(f"Unknown ranking: {rank_by}")
+
+        search = self.search  # One catalogue version for the whole request
+        base = self._roi_columns(search, field)
+        net_wealth = {horizon: _net_wealth(base, horizon, current_income) for horizon in HORIZONS}
+        wealth = net_wealth[10 if rank_by == 'fit' else int(rank_by.rsplit('_', 1)[1])]
+        matches = search.match_ids(**filters)
+
+        wanted = set(fit_tags or ())
+        tags = search.fit_tags
+
+        def fit(i):
+            return len(wanted.intersection(tags[i])) if wanted else 0
+
+        if rank_by == 'fit':
+            top = heapq.nlargest(k, matches, key=lambda i: (fit(i), wealth(i), -i))
+        else:
+            top = heapq.nlargest(k, matches, key=lambda i: (wealth(i), -i))
+
+        results = []
+        for i in top:
+            result = search.result(i)
+            for horizon in HORIZONS:
+                result[f'net_wealth_{horizon}'] = net_wealth[horizon](i)
+                result[f'salary_{horizon}'] = base[f'salary_{horizon}'][i]
+            result['fit_score'] = fit(i)
+            results.append(result)
+        return results
+
+    def _compute(self, search, field_rates):
+        """
+        Income-independent columns: net wealth with no income given up (net_wealth_h), the
+        same unrounded (returns_h), salary_h, and opportunity_years - the study years that
+        cost a wage, so net wealth for any income is returns_h - income * opportunity_years
+        """
+        growth_by_pathway = {pathway: info['growth_rate'] for pathway, info in field_rates.items()}
+
+        names = ['opportunity_years'] + [f'{name}_{horizon}' for name in ('returns', 'net_wealth', 'salary')
+                                         for horizon in HORIZONS]
+        columns = {name: [] for name in names}
+
+        # Earnings and final salary are linear in the starting salary, so the growth
+        # maths runs once per distinct (pathway, duration) - a handful per catalogue -
+        # and each programme costs a few multiplications
+        factors = {}
+
+        for cost, years, salary, pathway in zip(search.columns['cost'], search.columns['duration_years'],
+                                                search.columns['starting_salary'], search.pathways):
+            cost = cost or 0
+            years = years or 0
+            salary = salary or 0
+
+            factor = factors.get((pathway, years))
+            if factor is None:
+                growth = growth_by_pathway.get(pathway, 0)
+                factor = factors[pathway, years] = [_working_earnings(1, growth, years, horizon) for horizon in HORIZONS]
+
+            # Paid programmes mean no wage while studying; paid apprenticeships already earn
+            columns['opportunity_years'].append(years if cost >= 0 else 0)
+
+            for horizon, (earnings, final_salary) in zip(HORIZONS, factor):
+                returns = salary * earnings - cost
+                columns[f'returns_{horizon}'].append(returns)
+                columns[f'net_wealth_{horizon}'].append(round(returns, 0))
+                columns[f'salary_{horizon}'].append(round(salary * final_salary, 0))
+
+        return columns
+
+
+def _net_wealth(base, horizon, current_income):
+    """Net wealth at a horizon as a function of programme id, for a student giving up current_income"""
+    if not current_income:
+        return base[f'net_wealth_{horizon}'].__getitem__
+
+    returns, years = base[f'returns_{horizon}'], base['opportunity_years']
+    return lambda i: round(returns[i] - current_income * years[i], 0)
+
+
+def _working_earnings(starting_salary, growth_rate, duration_years, horizon):
+    """
+    Earnings from graduation to the end of year `horizon`, and the salary in that year
+
+    Same as ROICalculator.calculate_pathway_roi's loop: year y (1..horizon) is a working
+    year if y > duration, paying starting * (1 + g) ** (y - duration - 1) - summed here
+    as a geometric series
+    """
+    first_year = math.floor(duration_years) + 1
+    working_years = horizon - first_year + 1
+    if working_years <= 0:
+        return 0, starting_salary
+
+    ratio = 1 + growth_rate
+    first_salary = starting_salary * ratio ** (first_year - duration_years - 1)
+    if growth_rate:
+        earnings = first_salary * (ratio ** working_years - 1) / growth_rate
+    else:
+        earnings = first_salary * working_years
+    return earnings, starting_salary * ratio ** (horizon - duration_years - 1)
+
+
+_shared_ranker = None
+_shared_ranker_lock = threading.Lock()
+
+
+def get_shared_programme_roi() -> ProgrammeROI:
+    """Process-wide ranker, so cached ROI columns are shared across sessions"""
+    global _shared_ranker
+
+    with _shared_ranker_lock:
+        if _shared_ranker is None:
+            from .roi_calculator import ROICalculator
+            _shared_ranker = ProgrammeROI(ROICalculator())
+        return _shared_ranker
@@ -0,0 +1,249 @@
+"""
+Programme Search
+Faceted search over the programme catalogue: string fields are normalised to numbers once at
+load, tags/locations go into inverted indexes and numeric fields into sorted arrays
+"""
+
+import heapq
+import math
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+from .catalog_store import as_catalog_table
+
+# UCAS tariff points per A-level grade
+A_LEVEL_TARIFF = {'A*': 56, 'A': 48, 'B': 40, 'C': 32, 'D': 24, 'E': 16}
+GENERIC_A_LEVEL_POINTS = 48  # "A-Levels or equivalent" - EEE, the lowest A-level offer
+
+UNIT_YEARS = {'week': 1 / 52, 'month': 1 / 12, 'year': 1}
+
+NUMERIC_FIELDS = ['cost', 'duration_years', 'starting_salary', 'entry_points']
+FACET_FIELDS = ['pathway', 'type', 'location', 'fit_tags']
+
+
+# Real catalogues repeat the same few strings thousands of times - parse each once
+@lru_cache(maxsize=4096)
+def parse_duration_years(text: str) -> Optional[float]:
+    """'3 years' -> 3.0, '4 years (MEng)' -> 4.0, '12 weeks' -> 0.23, '3-6 months' -> 0.5 (upper bound)"""
+    match = re.search(r'(\d+(?:\.\d+)?)(?:\s*-\s*(\d+(?:\.\d+)?))?\s*(week|month|year)', text or '', re.I)
+    if not match:
+        return None
+    upper = float(match.group(2) or match.group(1))
+    return round(upper * UNIT_YEARS[match.group(3).lower()], 2)
+
+
+@lru_cache(maxsize=4096)
+def parse_entry_points(text: str) -> int:
+    """
+    Tariff points needed: grade strings are summed ('AAB' -> 136), general A-level
+    entry counts as the minimum offer, GCSE-only or no requirement is 0
+    """
+    text = (text or '').strip()
+    grades = re.match(r'^((?:A\*|[A-E]){2,4})\b', text)
+    if grades:
+        return sum(A_LEVEL_TARIFF[g] for g in re.findall(r'A\*|[A-E]', grades.group(1)))
+    if re.search(r'a-?level', text, re.I):
+        return GENERIC_A_LEVEL_POINTS
+    return 0
+
+
+@lru_cache(maxsize=4096)
+def normalise_locations(text: str) -> Tuple[str, ...]:
+    """'London (+ Remote)' -> ['london', 'remote'], 'Edinburgh/Glasgow' -> ['edinburgh', 'glasgow']"""
+    text = (text or '').casefold()
+    if re.search(r'remote|online', text):
+        locations = {'remote'}
+    else:
+        locations = set()
+    if re.search(r'multiple|various', text):
+        locations.add('multiple')
+
+    for part in re.split(r'[/,()+]', text):
+        part = part.strip()
+        if part and part not in ('uk', 'remote', 'online', 'fully remote') and not re.search(r'multiple|various', part):
+            locations.add(part)
+    return tuple(sorted(locations))
+
+
+class ProgrammeSearch:
+    def __init__(self, programmes):
+        """
+        Build the indexes from the catalog's columns - programme records are only
+        decoded for the results a query returns
+
+        Args:
+            programmes: Programmes table, or {pathway: [programme, ...]} (UK_PROGRAMMES shape)
+        """
+        self.table = as_catalog_table(programmes)
+        self.docs = self.table.records()  # Programme records; the doc id is the row
+        self.pathways = self.table.groups()
+        self.columns = {
+            'cost': _numbers(self.table.column('cost')),
+            'duration_years': [parse_duration_years(text) for text in self.table.column('duration')],
+            'starting_salary': _numbers(self.table.column('starting_salary')),
+            'entry_points': [parse_entry_points(text) for text in self.table.column('entry_requirements')]
+        }
+        self.fit_tags = [tuple(tags or ()) for tags in self.table.column('fit_tags')]
+        self.inverted = {facet: defaultdict(set) for facet in FACET_FIELDS}  # facet -> value -> doc ids
+
+        for doc_id, (pathway, kind, location) in enumerate(
+                zip(self.pathways, self.table.column('type'), self.table.column('location'))):
+            self._index(doc_id, pathway, kind, location)
+
+        # Sorted (value, doc_id) arrays - a range filter is two bisects and a slice
+        self.sorted_columns = {
+            field: sorted((value, doc_id) for doc_id, value in enumerate(self.columns[field]) if value is not None)
+            for field in NUMERIC_FIELDS
+        }
+        self._all_ids = frozenset(range(len(self.docs)))
+
+    def search(self, sort_by: Optional[str] = None, descending: bool = False, limit: int = 10, **filters) -> Dict:
+        """
+        Faceted query
+
+        Args:
+            sort_by: One of NUMERIC_FIELDS (None = curated catalogue order)
+            descending: Largest values first
+            limit: Results to return (facet counts always cover every match)
+            **filters: See match_ids
+
+        Returns:
+            {'total': int, 'results': [programme, ...], 'facets': {facet: {value: count}}}
+        """
+        if sort_by is not None and sort_by not in NUMERIC_FIELDS:
+            raise ValueError(f"Unknown sort field: {sort_by}")
+
+        matches = self.match_ids(**filters)
+
+        # Facet counts are posting-list intersections - C-speed set operations, one per value
+        facets = {}
+        for facet, postings in self.inverted.items():
+            counts = {
+                value: len(ids) if matches is self._all_ids else len(ids & matches)
+                for value, ids in postings.items()
+            }
+            facets[facet] = dict(sorted(((v, n) for v, n in counts.items() if n), key=lambda item: -item[1]))
+
+        if sort_by is None:
+            top = heapq.nsmallest(limit, matches)
+        else:
+            column = self.columns[sort_by]
+            sign = -1 if descending else 1
+            top = heapq.nsmallest(limit, matches, key=lambda i: (column[i] is None, sign * (column[i] or 0), i))
+
+        return {
+            'total': len(matches),
+            'results': [self.result(doc_id) for doc_id in top],
+            'facets': facets
+        }
+
+    def match_ids(self,
+                  pathway: Optional[str] = None,
+                  types: Optional[Iterable[str]] = None,
+                  locations: Optional[Iterable[str]] = None,
+                  tags: Optional[Iterable[str]] = None,
+                  max_cost: Optional[float] = None,
+                  min_cost: Optional[float] = None,
+                  max_duration_years: Optional[float] = None,
+                  min_starting_salary: Optional[float] = None,
+                  max_entry_points: Optional[int] = None):
+        """
+        Doc ids matching every filter
+
+        Args:
+            pathway: Restrict to one pathway
+            types / locations: Match any of the given values
+            tags: Match all of the given fit_tags
+            max_cost, min_cost: Total cost range (negative = paid while training)
+            max_duration_years: Upper bound on (longest) duration
+            min_starting_salary: Minimum typical starting salary
+            max_entry_points: The student's UCAS tariff - hides courses asking for more
+        """
+        candidate_sets = []
+        if pathway:
+            candidate_sets.append(self.inverted['pathway'].get(pathway, set()))
+        if types:
+            candidate_sets.append(self._union('type', types))
+        if locations:
+            candidate_sets.append(self._union('location', [loc.casefold() for loc in locations]))
+        for tag in tags or ():
+            candidate_sets.append(self.inverted['fit_tags'].get(tag, set()))
+
+        for field, low, high in [
+            ('cost', min_cost, max_cost),
+            ('duration_years', None, max_duration_years),
+            ('starting_salary', min_starting_salary, None),
+            ('entry_points', None, max_entry_points)
+        ]:
+            if low is not None or high is not None:
+                candidate_sets.append(self._range(field, low, high))
+
+        # Intersect smallest first so each step shrinks the working set
+        matches = None
+        for ids in sorted(candidate_sets, key=len):
+            matches = set(ids) if matches is None else matches & ids
+            if not matches:
+                break
+        return self._all_ids if matches is None else matches
+
+    def result(self, doc_id: int) -> Dict:
+        """Programme dict with its pathway and normalised fields"""
+        return dict(
+            self.table.row(doc_id),
+            pathway=self.pathways[doc_id],
+            duration_years=self.columns['duration_years'][doc_id],
+            entry_points=self.columns['entry_points'][doc_id]
+        )
+
+    def _index(self, doc_id, pathway, kind, location):
+        values = {
+            'pathway': [pathway],
+            'type': [kind] if kind else [],
+            'location': normalise_locations(location),
+            'fit_tags': self.fit_tags[doc_id]
+        }
+        for facet, facet_values in values.items():
+            for value in facet_values:
+                self.inverted[facet][value].add(doc_id)
+
+    def _union(self, facet, values):
+        ids = set()
+        for value in values:
+            ids |= self.inverted[facet].get(value, set())
+        return ids
+
+    def _range(self, field, low, high):
+        column = self.sorted_columns[field]
+        start = bisect_left(column, (low, -1)) if low is not None else 0
+        end = bisect_right(column, (high, len(self.docs))) if high is not None else len(column)
+        return {doc_id for _, doc_id in column[start:end]}
+
+
+def _numbers(column):
+    """Float column from the catalog (NaN = missing) as a list with None for missing"""
+    return [None if value is None or (isinstance(value, float) and math.isnan(value)) else value for value in column]
+
+
+_shared_search = (None, None)  # (catalog version, ProgrammeSearch)
+_shared_search_lock = threading.Lock()
+
+
+def get_programme_search() -> ProgrammeSearch:
+    """Search engine over the current programme catalogue - rebuilt when a new version is published"""
+    global _shared_search
+    from .catalog_store import get_catalog_store
+
+    version, programmes = get_catalog_store().table('programmes')
+    with _shared_search_lock:
+        if _shared_search[0] != version:
+            _shared_search = (version, ProgrammeSearch(programmes))
+        return _shared_search[1]
+
+
+def search_programmes(**filters) -> Dict:
+    """Faceted programme search - see ProgrammeSearch.search for the filters"""
+    return get_programme_search().search(**filters)
@@ -0,0 +1,101 @@
+"""
+Streaming Quantile Sketch
+Constant-memory, mergeable percentile estimates (median, P25, P75) for salary streams
+Log-bucketed histogram in the style of DDSketch: every estimate is within a fixed relative error
+"""
+
+import math
+from typing import Dict, Iterable, Optional
+
+DEFAULT_RELATIVE_ACCURACY = 0.01  # Estimates within ±1% of the true value
+DEFAULT_MAX_BUCKETS = 1024
+
+
+class QuantileSketch:
+    def __init__(self,
+                 relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+                 max_buckets: int = DEFAULT_MAX_BUCKETS):
+        """
+        Initialize an empty sketch
+
+        Args:
+            relative_accuracy: Maximum relative error of quantile estimates
+            max_buckets: Memory bound - lowest buckets are folded together beyond this
+        """
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+
+        self.buckets = {}  # bucket index -> count
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        """Add one positive observation (zero/negative values are ignored)"""
+        if not value or value <= 0:
+            return
+
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def update(self, values: Iterable[float]):
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: 'QuantileSketch'):
+        """Fold another sketch (built with the same accuracy) into this one"""
+        if other.gamma != self.gamma:
+            raise ValueError("Can only merge sketches with the same relative accuracy")
+
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+        while len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-th quantile (0 <= q <= 1), or None if the sketch is empty"""
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                estimate = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(estimate, self.min), self.max)
+
+        return self.max
+
+    def summary(self) -> Dict:
+        """Median, P25, P75 and mean, rounded to whole pounds (0 when empty)"""
+        def rounded(value):
+            return round(value, 0) if value is not None else 0
+
+        return {
+            'count': self.count,
+            'mean': rounded(self.total / self.count if self.count else None),
+            'p25': rounded(self.quantile(0.25)),
+            'median': rounded(self.quantile(0.5)),
+            'p75': rounded(self.quantile(0.75))
+        }
+
+    def _collapse(self):
+        # Fold the two lowest buckets - keeps the upper quantiles exact-to-accuracy
+        lowest, second = sorted(self.buckets)[:2]
+        self.buckets[second] += self.buckets.pop(lowest)
@@ -0,0 +1,174 @@
+"""
+Quota Scheduler
+Persistent monthly quota accounting for the Adzuna API with priority classes
+Interactive page views keep access longest; background work is cut off first so the
+app degrades to cached/snapshot data well before the quota actually runs out
+"""
+
+import calendar
+import sqlite3
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_QUOTA_PATH = Path(__file__).resolve().parent.parent / '.cache' / 'adzuna_quota.sqlite3'
+DEFAULT_MONTHLY_QUOTA = 5000
+
+PRIORITY_INTERACTIVE = 'interactive'  # Results page views
+PRIORITY_COMPARE = 'compare'          # compare_careers / get_skills_demand
+PRIORITY_BACKGROUND = 'background'    # Snapshot refreshes
+
+# Fraction of the monthly quota that must still be left for a class to be allowed
+# through - lower priorities stop first and leave the rest for page views
+PRIORITY_RESERVES = {
+    PRIORITY_INTERACTIVE: 0.02,
+    PRIORITY_COMPARE: 0.15,
+    PRIORITY_BACKGROUND: 0.35
+}
+
+BURN_RATE_WINDOW_DAYS = 7
+
+
+class QuotaScheduler:
+    def __init__(self, path: Path = DEFAULT_QUOTA_PATH, monthly_quota: int = DEFAULT_MONTHLY_QUOTA):
+        """
+        Initialize the scheduler
+
+        Args:
+            path: SQLite file shared by every worker process
+            monthly_quota: Requests allowed per calendar month
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.monthly_quota = monthly_quota
+        self._local = threading.local()
+
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS quota_usage ('
+            'day TEXT NOT NULL, priority TEXT NOT NULL, requests INTEGER NOT NULL, '
+            'PRIMARY KEY (day, priority)) WITHOUT ROWID'
+        )
+        conn.commit()
+
+    def try_acquire(self, priority: str = PRIORITY_INTERACTIVE, today: Optional[date] = None) -> bool:
+        """
+        Count one request against the quota if its priority class may still spend
+
+        Returns:
+            True if the request may be sent, False if it should be served from cache instead
+        """
+        today = today or date.today()
+        reserve = PRIORITY_RESERVES.get(priority, PRIORITY_RESERVES[PRIORITY_BACKGROUND])
+        conn = self._connection()
+
+        try:
+            # IMMEDIATE takes the write lock up front, so check-then-increment is
+            # atomic across worker processes
+            conn.execute('BEGIN IMMEDIATE')
+            used = self._used_this_month(conn, today)
+
+            if self.monthly_quota - used <= self.monthly_quota * reserve:
+                conn.execute('ROLLBACK')
+                return False
+
+            conn.execute(
+                'INSERT INTO quota_usage (day, priority, requests) VALUES (?, ?, 1) '
+                'ON CONFLICT (day, priority) DO UPDATE SET requests = requests + 1',
+                (today.isoformat(), priority)
+            )
+            conn.execute('COMMIT')
+            return True
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            return False  # Can't account for it - fail safe and use cached data
+
+    def metrics(self, today: Optional[date] = None) -> Dict:
+        """
+        Current usage, burn rate and projected exhaustion date
+
+        Returns:
+            {
+                'monthly_quota': int,
+                'used': int,
+                'remaining': int,
+                'used_by_priority': Dict[str, int],
+                'burn_rate_per_day': float,
+                'projected_exhaustion': Optional[str],  # ISO date, None if not this month
+                'month_end': str,
+                'allowed_priorities': List[str]
+            }
+        """
+        today = today or date.today()
+        conn = self._connection()
+        month_start = today.replace(day=1)
+        month_end = today.replace(day=calendar.monthrange(today.year, today.month)[1])
+
+        rows = conn.execute(
+            'SELECT priority, SUM(requests) FROM quota_usage WHERE day BETWEEN ? AND ? GROUP BY priority',
+            (month_start.isoformat(), today.isoformat())
+        ).fetchall()
+        used_by_priority = {priority: requests for priority, requests in rows}
+        used = sum(used_by_priority.values())
+        remaining = max(self.monthly_quota - used, 0)
+
+        # Average over the last week (or the month so far, if shorter)
+        window_start = max(today - timedelta(days=BURN_RATE_WINDOW_DAYS - 1), month_start)
+        window_days = (today - window_start).days + 1
+        window_used = conn.execute(
+            'SELECT COALESCE(SUM(requests), 0) FROM quota_usage WHERE day BETWEEN ? AND ?',
+            (window_start.isoformat(), today.isoformat())
+        ).fetchone()[0]
+        burn_rate = window_used / window_days
+
+        projected_exhaustion = None
+        if burn_rate > 0:
+            exhaustion_day = today + timedelta(days=int(remaining / burn_rate))
+            if exhaustion_day <= month_end:
+                projected_exhaustion = exhaustion_day.isoformat()
+
+        return {
+            'monthly_quota': self.monthly_quota,
+            'used': used,
+            'remaining': remaining,
+            'used_by_priority': used_by_priority,
+            'burn_rate_per_day': round(burn_rate, 1),
+            'projected_exhaustion': projected_exhaustion,
+            'month_end': month_end.isoformat(),
+            'allowed_priorities': [
+                priority for priority, reserve in PRIORITY_RESERVES.items()
+                if remaining > self.monthly_quota * reserve
+            ]
+        }
+
+    def _used_this_month(self, conn, today):
+        return conn.execute(
+            'SELECT COALESCE(SUM(requests), 0) FROM quota_usage WHERE day BETWEEN ? AND ?',
+            (today.replace(day=1).isoformat(), today.isoformat())
+        ).fetchone()[0]
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode - transactions are managed explicitly in try_acquire
+            conn = sqlite3.connect(str(self.path), timeout=5, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+
+_shared_scheduler = None
+_shared_scheduler_lock = threading.Lock()
+
+
+def get_shared_scheduler(path: Path = DEFAULT_QUOTA_PATH,
+                         monthly_quota: int = DEFAULT_MONTHLY_QUOTA) -> QuotaScheduler:
+    """Process-wide scheduler (arguments only take effect on the first call)"""
+    global _shared_scheduler
+
+    with _shared_scheduler_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = QuotaScheduler(path, monthly_quota)
+        return _shared_scheduler
@@ -0,0 +1,136 @@
+"""
+Rate Limiter
+Thread-safe token buckets for keeping external API usage inside provider limits
+One process-wide limiter is shared by every Streamlit session
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .quota_scheduler import PRIORITY_BACKGROUND, PRIORITY_COMPARE, PRIORITY_INTERACTIVE
+
+# Adzuna free tier limits: (requests, per seconds). Only the per-minute limit lives
+# here - these buckets are in memory and start full in every process, so the monthly
+# 5,000 is counted persistently by QuotaScheduler instead
+ADZUNA_LIMITS = [
+    (25, 60)                       # Per minute
+]
+
+# Fraction of each short-window bucket a class must leave for higher priorities -
+# a snapshot refresh can't drain the per-minute burst that page views need.
+# Long windows passed in by callers aren't reserved
+LIMITER_RESERVES = {
+    PRIORITY_INTERACTIVE: 0.0,
+    PRIORITY_COMPARE: 0.2,
+    PRIORITY_BACKGROUND: 0.4
+}
+RESERVE_WINDOW_SECONDS = 60 * 60
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, period_seconds: float):
+        """
+        Bucket that holds up to `capacity` tokens and refills fully every `period_seconds`
+
+        Args:
+            capacity: Maximum burst size (requests)
+            period_seconds: Time to refill from empty to full
+        """
+        self.capacity = float(capacity)
+        self.refill_rate = self.capacity / period_seconds
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+    def wait_time(self, tokens: float = 1) -> float:
+        """Seconds until `tokens` are available (0 if available now) - call refill() first"""
+        if self.tokens >= tokens:
+            return 0.0
+        return (tokens - self.tokens) / self.refill_rate
+
+
+class RateLimiter:
+    def __init__(self, limits: List[Tuple[float, float]] = ADZUNA_LIMITS,
+                 reserves: Dict[str, float] = LIMITER_RESERVES):
+        """
+        Combine several token buckets - a request must fit in all of them
+
+        Args:
+            limits: List of (requests, per_seconds) pairs
+            reserves: {priority: fraction of each short-window bucket left for higher classes}
+        """
+        self.buckets = [TokenBucket(capacity, period) for capacity, period in limits]
+        self.reserves = reserves
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None, priority: str = PRIORITY_INTERACTIVE) -> bool:
+        """
+        Take one token from every bucket, waiting up to `timeout` seconds
+
+        Lower priorities wait while a bucket is down to their reserve, so interactive
+        requests always find tokens first when background work is queued
+
+        Returns:
+            True if the request may go ahead, False if it would exceed a limit
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        reserve = self.reserves.get(priority, max(self.reserves.values(), default=0))
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                for bucket in self.buckets:
+                    bucket.refill(now)
+
+                wait = max(bucket.wait_time(1 + self._reserved(bucket, reserve)) for bucket in self.buckets)
+                if wait == 0:
+                    for bucket in self.buckets:
+                        bucket.tokens -= 1
+                    return True
+
+            if deadline is not None and now + wait > deadline:
+                return False  # Don't sleep when the wait can't fit in the timeout
+
+            time.sleep(wait)
+
+    def release(self):
+        """Hand back a token taken by acquire() for a request that was never sent"""
+        with self._lock:
+            for bucket in self.buckets:
+                bucket.tokens = min(bucket.capacity, bucket.tokens + 1)
+
+    @staticmethod
+    def _reserved(bucket, reserve):
+        period = bucket.capacity / bucket.refill_rate
+        return bucket.capacity * reserve if period <= RESERVE_WINDOW_SECONDS else 0
+
+    def remaining(self) -> Dict[str, float]:
+        """Tokens currently available per bucket, keyed by its period"""
+        with self._lock:
+            now = time.monotonic()
+            remaining = {}
+            for bucket in self.buckets:
+                bucket.refill(now)
+                remaining[f"per_{int(bucket.capacity / bucket.refill_rate)}s"] = int(bucket.tokens)
+            return remaining
+
+
+_shared_limiter = None
+_shared_limiter_lock = threading.Lock()
+
+
+def get_shared_limiter(limits: List[Tuple[float, float]] = ADZUNA_LIMITS) -> RateLimiter:
+    """
+    Process-wide limiter instance
+    Arguments only take effect on the first call
+    """
+    global _shared_limiter
+
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter(limits)
+        return _shared_limiter
@@ -0,0 +1,215 @@
+"""
+Related Careers
+Offline nearest-neighbour graph over the careers catalog: exact weighted Jaccard
+similarity on skills and required_education, computed only for pairs that share
+a feature, stored as fixed-width neighbour arrays for O(1) lookups at render time
+
+Run:  python -m modules.related_careers   (rebuild after the catalog changes)
+"""
+
+import heapq
+import json
+import math
+import os
+import struct
+import tempfile
+import threading
+from array import array
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .catalog_store import as_catalog_table
+
+DEFAULT_GRAPH_PATH = Path(__file__).resolve().parent.parent / '.cache' / 'related_careers.bin'
+RELATED_K = 5  # Neighbours stored per career
+MIN_SIMILARITY = 0.05
+MAX_FEATURE_SHARE = 0.5  # Features on more than half the catalog can't tell careers apart - dropped
+MIN_CATALOG_FOR_PRUNING = 10
+
+MAGIC = b'RELATED1'
+PREAMBLE = struct.Struct('<8sQ')  # magic, header length
+
+
+def career_features(career: Dict) -> Set[str]:
+    """'skill:python', 'education:degree', ... - case-insensitive so spellings line up"""
+    features = {f"skill:{skill.strip().casefold()}" for skill in career.get('skills', [])}
+    features |= {f"education:{route.strip().casefold()}" for route in career.get('required_education', [])}
+    return features
+
+
+class RelatedCareersGraph:
+    def __init__(self, titles: List[str], neighbours: array, scores: array, k: int = RELATED_K,
+                 catalog_digest: Optional[str] = None):
+        """
+        Args:
+            titles: Career titles; a career's index is its node id
+            neighbours: len(titles) * k node ids, best first, -1 padded
+            scores: Matching similarities
+            catalog_digest: Content hash of the careers table the graph was built from
+        """
+        self.titles = titles
+        self.neighbours = neighbours
+        self.scores = scores
+        self.k = k
+        self.catalog_digest = catalog_digest
+        self._ids = {title.casefold(): i for i, title in enumerate(titles)}
+
+    def related(self, title: str, limit: int = RELATED_K) -> List[Tuple[str, float]]:
+        """[(title, similarity), ...] for a career, best first - one dict lookup and a slice"""
+        node = self._ids.get(title.strip().casefold())
+        if node is None:
+            return []
+        start = node * self.k
+        return [
+            (self.titles[neighbour], round(score, 3))
+            for neighbour, score in zip(self.neighbours[start:start + min(limit, self.k)],
+                                        self.scores[start:start + min(limit, self.k)])
+            if neighbour >= 0
+        ]
+
+    def __len__(self):
+        return len(self.titles)
+
+    def save(self, path: Path = DEFAULT_GRAPH_PATH):
+        """Write atomically - readers see the old graph or the new one"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = json.dumps({'k': self.k, 'catalog_digest': self.catalog_digest, 'titles': self.titles}).encode('utf-8')
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(PREAMBLE.pack(MAGIC, len(header)))
+                f.write(header)
+                f.write(self.neighbours.tobytes())
+                f.write(self.scores.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_GRAPH_PATH) -> Optional['RelatedCareersGraph']:
+        """Read a saved graph, or None if there isn't a valid one"""
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            magic, length = PREAMBLE.unpack_from(data, 0)
+            if magic != MAGIC:
+                return None
+            header = json.loads(data[PREAMBLE.size:PREAMBLE.size + length])
+        except (OSError, ValueError, struct.error):
+            return None
+
+        size = len(header['titles']) * header['k']
+        offset = PREAMBLE.size + length
+        neighbours = array('i')
+        scores = array('f')
+        neighbours.frombytes(data[offset:offset + size * neighbours.itemsize])
+        offset += size * neighbours.itemsize
+        scores.frombytes(data[offset:offset + size * scores.itemsize])
+        if len(neighbours) != size or len(scores) != size:
+            return None
+        return cls(header['titles'], neighbours, scores, header['k'], header.get('catalog_digest'))
+
+
+def build_related_graph(careers, k: int = RELATED_K) -> RelatedCareersGraph:
+    """
+    Top-k neighbours of every career by IDF-weighted Jaccard similarity
+
+    Rare skills count for more than 'Degree', which half the catalog shares. Pairs are
+    found through a feature -> careers index, so careers with nothing in common are
+    never compared and the cost follows the overlap, not n^2
+
+    Args:
+        careers: Careers table, or {field: [career, ...]} (UK_CAREERS shape)
+    """
+    table = as_catalog_table(careers)
+    titles = table.column('title')
+    features = [
+        career_features({'skills': skills or [], 'required_education': education or []})
+        for skills, education in zip(table.column('skills'), table.column('required_education'))
+    ]
+
+    postings = defaultdict(list)
+    for node, feature_set in enumerate(features):
+        for feature in feature_set:
+            postings[feature].append(node)
+
+    total = len(titles)
+    if total >= MIN_CATALOG_FOR_PRUNING:
+        postings = {feature: nodes for feature, nodes in postings.items() if len(nodes) <= MAX_FEATURE_SHARE * total}
+    weights = {feature: math.log(1 + total / len(nodes)) for feature, nodes in postings.items()}
+    mass = [sum(weights.get(feature, 0) for feature in feature_set) for feature_set in features]
+
+    neighbours = array('i', [-1] * (total * k))
+    scores = array('f', [0.0] * (total * k))
+    for node, feature_set in enumerate(features):
+        shared = defaultdict(float)
+        for feature in feature_set:
+            for other in postings.get(feature, ()):
+                if other != node:
+                    shared[other] += weights[feature]
+
+        candidates = (
+            (overlap / (mass[node] + mass[other] - overlap), other)
+            for other, overlap in shared.items()
+            if titles[other].casefold() != titles[node].casefold()
+        )
+        best = heapq.nlargest(k, (c for c in candidates if c[0] >= MIN_SIMILARITY), key=lambda c: (c[0], -c[1]))
+        for slot, (similarity, other) in enumerate(best):
+            neighbours[node * k + slot] = other
+            scores[node * k + slot] = similarity
+
+    return RelatedCareersGraph(titles, neighbours, scores, k, table.digest)
+
+
+_shared_graph = None
+_shared_graph_lock = threading.Lock()
+
+
+def get_related_graph() -> RelatedCareersGraph:
+    """
+    The saved graph for the current careers table - built in memory instead if the
+    offline job hasn't run since the careers changed
+
+    Matched on the table's content hash, not the catalog version: versions restart
+    when the artifact is deleted and recompiled, so an old graph could match by accident
+    """
+    global _shared_graph
+    from .catalog_store import get_catalog_store
+
+    careers = get_catalog_store().table('careers')[1]
+    with _shared_graph_lock:
+        if _shared_graph is None or _shared_graph.catalog_digest != careers.digest:
+            graph = RelatedCareersGraph.load()
+            if graph is None or graph.catalog_digest != careers.digest:
+                graph = build_related_graph(careers)
+            _shared_graph = graph
+        return _shared_graph
+
+
+def get_related_careers(title: str, limit: int = 3) -> List[Dict]:
+    """Career dicts similar to `title`, each with 'field' and 'similarity' added"""
+    from .uk_careers import get_career_catalog
+
+    catalog = get_career_catalog()
+    related = []
+    for related_title, similarity in get_related_graph().related(title, limit):
+        career = catalog.by_title(related_title)
+        if career:
+            related.append(dict(career, field=catalog.field_of(related_title), similarity=similarity))
+    return related
+
+
+if __name__ == "__main__":
+    from .catalog_store import get_catalog_store
+
+    version, careers = get_catalog_store().table('careers')
+    graph = build_related_graph(careers)
+    graph.save()
+    print(f"Built related careers for {len(graph)} careers (catalog version {version}) -> {DEFAULT_GRAPH_PATH}")
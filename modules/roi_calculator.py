@@ -4,8 +4,19 @@ Calculates 5-year financial projections for each education pathway
 Brutally honest - factors in debt, opportunity cost, realistic salary growth
 """
 
+import os
+import time
+
+from .salary_calibration import DEFAULT_TABLE_PATH, load_salary_table
+
+TABLE_CHECK_SECONDS = 30  # How often to look for a newly published salary table
+
 class ROICalculator:
-    def __init__(self):
+    def __init__(self, table_path=DEFAULT_TABLE_PATH):
+        """
+        Args:
+            table_path: Published calibrated salary table to hot-swap in (None = static table only)
+        """
         # Base salary data by field and pathway (GBP £, annual - UK market)
         self.salary_data = {
             'Technology & Software': {
@@ -83,6 +94,51 @@ class ROICalculator:
                 'default': {'tuition': 9000, 'living': 0, 'duration_years': 0.5}  # 6 months bootcamp
             }
         }
+        
+        # Calibrated from real outcomes when a table has been published
+        self.default_salary_data = self.salary_data
+        self.salary_table_version = 0
+        self.table_path = table_path
+        self._table_mtime = None
+        self._table_checked_at = None
+        self.refresh_salary_table()
+    
+    def refresh_salary_table(self, force=False):
+        """
+        Swap in the latest published salary table if it changed on disk
+        Checked at most every TABLE_CHECK_SECONDS, so long-lived instances pick up
+        recalibrations without a restart
+        """
+        if not self.table_path:
+            return
+        
+        now = time.monotonic()
+        if not force and self._table_checked_at is not None and now - self._table_checked_at < TABLE_CHECK_SECONDS:
+            return
+        self._table_checked_at = now
+        
+        try:
+            stat = os.stat(self.table_path)
+        except OSError:
+            # Table deleted or withdrawn - go back to the static figures
+            self.salary_data = self.default_salary_data
+            self.salary_table_version = 0
+            self._table_mtime = None
+            return
+        # Publishing replaces the file, so a new inode means a new table even within one mtime tick
+        mtime = (stat.st_mtime_ns, stat.st_ino)
+        if mtime == self._table_mtime:
+            return
+        
+        table = load_salary_table(self.table_path)
+        if table:
+            # Build the new table completely, then swap the reference in one step
+            self.salary_data = {
+                field: {**pathways, **table['salary_data'].get(field, {})}
+                for field, pathways in self.default_salary_data.items()
+            }
+            self.salary_table_version = table['version']
+        self._table_mtime = mtime
     
     def calculate_pathway_roi(self, pathway, budget, current_income, field, country):
         """
@@ -91,6 +147,8 @@ class ROICalculator:
         Returns:
             Dict with total_cost, year_5_salary, net_wealth_year_5, roi_multiple
         """
+        self.refresh_salary_table()
+        
         # Get education costs
         if pathway in ['Apprenticeship', 'Micro-Credentials']:
             cost_data = self.education_costs[pathway]['default']
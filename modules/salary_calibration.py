@@ -0,0 +1,237 @@
+"""
+Salary Calibration
+Online Bayesian update of ROICalculator's starting salaries and growth rates from
+reported follow-up outcomes, published as a versioned table the calculator hot-swaps
+
+Run:  python -m modules.salary_calibration   (ingest new outcomes and publish)
+"""
+
+import json
+import math
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_TABLE_PATH = Path(__file__).resolve().parent.parent / '.cache' / 'salary_table.json'
+
+# How many observations the static table is worth - small cells stay close to it,
+# well-observed cells follow the data
+PRIOR_STRENGTH = 20
+GROWTH_PRIOR_STRENGTH = 10
+GROWTH_LIMITS = (-0.5, 1.0)  # Reject implausible implied growth (typos, job changes)
+
+# Survey answers -> ROICalculator pathway names
+PATHWAY_ALIASES = {'Bootcamp/Micro-Credential': 'Micro-Credentials'}
+
+
+class SalaryCalibrator:
+    def __init__(self, prior_table: Optional[Dict] = None, durations: Optional[Dict] = None):
+        """
+        Initialize the calibrator
+
+        Args:
+            prior_table: salary_data-shaped table to start from (default: ROICalculator's)
+            durations: Years in education per pathway, to tell study from work time
+        """
+        if prior_table is None or durations is None:
+            from .roi_calculator import ROICalculator
+            calculator = ROICalculator(table_path=None)
+            prior_table = prior_table or calculator.default_salary_data
+            durations = durations or pathway_durations(calculator.education_costs)
+
+        self.prior_table = prior_table
+        self.durations = durations
+        self.version = 0
+        self.last_outcome_id = 0
+        self.posterior = {}  # field -> pathway -> running sums (see _cell)
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_TABLE_PATH, **kwargs) -> 'SalaryCalibrator':
+        """Resume from a published table (or start fresh if there isn't one)"""
+        calibrator = cls(**kwargs)
+        table = load_salary_table(path)
+        if table:
+            calibrator.version = table['version']
+            calibrator.last_outcome_id = table.get('last_outcome_id', 0)
+            calibrator.posterior = table.get('posterior', {})
+        return calibrator
+
+    def observe(self, field: str, pathway: str, salary: float, months_elapsed: int,
+                previous_salary: Optional[float] = None, previous_months: Optional[int] = None) -> bool:
+        """
+        Fold one reported salary into the posterior - O(1)
+
+        Args:
+            field, pathway: Which salary_data cell the student belongs to
+            salary: Reported current salary
+            months_elapsed: Months since the assessment
+            previous_salary, previous_months: The same student's earlier answer, if any
+                                              (a pair of salaries is what informs growth)
+
+        Returns:
+            False if the observation doesn't map onto the table (unknown cell, still studying)
+        """
+        pathway = PATHWAY_ALIASES.get(pathway, pathway)
+        prior = self.prior_table.get(field, {}).get(pathway)
+        if not prior or not salary or salary <= 0:
+            return False
+
+        years_working = months_elapsed / 12 - self.durations.get(pathway, 0)
+        if years_working <= 0:
+            return False  # Still in education - not a graduate salary
+
+        cell = self._cell(field, pathway)
+        growth = self._posterior_growth(cell, prior)
+
+        # Back out the starting salary this observation implies (salary in working year n
+        # is starting * (1 + g)^(n - 1)), then update mean/variance with Welford
+        implied_starting = salary / (1 + growth) ** (math.ceil(years_working) - 1)
+        cell['n'] += 1
+        delta = implied_starting - cell['mean']
+        cell['mean'] += delta / cell['n']
+        cell['m2'] += delta * (implied_starting - cell['mean'])
+
+        if previous_salary and previous_salary > 0 and previous_months is not None:
+            previous_working = previous_months / 12 - self.durations.get(pathway, 0)
+            years_between = (months_elapsed - previous_months) / 12
+            if previous_working > 0 and years_between > 0:
+                implied_growth = (salary / previous_salary) ** (1 / years_between) - 1
+                if GROWTH_LIMITS[0] <= implied_growth <= GROWTH_LIMITS[1]:
+                    cell['growth_n'] += 1
+                    cell['growth_sum'] += implied_growth
+
+        return True
+
+    def ingest_store(self, store) -> int:
+        """
+        Observe every outcome added to an OutcomeStore since the last ingest
+
+        Outcome ids are stable per (decision, follow-up) - a resubmitted survey updates
+        its row in place, so it's never counted a second time
+
+        Returns:
+            Number of outcomes that updated the posterior
+        """
+        rows = store.query(
+            'SELECT o.id, o.months_elapsed, o.pathway, o.current_salary, d.interest_field, '
+            'p.current_salary AS previous_salary, p.months_elapsed AS previous_months '
+            'FROM outcomes o JOIN initial_decisions d ON d.id = o.decision_id '
+            'LEFT JOIN outcomes p ON p.decision_id = o.decision_id AND p.months_elapsed = ('
+            '  SELECT MAX(months_elapsed) FROM outcomes '
+            '  WHERE decision_id = o.decision_id AND months_elapsed < o.months_elapsed) '
+            'WHERE o.id > ? AND o.current_salary > 0 ORDER BY o.id',
+            (self.last_outcome_id,)
+        )
+
+        used = 0
+        for row in rows:
+            used += self.observe(row['interest_field'], row['pathway'], row['current_salary'],
+                                 row['months_elapsed'], row['previous_salary'], row['previous_months'])
+            self.last_outcome_id = row['id']
+        return used
+
+    def estimate(self, field: str, pathway: str) -> Dict:
+        """
+        Posterior for one cell
+
+        Returns:
+            {'starting': float, 'growth_rate': float, 'starting_sd': float, 'observations': int}
+        """
+        prior = self.prior_table[field][pathway]
+        cell = self._cell(field, pathway)
+        n = cell['n']
+
+        # Normal-normal update: the prior counts as PRIOR_STRENGTH observations at the table value
+        starting = (PRIOR_STRENGTH * prior['starting'] + n * cell['mean']) / (PRIOR_STRENGTH + n)
+        spread = math.sqrt(cell['m2'] / (n - 1)) if n > 1 else 0.2 * prior['starting']
+
+        return {
+            'starting': round(starting, 0),
+            'growth_rate': round(self._posterior_growth(cell, prior), 4),
+            'starting_sd': round(spread / math.sqrt(PRIOR_STRENGTH + n), 0),
+            'observations': n
+        }
+
+    def table(self) -> Dict:
+        """Calibrated salary_data (same shape as ROICalculator.salary_data)"""
+        return {
+            field: {
+                pathway: {key: self.estimate(field, pathway)[key] for key in ('starting', 'growth_rate')}
+                for pathway in pathways
+            }
+            for field, pathways in self.prior_table.items()
+        }
+
+    def publish(self, path: Path = DEFAULT_TABLE_PATH) -> int:
+        """
+        Write the next table version atomically - readers see the old file or the
+        new one, never a partial write
+
+        Returns:
+            The published version number
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.version += 1
+
+        payload = {
+            'version': self.version,
+            'published_at': datetime.now().isoformat(),
+            'last_outcome_id': self.last_outcome_id,
+            'salary_data': self.table(),
+            'posterior': self.posterior
+        }
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(payload, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        return self.version
+
+    def _cell(self, field, pathway):
+        return self.posterior.setdefault(field, {}).setdefault(
+            pathway, {'n': 0, 'mean': 0.0, 'm2': 0.0, 'growth_n': 0, 'growth_sum': 0.0}
+        )
+
+    def _posterior_growth(self, cell, prior):
+        return ((GROWTH_PRIOR_STRENGTH * prior['growth_rate'] + cell['growth_sum'])
+                / (GROWTH_PRIOR_STRENGTH + cell['growth_n']))
+
+
+def pathway_durations(education_costs: Dict) -> Dict[str, float]:
+    """Years in education per pathway from ROICalculator.education_costs (home-country figures)"""
+    return {
+        pathway: (costs.get('default') or costs['Local/Home Country'])['duration_years']
+        for pathway, costs in education_costs.items()
+    }
+
+
+def load_salary_table(path: Path = DEFAULT_TABLE_PATH) -> Optional[Dict]:
+    """Read a published table, or None if there isn't a valid one"""
+    try:
+        with open(path) as f:
+            table = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(table, dict) or 'salary_data' not in table:
+        return None
+    return table
+
+
+if __name__ == "__main__":
+    from .outcome_store import get_shared_outcome_store
+
+    calibrator = SalaryCalibrator.load()
+    used = calibrator.ingest_store(get_shared_outcome_store())
+    version = calibrator.publish()
+    print(f"Ingested {used} salaries, published version {version} to {DEFAULT_TABLE_PATH}")
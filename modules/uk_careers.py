@@ -1,268 +1,129 @@
 """
 UK Careers Database
 Career paths with UK salary data, growth rates, and job market insights
+The data lives in data/uk_careers.json and is served from the compiled catalog
 """
 
-UK_CAREERS = {
-    'Technology & Software': [
-        {
-            'title': 'Software Developer',
-            'entry_salary': 28000,
-            'year_5_salary': 45000,
-            'senior_salary': 65000,
-            'growth_rate': 0.15,
-            'required_education': ['Bootcamp', 'Degree', 'Apprenticeship'],
-            'top_companies': ['Google', 'Amazon', 'Sky', 'BBC', 'Monzo'],
-            'demand': 'Very High',
-            'remote_friendly': True,
-            'skills': ['JavaScript', 'Python', 'React', 'Git'],
-            'job_openings_uk': '15,000+'
-        },
-        {
-            'title': 'Data Analyst',
-            'entry_salary': 26000,
-            'year_5_salary': 42000,
-            'senior_salary': 60000,
-            'growth_rate': 0.14,
-            'required_education': ['Bootcamp', 'Degree'],
-            'top_companies': ['Deloitte', 'KPMG', 'British Airways', 'HSBC'],
-            'demand': 'High',
-            'remote_friendly': True,
-            'skills': ['SQL', 'Python', 'Excel', 'Tableau'],
-            'job_openings_uk': '8,000+'
-        },
-        {
-            'title': 'DevOps Engineer',
-            'entry_salary': 32000,
-            'year_5_salary': 52000,
-            'senior_salary': 75000,
-            'growth_rate': 0.16,
-            'required_education': ['Degree', 'Apprenticeship', 'Self-taught'],
-            'top_companies': ['Amazon Web Services', 'Google Cloud', 'Cloudflare'],
-            'demand': 'Very High',
-            'remote_friendly': True,
-            'skills': ['AWS', 'Docker', 'Kubernetes', 'CI/CD'],
-            'job_openings_uk': '6,000+'
-        },
-        {
-            'title': 'Cloud Architect',
-            'entry_salary': 40000,
-            'year_5_salary': 65000,
-            'senior_salary': 90000,
-            'growth_rate': 0.15,
-            'required_education': ['Degree', 'Self-taught with certs'],
-            'top_companies': ['Accenture', 'Capgemini', 'AWS', 'Microsoft'],
-            'demand': 'High',
-            'remote_friendly': True,
-            'skills': ['AWS', 'Azure', 'Architecture', 'Security'],
-            'job_openings_uk': '4,000+'
-        },
-        {
-            'title': 'Cybersecurity Analyst',
-            'entry_salary': 30000,
-            'year_5_salary': 48000,
-            'senior_salary': 70000,
-            'growth_rate': 0.14,
-            'required_education': ['Degree', 'Apprenticeship', 'Certifications'],
-            'top_companies': ['GCHQ', 'BAE Systems', 'Darktrace', 'NCC Group'],
-            'demand': 'Very High',
-            'remote_friendly': False,
-            'skills': ['Network Security', 'Penetration Testing', 'CISSP'],
-            'job_openings_uk': '5,500+'
-        }
-    ],
-    
-    'Business & Finance': [
-        {
-            'title': 'Accountant (ACCA/CIMA)',
-            'entry_salary': 24000,
-            'year_5_salary': 38000,
-            'senior_salary': 55000,
-            'growth_rate': 0.12,
-            'required_education': ['Degree', 'Apprenticeship + ACCA'],
-            'top_companies': ['PwC', 'Deloitte', 'EY', 'KPMG'],
-            'demand': 'High',
-            'remote_friendly': True,
-            'skills': ['Financial Reporting', 'Tax', 'Audit', 'Excel'],
-            'job_openings_uk': '12,000+'
-        },
-        {
-            'title': 'Financial Analyst',
-            'entry_salary': 28000,
-            'year_5_salary': 45000,
-            'senior_salary': 65000,
-            'growth_rate': 0.13,
-            'required_education': ['Degree', 'CFA'],
-            'top_companies': ['JP Morgan', 'Barclays', 'HSBC', 'Goldman Sachs'],
-            'demand': 'Medium',
-            'remote_friendly': True,
-            'skills': ['Financial Modelling', 'Excel', 'Bloomberg', 'Valuation'],
-            'job_openings_uk': '4,500+'
-        },
-        {
-            'title': 'Management Consultant',
-            'entry_salary': 32000,
-            'year_5_salary': 55000,
-            'senior_salary': 85000,
-            'growth_rate': 0.15,
-            'required_education': ['Degree (Russell Group preferred)'],
-            'top_companies': ['McKinsey', 'BCG', 'Bain', 'Accenture'],
-            'demand': 'Medium',
-            'remote_friendly': False,
-            'skills': ['Problem Solving', 'Excel', 'PowerPoint', 'Strategy'],
-            'job_openings_uk': '3,000+'
-        },
-        {
-            'title': 'Business Analyst',
-            'entry_salary': 26000,
-            'year_5_salary': 40000,
-            'senior_salary': 58000,
-            'growth_rate': 0.11,
-            'required_education': ['Degree', 'Bootcamp'],
-            'top_companies': ['Lloyds Banking Group', 'Tesco', 'BT'],
-            'demand': 'High',
-            'remote_friendly': True,
-            'skills': ['Requirements Gathering', 'SQL', 'Agile', 'Stakeholder Management'],
-            'job_openings_uk': '9,000+'
-        }
-    ],
-    
-    'Engineering & Manufacturing': [
-        {
-            'title': 'Mechanical Engineer',
-            'entry_salary': 27000,
-            'year_5_salary': 42000,
-            'senior_salary': 60000,
-            'growth_rate': 0.12,
-            'required_education': ['Degree (MEng)', 'Apprenticeship'],
-            'top_companies': ['Rolls-Royce', 'BAE Systems', 'Airbus', 'JLR'],
-            'demand': 'High',
-            'remote_friendly': False,
-            'skills': ['CAD', 'SolidWorks', 'FEA', 'Manufacturing'],
-            'job_openings_uk': '6,500+'
-        },
-        {
-            'title': 'Electrical Engineer',
-            'entry_salary': 28000,
-            'year_5_salary': 44000,
-            'senior_salary': 62000,
-            'growth_rate': 0.13,
-            'required_education': ['Degree', 'Apprenticeship'],
-            'top_companies': ['National Grid', 'Siemens', 'ABB', 'Schneider Electric'],
-            'demand': 'High',
-            'remote_friendly': False,
-            'skills': ['Circuit Design', 'PLC Programming', 'AutoCAD', 'Testing'],
-            'job_openings_uk': '5,000+'
-        },
-        {
-            'title': 'Civil Engineer',
-            'entry_salary': 26000,
-            'year_5_salary': 40000,
-            'senior_salary': 55000,
-            'growth_rate': 0.11,
-            'required_education': ['Degree (BEng/MEng)'],
-            'top_companies': ['Arup', 'Mott MacDonald', 'Balfour Beatty', 'HS2'],
-            'demand': 'High',
-            'remote_friendly': False,
-            'skills': ['Structural Analysis', 'AutoCAD', 'Project Management'],
-            'job_openings_uk': '7,000+'
-        }
-    ],
-    
-    'Healthcare & Medicine': [
-        {
-            'title': 'Registered Nurse',
-            'entry_salary': 25000,
-            'year_5_salary': 32000,
-            'senior_salary': 42000,
-            'growth_rate': 0.07,
-            'required_education': ['Nursing Degree', 'Apprenticeship (Nursing Associate)'],
-            'top_companies': ['NHS', 'Private Hospitals', 'Care Homes'],
-            'demand': 'Very High',
-            'remote_friendly': False,
-            'skills': ['Patient Care', 'Clinical Skills', 'Compassion'],
-            'job_openings_uk': '40,000+'
-        },
-        {
-            'title': 'Physiotherapist',
-            'entry_salary': 24000,
-            'year_5_salary': 32000,
-            'senior_salary': 44000,
-            'growth_rate': 0.08,
-            'required_education': ['Degree (BSc Physiotherapy)'],
-            'top_companies': ['NHS', 'Nuffield Health', 'Bupa'],
-            'demand': 'High',
-            'remote_friendly': False,
-            'skills': ['Manual Therapy', 'Rehabilitation', 'Patient Assessment'],
-            'job_openings_uk': '5,000+'
-        },
-        {
-            'title': 'Dental Nurse',
-            'entry_salary': 20000,
-            'year_5_salary': 25000,
-            'senior_salary': 30000,
-            'growth_rate': 0.06,
-            'required_education': ['Apprenticeship', 'Diploma'],
-            'top_companies': ['NHS Dentists', 'Private Practices', 'Bupa Dental'],
-            'demand': 'High',
-            'remote_friendly': False,
-            'skills': ['Dental Procedures', 'Sterilization', 'Patient Care'],
-            'job_openings_uk': '8,000+'
-        }
-    ],
-    
-    'Trades & Construction': [
-        {
-            'title': 'Electrician',
-            'entry_salary': 22000,
-            'year_5_salary': 35000,
-            'senior_salary': 45000,
-            'growth_rate': 0.14,
-            'required_education': ['Apprenticeship (Level 3)'],
-            'top_companies': ['Self-employed', 'Balfour Beatty', 'Laing O\'Rourke'],
-            'demand': 'Very High',
-            'remote_friendly': False,
-            'skills': ['Wiring', '18th Edition', 'Testing & Inspection'],
-            'job_openings_uk': '15,000+'
-        },
-        {
-            'title': 'Plumber',
-            'entry_salary': 21000,
-            'year_5_salary': 33000,
-            'senior_salary': 42000,
-            'growth_rate': 0.13,
-            'required_education': ['Apprenticeship (Level 3)'],
-            'top_companies': ['Self-employed', 'British Gas', 'Pimlico Plumbers'],
-            'demand': 'Very High',
-            'remote_friendly': False,
-            'skills': ['Pipework', 'Gas Safe', 'Central Heating'],
-            'job_openings_uk': '12,000+'
-        },
-        {
-            'title': 'Carpenter',
-            'entry_salary': 20000,
-            'year_5_salary': 30000,
-            'senior_salary': 38000,
-            'growth_rate': 0.12,
-            'required_education': ['Apprenticeship'],
-            'top_companies': ['Self-employed', 'Wates', 'Morgan Sindall'],
-            'demand': 'High',
-            'remote_friendly': False,
-            'skills': ['Joinery', 'Site Carpentry', 'Reading Drawings'],
-            'job_openings_uk': '10,000+'
-        }
-    ]
-}
+import threading
+
+from .catalog_store import as_catalog_table, get_catalog_store
+
+DEMAND_RANK = {'Very High': 0, 'High': 1, 'Medium': 2, 'Low': 3}
+AUTOCOMPLETE_TOP_K = 10  # Completions kept per trie node
+
+
+class _TrieNode:
+    __slots__ = ('children', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.top = []  # Rows of the best AUTOCOMPLETE_TOP_K careers under this prefix, best first
+
+
+class CareerCatalog:
+    def __init__(self, careers):
+        """
+        Compile the careers table (or a {field: [career, ...]} dict) into lookup indexes
+
+        The indexes hold row ids built from the title, field and demand columns; a
+        career is only decoded from the catalog when a lookup returns it
+
+        - title index: case-folded title -> row (O(1) get_career_by_title)
+        - field index: case-folded field -> careers
+        - prefix trie over every word start of every title, with the top completions
+          stored on each node, so typeahead costs O(len(prefix)) however big the catalog
+          (built here with the rest, so no request pays for it and no lock guards it)
+        """
+        self.table = as_catalog_table(careers)
+        self.careers_by_field = self.table.view()
+        self._titles = self.table.column('title')
+        self._fields = self.table.groups()
+        self._by_title = {}
+        self._by_field = {field.casefold(): careers for field, careers in self.careers_by_field.items()}
+
+        for row, title in enumerate(self._titles):
+            self._by_title.setdefault(title.casefold(), row)
+
+        self._trie = self._build_trie()
+
+    def by_title(self, title):
+        row = self._by_title.get(title.strip().casefold())
+        return None if row is None else self.table.row(row)
+
+    def field_of(self, title):
+        row = self._by_title.get(title.strip().casefold())
+        return None if row is None else self._fields[row]
+
+    def for_field(self, field):
+        return self.careers_by_field.get(field) or self._by_field.get(field.strip().casefold(), [])
+
+    def autocomplete(self, prefix, limit=AUTOCOMPLETE_TOP_K):
+        """Careers with a title word starting with prefix, highest demand first"""
+        node = self._trie
+        for char in prefix.strip().casefold():
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [self.table.row(row) for row in node.top[:limit]] if prefix.strip() else []
+
+    def __len__(self):
+        return len(self._by_title)
+
+    def _build_trie(self):
+        trie = _TrieNode()
+        demand = self.table.column('demand')
+        # Insert best-ranked careers first so each node's top list fills in rank order
+        ranked = sorted(self._by_title.values(), key=lambda row: (DEMAND_RANK.get(demand[row], 9), self._titles[row]))
+        for row in ranked:
+            self._insert(trie, row)
+        return trie
+
+    def _insert(self, trie, row):
+        title = self._titles[row].casefold()
+        starts = [0] + [i + 1 for i, char in enumerate(title) if char in ' -/(' and i + 1 < len(title)]
+
+        for start in starts:
+            node = trie
+            for char in title[start:]:
+                node = node.children.get(char) or node.children.setdefault(char, _TrieNode())
+                # Careers go in one at a time, so if this one already reached the node
+                # (repeated word) it's the last entry
+                if len(node.top) < AUTOCOMPLETE_TOP_K and (not node.top or node.top[-1] != row):
+                    node.top.append(row)
+
+
+_catalog = (None, None)  # (catalog version, CareerCatalog)
+_catalog_lock = threading.Lock()
+
+
+def get_career_catalog():
+    """CareerCatalog over the current catalog version - rebuilt when a new one is published"""
+    global _catalog
+
+    version, careers = get_catalog_store().table('careers')
+    with _catalog_lock:
+        if _catalog[0] != version:
+            _catalog = (version, CareerCatalog(careers))
+        return _catalog[1]
+
+
+def __getattr__(name):
+    # UK_CAREERS stays importable as a plain dict of the current catalog version -
+    # decoded in full on first use, so the app itself goes through the lookups below
+    if name == 'UK_CAREERS':
+        return get_catalog_store().table('careers')[1].grouped()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def get_careers_for_field(field, limit=5):
     """Get top careers for a specific field"""
-    careers = UK_CAREERS.get(field, [])
-    return careers[:limit]
+    careers = get_career_catalog().for_field(field)
+    return list(careers[:limit])
 
 def get_career_by_title(title):
     """Get specific career by title"""
-    for field, careers in UK_CAREERS.items():
-        for career in careers:
-            if career['title'].lower() == title.lower():
-                return career
-    return None
+    return get_career_catalog().by_title(title)
+
+def autocomplete_careers(prefix, limit=10):
+    """Typeahead suggestions for a partially typed career title"""
+    return get_career_catalog().autocomplete(prefix, limit)
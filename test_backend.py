@@ -144,6 +144,1254 @@ def test_edge_cases():
     
     print("\n✅ Edge Cases: PASSED\n")
 
+def test_job_data_cache():
+    """Test the two-tier Adzuna cache"""
+    print("=" * 60)
+    print("TEST 5: Job Data Cache")
+    print("=" * 60)
+    
+    import tempfile
+    import time
+    from pathlib import Path
+    from modules.adzuna_cache import JobDataCache
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'cache.sqlite3'
+        cache = JobDataCache(path=path, ttl_seconds=60)
+        key = JobDataCache.make_key('Software Developer', 'UK', 100)
+        
+        assert cache.get(key) is None
+        cache.set(key, {'total_jobs': 1234, 'success': True})
+        assert cache.get(key)['total_jobs'] == 1234
+        
+        # A second "worker" only sees the shared SQLite tier
+        other_worker = JobDataCache(path=path, ttl_seconds=60)
+        assert other_worker.get(JobDataCache.make_key(' software developer', 'uk', 100))['total_jobs'] == 1234
+        assert other_worker.stats()['disk_hits'] == 1
+        
+        # Expired entries are misses but can still be served stale
+        expired = JobDataCache(path=path, ttl_seconds=0)
+        expired.set(key, {'total_jobs': 99, 'success': True})
+        time.sleep(0.01)
+        assert expired.get(key) is None
+        assert expired.get_stale(key)['total_jobs'] == 99
+
+        # An expired memory entry falls through to a fresher row another worker wrote
+        short = JobDataCache(path=path, ttl_seconds=0.2)
+        short.set(key, {'total_jobs': 1, 'success': True})
+        time.sleep(0.25)
+        JobDataCache(path=path, ttl_seconds=60).set(key, {'total_jobs': 2, 'success': True})
+        assert short.get(key)['total_jobs'] == 2
+        assert short.get(key)['total_jobs'] == 2  # Memory tier refilled from disk
+
+        print(f"\nCache stats: {cache.stats()}")
+    
+    print("\n✅ Job Data Cache: PASSED\n")
+
+def test_rate_limiter():
+    """Test the token-bucket rate limiter"""
+    print("=" * 60)
+    print("TEST 6: Rate Limiter")
+    print("=" * 60)
+    
+    from modules.rate_limiter import RateLimiter
+    
+    # 3 requests per minute and 4 per hour
+    limiter = RateLimiter([(3, 60), (4, 3600)])
+    
+    allowed = [limiter.acquire(timeout=0) for _ in range(5)]
+    print(f"\nBurst of 5 with a per-minute cap of 3: {allowed}")
+    assert allowed == [True, True, True, False, False]
+    
+    # Fast bucket refills; the slow one still has a single token left
+    limiter.buckets[0].tokens = 3
+    assert limiter.acquire(timeout=0) is True
+    assert limiter.acquire(timeout=0) is False
+    print(f"Remaining: {limiter.remaining()}")
+
+    # Background work can't drain the per-minute burst that page views need
+    from modules.quota_scheduler import PRIORITY_BACKGROUND
+    limiter = RateLimiter([(10, 60)])
+    background = sum(limiter.acquire(timeout=0, priority=PRIORITY_BACKGROUND) for _ in range(10))
+    interactive = sum(limiter.acquire(timeout=0) for _ in range(10))
+    print(f"Of 10 per minute - background: {background}, interactive: {interactive}")
+    assert (background, interactive) == (6, 4)
+
+    # A token taken for a request that was never sent goes back
+    limiter.release()
+    assert limiter.acquire(timeout=0) is True
+    
+    print("\n✅ Rate Limiter: PASSED\n")
+
+def test_single_flight():
+    """Test coalescing of identical concurrent lookups"""
+    print("=" * 60)
+    print("TEST 7: Single-Flight Coalescing")
+    print("=" * 60)
+    
+    import threading
+    import time
+    from modules.adzuna_cache import SingleFlight
+    
+    flights = SingleFlight()
+    upstream_calls = []
+    
+    def slow_fetch():
+        upstream_calls.append(1)
+        time.sleep(0.1)
+        return {'total_jobs': 42}
+    
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flights.do('software developer', slow_fetch)))
+        for _ in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    print(f"\n20 concurrent lookups -> {len(upstream_calls)} upstream call(s), {flights.coalesced} coalesced")
+    assert len(upstream_calls) == 1
+    assert len(results) == 20 and all(r['total_jobs'] == 42 for r in results)
+    
+    print("\n✅ Single-Flight Coalescing: PASSED\n")
+
+def test_job_market_snapshot():
+    """Test building and reading the offline job market snapshot"""
+    print("=" * 60)
+    print("TEST 8: Job Market Snapshot")
+    print("=" * 60)
+    
+    import tempfile
+    import time
+    from pathlib import Path
+    from modules.job_market_snapshot import (
+        SnapshotRefresher, build_lock, build_snapshot, collect_queries, load_snapshot
+    )
+    
+    class FakeAdzuna:
+        def __init__(self, failing=()):
+            self.failing = failing
+            self.builds = 0
+        
+        def get_job_demand_many(self, titles, max_pages=1, priority=None):
+            self.builds += 1
+            return {
+                title: {
+                    'total_jobs': 0 if title in self.failing else len(title) * 100,
+                    'avg_salary': 30000, 'salary_min': 20000, 'salary_max': 40000,
+                    'salary_p25': 25000, 'salary_median': 30000, 'salary_p75': 35000,
+                    'salaries_sampled': 50, 'top_companies': [], 'locations': [],
+                    'success': title not in self.failing
+                }
+                for title in titles
+            }
+    
+    queries = collect_queries()
+    print(f"\n{len(queries)} unique titles and skills to prefetch")
+    assert len(queries) == len({q.casefold() for q in queries})
+    assert 'Software Developer' in queries and 'Python' in queries
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'snapshot.json.gz'
+        build_snapshot(FakeAdzuna(), path, queries)
+        
+        # A failing refresh keeps the previous entry
+        build_snapshot(FakeAdzuna(failing=('Python',)), path, queries)
+        
+        snapshot = load_snapshot(path)
+        assert len(snapshot) == len(queries)
+        assert snapshot.get('python')['total_jobs'] == 600
+        assert snapshot.get('Unknown Job') is None
+        print(f"Snapshot generated {snapshot.generated_at}, {path.stat().st_size} bytes")
+        
+        # Only one worker builds at a time; the others leave it to the lock holder
+        path = Path(tmp) / 'refreshed.json.gz'
+        api = FakeAdzuna()
+        with build_lock(path) as acquired:
+            assert acquired
+            refresher = SnapshotRefresher(api, path)
+            refresher.start()
+            time.sleep(0.3)
+            refresher.stop()
+            assert api.builds == 0 and not path.exists()
+        
+        refresher = SnapshotRefresher(api, path)
+        refresher.start()
+        deadline = time.monotonic() + 5
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        refresher.stop()
+        assert api.builds == 1 and load_snapshot(path) is not None
+        print("✓ Refresh skipped while another worker held the build lock")
+    
+    print("\n✅ Job Market Snapshot: PASSED\n")
+
+def test_quantile_sketch():
+    """Test the streaming salary quantile sketch"""
+    print("=" * 60)
+    print("TEST 9: Quantile Sketch")
+    print("=" * 60)
+    
+    import random
+    from modules.quantile_sketch import QuantileSketch
+    
+    rng = random.Random(7)
+    salaries = [rng.lognormvariate(10.3, 0.35) for _ in range(20000)]
+    
+    # Two halves sketched separately then merged, as with parallel page streams
+    first, second = QuantileSketch(), QuantileSketch()
+    first.update(salaries[:10000])
+    second.update(salaries[10000:])
+    first.merge(second)
+    
+    exact = sorted(salaries)
+    for q in (0.25, 0.5, 0.75):
+        true_value = exact[int(q * (len(exact) - 1))]
+        estimate = first.quantile(q)
+        print(f"P{int(q * 100)}: £{estimate:,.0f} (exact £{true_value:,.0f})")
+        assert abs(estimate - true_value) / true_value <= 0.011
+    
+    print(f"Buckets used for {first.count:,} salaries: {len(first.buckets)}")
+    assert QuantileSketch().summary()['median'] == 0
+    
+    print("\n✅ Quantile Sketch: PASSED\n")
+
+def test_job_history():
+    """Test the append-only job demand history"""
+    print("=" * 60)
+    print("TEST 10: Job Demand History")
+    print("=" * 60)
+    
+    import tempfile
+    from datetime import date, timedelta
+    from pathlib import Path
+    from modules.job_history import JobHistoryStore
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        history = JobHistoryStore(Path(tmp) / 'history.sqlite3')
+        today = date.today()
+        
+        for days_ago in range(0, 400, 7):
+            day = today - timedelta(days=days_ago)
+            history.record('Software Developer', 'UK', {'success': True, 'total_jobs': 15000 - days_ago, 'avg_salary': 45000}, day)
+        
+        # Append-only: a second result on the same day is ignored
+        history.record('software developer', 'UK', {'success': True, 'total_jobs': 1}, today)
+        history.record('Software Developer', 'UK', {'success': False, 'total_jobs': 0}, today - timedelta(days=1))
+        
+        series = history.get_series('Software Developer', today - timedelta(days=30), today)
+        assert series[-1]['total_jobs'] == 15000
+        assert all(row['day'] >= (today - timedelta(days=30)).isoformat() for row in series)
+        
+        trend = history.monthly_trend('Software Developer', months=12)
+        print(f"\n{len(series)} points in the last 30 days, {len(trend)} months in the 12-month trend")
+        assert len(trend) <= 12 and trend[-1]['month'] == today.isoformat()[:7]
+    
+    print("\n✅ Job Demand History: PASSED\n")
+
+def test_fake_adzuna_server():
+    """Test the local Adzuna stand-in used for load testing"""
+    print("=" * 60)
+    print("TEST 11: Fake Adzuna Server")
+    print("=" * 60)
+    
+    import json
+    from urllib.error import HTTPError
+    from urllib.request import urlopen
+    from fake_adzuna_server import start_fake_server
+    
+    server, base_url = start_fake_server(rate_limit_per_minute=3)
+    try:
+        query = "?app_id=test&app_key=test&what=Data+Analyst&results_per_page=20"
+        page_1 = json.load(urlopen(f"{base_url}/1{query}"))
+        page_2 = json.load(urlopen(f"{base_url}/2{query}"))
+        
+        print(f"\nSynthetic count: {page_1['count']:,}, {len(page_1['results'])} results per page")
+        assert page_1['count'] == page_2['count'] and len(page_1['results']) == 20
+        assert page_1['results'][0]['id'] != page_2['results'][0]['id']
+        assert json.load(urlopen(f"{base_url}/1{query}")) == page_1  # Deterministic
+        
+        try:
+            urlopen(f"{base_url}/1{query}")
+            assert False, "Expected a 429"
+        except HTTPError as e:
+            print(f"4th request in a minute: HTTP {e.code}, Retry-After {e.headers['Retry-After']}s")
+            assert e.code == 429
+    finally:
+        server.shutdown()
+    
+    print("\n✅ Fake Adzuna Server: PASSED\n")
+
+def test_quota_scheduler():
+    """Test priority-aware quota accounting"""
+    print("=" * 60)
+    print("TEST 12: Quota Scheduler")
+    print("=" * 60)
+    
+    import tempfile
+    from datetime import date
+    from pathlib import Path
+    from modules.quota_scheduler import (
+        QuotaScheduler, PRIORITY_INTERACTIVE, PRIORITY_COMPARE, PRIORITY_BACKGROUND
+    )
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'quota.sqlite3'
+        scheduler = QuotaScheduler(path, monthly_quota=100)
+        day = date(2026, 3, 10)
+        
+        # Background work stops once only its 35% reserve is left
+        background = sum(scheduler.try_acquire(PRIORITY_BACKGROUND, day) for _ in range(100))
+        compare = sum(scheduler.try_acquire(PRIORITY_COMPARE, day) for _ in range(100))
+        interactive = sum(scheduler.try_acquire(PRIORITY_INTERACTIVE, day) for _ in range(100))
+        print(f"\nAllowed - background: {background}, compare: {compare}, interactive: {interactive}")
+        assert (background, compare, interactive) == (65, 20, 13)
+        
+        # Usage is persistent and shared by other workers
+        other_worker = QuotaScheduler(path, monthly_quota=100)
+        metrics = other_worker.metrics(day)
+        print(f"Metrics: {metrics}")
+        assert metrics['used'] == 98 and metrics['remaining'] == 2
+        assert metrics['projected_exhaustion'] == '2026-03-10'
+        
+        # New month, fresh quota
+        assert other_worker.try_acquire(PRIORITY_BACKGROUND, date(2026, 4, 1))
+    
+    print("\n✅ Quota Scheduler: PASSED\n")
+
+def test_outcome_store():
+    """Test persistent outcome storage with concurrent writers"""
+    print("=" * 60)
+    print("TEST 13: Outcome Store")
+    print("=" * 60)
+    
+    import tempfile
+    import threading
+    from pathlib import Path
+    from modules.outcome_store import OutcomeStore
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        store = OutcomeStore(Path(tmp) / 'outcomes.sqlite3')
+        
+        # Several "workers" saving decisions at once
+        def worker(n):
+            for i in range(25):
+                store.save_initial_decision({
+                    'grit_score': n, 'hands_on_score': i % 10,
+                    'interest_field': 'Technology', 'recommended_pathway': 'Apprenticeship'
+                })
+        
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        print(f"\nDecisions stored: {store.count()}")
+        assert store.count() == 100
+        
+        decision_id = store.save_initial_decision({'grit_score': 8, 'recommended_pathway': 'Local University'})
+        store.update_decision(decision_id, email='student@example.com', consent_to_follow_up=True)
+        assert store.get_decision(decision_id)['email'] == 'student@example.com'
+        
+        # 12-month survey ids map onto the indexed columns; pathway falls back to the recommendation
+        store.record_outcome(decision_id, 12, {'current_salary': 27000, 'job_satisfaction': 8})
+        rows = list(store.iter_evidence_rows(pathway='Local University'))
+        print(f"Evidence rows: {rows}")
+        assert rows[0]['satisfaction_score'] == 8 and rows[0]['current_salary'] == 27000
+        assert store.get_decision(decision_id)['outcome_captured'] == 1
+        
+        columns = store.fetch_columns('SELECT grit_score FROM initial_decisions WHERE interest_field = ?', ('Technology',))
+        assert len(columns['grit_score']) == 100
+        assert len(list(store.iter_decisions(pathway='Apprenticeship', batch_size=7))) == 100
+    
+    print("\n✅ Outcome Store: PASSED\n")
+
+
+def test_outcome_index():
+    """Test grid-indexed evidence lookups match the linear scan"""
+    print("=" * 60)
+    print("TEST 14: Outcome Index")
+    print("=" * 60)
+    
+    import random
+    from modules.outcome_index import OutcomeIndex
+    from modules.outcome_tracker import OutcomeTracker
+    
+    rng = random.Random(7)
+    pathways = ['Apprenticeship', 'Local University', 'Bootcamp/Micro-Credential']
+    rows = [
+        {
+            'pathway': rng.choice(pathways),
+            'grit_score': rng.uniform(0, 10),
+            'hands_on_score': rng.uniform(0, 10),
+            'satisfaction_score': rng.randint(1, 10),
+            'current_salary': rng.choice([0, rng.randint(18000, 40000)])
+        }
+        for _ in range(5000)
+    ]
+    index = OutcomeIndex(rows)
+    tracker = OutcomeTracker()
+    profile = {'grit': 7.5, 'hands_on': 8.0}
+    
+    for pathway in pathways:
+        linear = tracker.build_evidence_statement(profile, pathway, rows)
+        indexed = tracker.build_evidence_statement(profile, pathway, index)
+        print(f"\n{pathway}: n={indexed['sample_size']}, satisfaction={indexed['avg_satisfaction']}, salary=£{indexed['avg_salary']:,.0f}")
+        assert linear == indexed
+    
+    # Boundaries are exclusive, as in the linear filter
+    edge = OutcomeIndex([{'pathway': 'Apprenticeship', 'grit_score': 5.0, 'hands_on_score': 5.0}])
+    assert len(list(edge.similar('Apprenticeship', 3.0, 5.0))) == 0
+    assert len(list(edge.similar('Apprenticeship', 3.01, 6.99))) == 1
+    
+    print("\n✅ Outcome Index: PASSED\n")
+
+
+def test_outcome_cohorts():
+    """Test incrementally maintained cohort cells"""
+    print("=" * 60)
+    print("TEST 15: Outcome Cohorts")
+    print("=" * 60)
+    
+    import random
+    import tempfile
+    from pathlib import Path
+    from modules.outcome_cohorts import CohortAggregates, neighbour_bins, score_bin
+    from modules.outcome_store import OutcomeStore
+    from modules.outcome_tracker import OutcomeTracker
+    
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = OutcomeStore(Path(tmp) / 'outcomes.sqlite3')
+        for _ in range(300):
+            decision_id = store.save_initial_decision({
+                'grit_score': rng.uniform(5, 10), 'hands_on_score': rng.uniform(5, 10),
+                'recommended_pathway': 'Apprenticeship'
+            })
+            store.record_outcome(decision_id, 12, {'job_satisfaction': rng.randint(1, 10),
+                                                   'current_salary': rng.randint(18000, 35000)})
+        
+        # A corrected survey replaces the old answer in its cell
+        store.record_outcome(decision_id, 12, {'job_satisfaction': 10, 'current_salary': 30000})
+        
+        cohorts = store.cohorts()
+        print(f"\nOutcomes aggregated: {len(cohorts)}")
+        assert len(cohorts) == 300
+        
+        # Same answer as a scan over the raw rows in the neighbouring bins
+        rows = list(store.iter_evidence_rows())
+        grit_bins, hands_on_bins = neighbour_bins(7.5), neighbour_bins(8.0)
+        in_cohort = [r for r in rows if score_bin(r['grit_score']) in grit_bins
+                     and score_bin(r['hands_on_score']) in hands_on_bins]
+        totals = cohorts.totals('Apprenticeship', 7.5, 8.0)
+        assert totals['count'] == len(in_cohort)
+        assert totals['satisfied'] == sum(1 for r in in_cohort if r['satisfaction_score'] >= 7)
+        assert totals['salary_sum'] == sum(r['current_salary'] for r in in_cohort)
+        
+        evidence = OutcomeTracker().build_evidence_statement({'grit': 7.5, 'hands_on': 8.0}, 'Apprenticeship', cohorts)
+        print(f"Evidence: n={evidence['sample_size']}, success={evidence['success_rate']}%, std={evidence['satisfaction_std']}")
+        assert evidence['sample_size'] == len(in_cohort)
+        
+        # Rebuilding from raw outcomes gives identical cells
+        before = sorted(cohorts.cells())
+        store.rebuild_cohorts()
+        assert sorted(store.cohorts().cells()) == before
+    
+    assert len(CohortAggregates()) == 0
+    
+    print("\n✅ Outcome Cohorts: PASSED\n")
+
+
+def test_prediction_accuracy_batch():
+    """Test vectorised prediction accuracy against the per-pair version"""
+    print("=" * 60)
+    print("TEST 16: Batch Prediction Accuracy")
+    print("=" * 60)
+    
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        print("\n⚠️  pandas not installed - skipping\n")
+        return
+    
+    import random
+    import tempfile
+    from pathlib import Path
+    from modules.outcome_store import OutcomeStore
+    from modules.outcome_tracker import OutcomeTracker
+    
+    rng = random.Random(11)
+    tracker = OutcomeTracker()
+    with tempfile.TemporaryDirectory() as tmp:
+        store = OutcomeStore(Path(tmp) / 'outcomes.sqlite3')
+        pairs = []
+        for _ in range(200):
+            initial = {
+                'grit_score': rng.uniform(0, 10), 'hands_on_score': rng.uniform(0, 10),
+                'interest_field': rng.choice(['Technology', 'Healthcare']),
+                'recommended_pathway': rng.choice(['Apprenticeship', 'Local University']),
+                'predicted_roi': rng.randint(-20000, 150000), 'predicted_salary_year_5': rng.randint(25000, 50000)
+            }
+            outcome = {'net_wealth': rng.randint(-40000, 120000), 'final_salary': rng.randint(18000, 60000),
+                       'overall_satisfaction': rng.randint(1, 10)}
+            store.record_outcome(store.save_initial_decision(initial), 24, outcome)
+            pairs.append((initial, outcome))
+        
+        result = tracker.calculate_prediction_accuracy_batch(store)
+        expected = [tracker.calculate_prediction_accuracy(i, o) for i, o in pairs]
+        
+        print(f"\nSummary: {result['summary']}")
+        print(result['breakdowns']['pathway'])
+        assert result['summary']['outcomes'] == 200
+        assert abs(result['rows']['roi_accuracy'].mean() - sum(e['roi_accuracy'] for e in expected) / 200) < 1e-9
+        assert abs(result['rows']['salary_accuracy'].mean() - sum(e['salary_accuracy'] for e in expected) / 200) < 1e-9
+        assert result['breakdowns']['pathway']['outcomes'].sum() == 200
+    
+    print("\n✅ Batch Prediction Accuracy: PASSED\n")
+
+
+def test_follow_up_scheduler():
+    """Test due-date driven follow-up emails"""
+    print("=" * 60)
+    print("TEST 17: Follow-up Scheduler")
+    print("=" * 60)
+    
+    import json
+    import tempfile
+    from datetime import datetime, timedelta
+    from pathlib import Path
+    from modules.follow_up_scheduler import FollowUpScheduler
+    from modules.outcome_store import OutcomeStore
+    from modules.outcome_tracker import generate_follow_up_email_template
+    
+    # Every follow-up interval has a template now
+    for months in (6, 12, 24):
+        assert generate_follow_up_email_template('Sam', 'Apprenticeship', months)['subject']
+    
+    start = datetime(2026, 1, 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = OutcomeStore(Path(tmp) / 'outcomes.sqlite3')
+        store.save_initial_decisions([
+            {
+                'email': f'student{i}@example.com' if i % 10 else '',
+                'name': f'Student {i}',
+                'recommended_pathway': 'Apprenticeship',
+                'consent_to_follow_up': True,
+                'follow_up_6_months': (start + timedelta(days=180 + i)).isoformat(),
+                'follow_up_12_months': (start + timedelta(days=365 + i)).isoformat(),
+                'follow_up_24_months': (start + timedelta(days=730 + i)).isoformat()
+            }
+            for i in range(100)
+        ])
+        scheduler = FollowUpScheduler(store, Path(tmp) / 'outbox.jsonl', batch_size=7)
+        
+        # Nothing due yet
+        assert scheduler.tick(start) == {'queued': 0, 'skipped': 0}
+        
+        # First 50 six-month follow-ups are due; every 10th has no email
+        counts = scheduler.tick(start + timedelta(days=229))
+        print(f"\nAfter ~7.5 months: {counts}")
+        assert counts == {'queued': 45, 'skipped': 5}
+        
+        # Processed rows are never sent twice
+        assert scheduler.tick(start + timedelta(days=229)) == {'queued': 0, 'skipped': 0}
+        
+        counts = scheduler.tick(start + timedelta(days=830))
+        print(f"After ~27 months: {counts}")
+        assert counts == {'queued': 225, 'skipped': 25}
+        
+        messages = [json.loads(line) for line in (Path(tmp) / 'outbox.jsonl').read_text().splitlines()]
+        assert len(messages) == 270
+        assert {m['months_elapsed'] for m in messages} == {6, 12, 24}
+        assert messages[0]['survey_link'].startswith('https://')
+    
+    print("\n✅ Follow-up Scheduler: PASSED\n")
+
+
+def test_salary_calibration():
+    """Test outcome-driven salary recalibration and hot-swapping"""
+    print("=" * 60)
+    print("TEST 18: Salary Calibration")
+    print("=" * 60)
+    
+    import random
+    import tempfile
+    from pathlib import Path
+    from modules.outcome_store import OutcomeStore
+    from modules.roi_calculator import ROICalculator
+    from modules.salary_calibration import SalaryCalibrator
+    
+    field, pathway = 'Technology & Software', 'Micro-Credentials'
+    rng = random.Random(5)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        table_path = Path(tmp) / 'salary_table.json'
+        store = OutcomeStore(Path(tmp) / 'outcomes.sqlite3')
+        calculator = ROICalculator(table_path=table_path)
+        static_starting = calculator.salary_data[field][pathway]['starting']
+        
+        # Bootcamp grads really start around £32k (table says £26k) and grow ~10%/yr
+        def add_students(count):
+            for _ in range(count):
+                decision_id = store.save_initial_decision({'interest_field': field, 'recommended_pathway': pathway})
+                starting = rng.gauss(32000, 2000)
+                store.record_outcome(decision_id, 12, {'current_salary': round(starting)})
+                store.record_outcome(decision_id, 24, {'final_salary': round(starting * 1.10)})
+        
+        add_students(100)
+        calibrator = SalaryCalibrator.load(table_path)
+        used = calibrator.ingest_store(store)
+        version = calibrator.publish(table_path)
+        estimate = calibrator.estimate(field, pathway)
+        print(f"\nIngested {used} salaries -> v{version}: {estimate}")
+        assert used == 200 and version == 1
+        assert 30000 < estimate['starting'] < 33000
+        assert 0.09 < estimate['growth_rate'] < 0.17
+        
+        # The running calculator picks the new table up without being rebuilt
+        calculator.refresh_salary_table(force=True)
+        print(f"Starting salary: £{static_starting:,} -> £{calculator.salary_data[field][pathway]['starting']:,.0f}")
+        assert calculator.salary_table_version == 1
+        assert calculator.salary_data[field][pathway]['starting'] == estimate['starting']
+        assert calculator.salary_data['Healthcare & Medicine'] == calculator.default_salary_data['Healthcare & Medicine']
+        
+        # Incremental: a resumed calibrator only reads the new outcomes
+        add_students(10)
+        resumed = SalaryCalibrator.load(table_path)
+        assert resumed.ingest_store(store) == 20
+        assert resumed.publish(table_path) == 2
+        calculator.refresh_salary_table(force=True)
+        assert calculator.salary_table_version == 2
+
+        # A resubmitted survey keeps its outcome id, so it isn't observed twice
+        decision_id = store.save_initial_decision({'interest_field': field, 'recommended_pathway': pathway})
+        first_id = store.record_outcome(decision_id, 12, {'current_salary': 31000})
+        assert store.record_outcome(decision_id, 12, {'current_salary': 31500}) == first_id
+        assert resumed.ingest_store(store) == 1
+        assert resumed.ingest_store(store) == 0
+
+        # Withdrawing the published table falls back to the static figures
+        table_path.unlink()
+        calculator.refresh_salary_table(force=True)
+        assert calculator.salary_table_version == 0
+        assert calculator.salary_data[field][pathway]['starting'] == static_starting
+
+    print("\n✅ Salary Calibration: PASSED\n")
+
+
+def test_career_catalog():
+    """Test compiled career lookups and autocomplete"""
+    print("=" * 60)
+    print("TEST 19: Career Catalog Indexes")
+    print("=" * 60)
+    
+    from modules.uk_careers import (
+        UK_CAREERS, CareerCatalog, autocomplete_careers, get_career_by_title, get_careers_for_field
+    )
+    
+    assert get_career_by_title('  SOFTWARE developer ')['title'] == 'Software Developer'
+    assert get_career_by_title('Astronaut') is None
+    assert get_careers_for_field('Technology & Software', limit=2) == UK_CAREERS['Technology & Software'][:2]
+    
+    suggestions = [c['title'] for c in autocomplete_careers('anal')]
+    print(f"\n'anal' -> {suggestions}")
+    assert 'Data Analyst' in suggestions and 'Cybersecurity Analyst' in suggestions
+    assert suggestions[0] == 'Cybersecurity Analyst'  # Very High demand ranks first
+    assert autocomplete_careers('') == [] and autocomplete_careers('zzz') == []
+    
+    # Thousands of occupations: lookups stay direct
+    big = {
+        f'Field {f}': [{'title': f'Occupation {f}-{i} Specialist', 'demand': 'High'} for i in range(1000)]
+        for f in range(10)
+    }
+    catalog = CareerCatalog(big)
+    assert len(catalog) == 10000
+    assert catalog._trie.children  # Built with the catalog, not on the first keystroke
+    assert catalog.by_title('occupation 9-999 specialist')['title'] == 'Occupation 9-999 Specialist'
+    assert catalog.field_of('Occupation 7-1 Specialist') == 'Field 7'
+    assert len(catalog.autocomplete('occupation 2-5', limit=5)) == 5
+    assert len(catalog.autocomplete('spec')) == 10
+    
+    print("\n✅ Career Catalog Indexes: PASSED\n")
+
+
+def test_programme_search():
+    """Test faceted programme search"""
+    print("=" * 60)
+    print("TEST 20: Programme Search")
+    print("=" * 60)
+    
+    import time
+    from modules.programme_search import (
+        ProgrammeSearch, normalise_locations, parse_duration_years, parse_entry_points, search_programmes
+    )
+    from modules.uk_programmes import UK_PROGRAMMES
+    
+    assert parse_duration_years('4 years (MEng)') == 4
+    assert parse_duration_years('3-6 months (part-time)') == 0.5
+    assert parse_duration_years('12 weeks') == 0.23
+    assert parse_entry_points('A*A*A') == 160 and parse_entry_points('ABB at A-Level') == 128
+    assert parse_entry_points('5 GCSEs grade 4+') == 0
+    assert normalise_locations('London (+ Remote)') == ('london', 'remote')
+    
+    # Cheap, short, hands-on - bootcamps and paid apprenticeships
+    result = search_programmes(max_cost=10000, max_duration_years=2, tags=['hands_on'], sort_by='starting_salary', descending=True)
+    print(f"\nCheap hands-on: {result['total']} -> {[p['name'] for p in result['results']]}")
+    assert result['total'] > 0
+    assert all(p['cost'] <= 10000 and 'hands_on' in p['fit_tags'] for p in result['results'])
+    salaries = [p['starting_salary'] for p in result['results']]
+    assert salaries == sorted(salaries, reverse=True)
+    assert sum(result['facets']['pathway'].values()) == result['total']
+    
+    # Tariff filter hides courses asking for more than the student's points
+    result = search_programmes(pathway='Local University', max_entry_points=128)
+    assert all(p['entry_points'] <= 128 for p in result['results'])
+    
+    # UCAS scale
+    engine = ProgrammeSearch({pathway: programmes * 2600 for pathway, programmes in UK_PROGRAMMES.items()})
+    started = time.perf_counter()
+    result = engine.search(locations=['London'], max_cost=30000, sort_by='cost', limit=20)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"{len(engine.docs):,} programmes: {result['total']:,} matches in {elapsed_ms:.1f}ms")
+    assert len(result['results']) == 20
+    assert elapsed_ms < 500
+    
+    print("\n✅ Programme Search: PASSED\n")
+
+
+def test_programme_roi():
+    """Test per-programme ROI ranking"""
+    print("=" * 60)
+    print("TEST 21: Programme ROI Ranking")
+    print("=" * 60)
+    
+    import time
+    from modules.programme_roi import ProgrammeROI, profile_fit_tags
+    from modules.programme_search import ProgrammeSearch
+    from modules.roi_calculator import ROICalculator
+    from modules.uk_programmes import UK_PROGRAMMES
+    
+    calculator = ROICalculator(table_path=None)
+    ranker = ProgrammeROI(calculator, ProgrammeSearch(UK_PROGRAMMES))
+    
+    # Closed form agrees with ROICalculator's year-by-year loop for a whole pathway
+    pathway_roi = calculator.calculate_pathway_roi('Local University', 0, 0, 'Technology & Software', 'UK')
+    starting = calculator.salary_data['Technology & Software']['Local University']['starting']
+    mimic = ProgrammeROI(calculator, ProgrammeSearch({'Local University': [
+        {'name': 'Mimic', 'duration': '3 years', 'cost': pathway_roi['total_cost'], 'starting_salary': starting}
+    ]}))
+    assert abs(mimic.roi_columns('Technology & Software')['net_wealth_5'][0] - pathway_roi['net_wealth_year_5']) <= 1
+    
+    top = ranker.top_programmes('Technology & Software', k=3)
+    print("\nTop by 10-year net wealth:")
+    for prog in top:
+        print(f"  {prog['name']}: 5yr £{prog['net_wealth_5']:,.0f}, 10yr £{prog['net_wealth_10']:,.0f}")
+    wealth = [prog['net_wealth_10'] for prog in top]
+    assert wealth == sorted(wealth, reverse=True)
+    assert wealth[0] == max(ranker.roi_columns('Technology & Software')['net_wealth_10'])
+    
+    # Income is applied per request: any number of incomes share one cached entry
+    for income in (18000, 18001, 25000.5):
+        earning = ranker.top_programmes('Technology & Software', k=1, current_income=income)[0]
+        assert earning['net_wealth_10'] <= wealth[0]
+    ranker.top_programmes('Unlisted Field', k=1)
+    assert len(ranker._columns) == 1
+    assert mimic.roi_columns('Technology & Software', 20000)['net_wealth_5'][0] == \
+        mimic.roi_columns('Technology & Software')['net_wealth_5'][0] - 20000 * 3
+    
+    tags = profile_fit_tags({'grit': 8, 'hands_on': 9, 'structure': 3, 'risk_tolerance': 5})
+    by_fit = ranker.top_programmes('Technology & Software', k=3, rank_by='fit', fit_tags=tags, pathway='Apprenticeship')
+    assert all(prog['pathway'] == 'Apprenticeship' for prog in by_fit)
+    assert by_fit[0]['fit_score'] >= by_fit[-1]['fit_score'] > 0
+    
+    # Full catalogue per request once the columns are warm
+    big = ProgrammeROI(calculator, ProgrammeSearch({p: progs * 2600 for p, progs in UK_PROGRAMMES.items()}))
+    big.roi_columns('Technology & Software')
+    started = time.perf_counter()
+    big.top_programmes('Technology & Software', k=5, pathway='Micro-Credentials')
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"Ranked {len(big.search.docs):,} programmes in {elapsed_ms:.1f}ms")
+    assert elapsed_ms < 200
+    
+    print("\n✅ Programme ROI Ranking: PASSED\n")
+
+
+def test_catalog_store():
+    """Test the compiled, memory-mapped catalog and its hot swap"""
+    print("=" * 60)
+    print("TEST 22: Catalog Store")
+    print("=" * 60)
+    
+    import json
+    import math
+    import os
+    import tempfile
+    import threading
+    from pathlib import Path
+    from modules.catalog_store import CatalogReader, CatalogStore, compile_sources, publish_lock, write_catalog
+    from modules.uk_careers import UK_CAREERS
+    from modules.uk_programmes import UK_PROGRAMMES
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact = Path(tmp) / 'catalog.bin'
+        
+        # Round trip: records come back exactly, including mixed-type and list fields
+        version = write_catalog({'careers': UK_CAREERS, 'programmes': UK_PROGRAMMES}, artifact)
+        reader = CatalogReader(artifact)
+        assert version == reader.version == 1
+        assert reader.table('careers').grouped() == UK_CAREERS
+        assert reader.table('programmes').grouped() == UK_PROGRAMMES
+        
+        salaries = reader.table('careers').column('entry_salary')
+        assert isinstance(salaries, memoryview)  # Zero-copy view over the mapping
+        print(f"✓ {len(salaries)} careers, {len(reader.table('programmes'))} programmes, "
+              f"{os.path.getsize(artifact):,} bytes")
+        
+        # Missing fields stay missing
+        sparse = {'A': [{'name': 'x', 'cost': 1}, {'name': 'y', 'remote': True}]}
+        write_catalog({'programmes': sparse}, artifact)
+        table = CatalogReader(artifact).table('programmes')
+        assert table.grouped() == sparse
+        assert math.isnan(table.column('cost')[1])
+        
+        # Editing a data file recompiles and hot-swaps; the old reader keeps working
+        sources = {'careers': Path(tmp) / 'careers.json', 'programmes': Path(tmp) / 'programmes.json'}
+        for name, data in [('careers', UK_CAREERS), ('programmes', UK_PROGRAMMES)]:
+            sources[name].write_text(json.dumps(data))
+        compile_sources(sources, artifact)
+        
+        store = CatalogStore(artifact, sources, check_seconds=0)
+        old_version, old_careers = store.snapshot('careers')
+        old_reader = store.reader()
+        
+        edited = json.loads(sources['careers'].read_text())
+        edited['Technology & Software'][0]['entry_salary'] = 31000
+        sources['careers'].write_text(json.dumps(edited))
+        os.utime(sources['careers'], ns=(1, 1))  # Guarantee a different mtime
+        
+        new_version, new_careers = store.snapshot('careers')
+        assert new_version == old_version + 1
+        assert new_careers['Technology & Software'][0]['entry_salary'] == 31000
+        assert old_careers['Technology & Software'][0]['entry_salary'] == 28000
+        assert old_reader.table('careers').row(0)['entry_salary'] == 28000
+        assert store.snapshot('careers')[1] is new_careers  # One view per version
+        assert store.table('careers')[1]._decoded is None  # Lookups never decoded the whole table
+        
+        # Publishing waits for a concurrent compile holding the lock
+        with publish_lock(artifact):
+            writer = threading.Thread(target=write_catalog, args=({'careers': edited}, artifact))
+            writer.start()
+            writer.join(0.2)
+            assert writer.is_alive()
+        writer.join()
+        assert CatalogReader(artifact).version == new_version + 1
+        print(f"✓ Hot-swapped version {old_version} -> {new_version}")
+    
+    print("\n✅ Catalog Store: PASSED\n")
+
+
+def test_catalog_search():
+    """Test BM25 search with stemming, prefixes and typo tolerance"""
+    print("=" * 60)
+    print("TEST 23: Catalog Search")
+    print("=" * 60)
+    
+    import time
+    from modules.catalog_search import CatalogSearch, edit_distance, stem
+    from modules.uk_careers import UK_CAREERS
+    from modules.uk_programmes import UK_PROGRAMMES
+    
+    assert stem('nursing') == stem('nurse') == stem('nurses')
+    assert edit_distance('sofware', 'software', 2) == 1
+    assert edit_distance('kubernets', 'kubernetes', 2) == 1
+    assert edit_distance('python', 'cobol', 2) == 3
+    
+    index = CatalogSearch(UK_CAREERS, UK_PROGRAMMES)
+    
+    for query, expected in [
+        ('cloud jobs', 'Cloud Architect'),
+        ('nursing', 'Registered Nurse'),
+        ('sofware develper', 'Software Developer'),    # Typos
+        ('kubernets', 'DevOps Engineer'),              # Typo in a skill
+        ('pwc', 'PwC Flying Start Degree Apprenticeship'),
+    ]:
+        hits = index.search(query, limit=3)
+        print(f"✓ '{query}' -> {[hit['title'] for hit in hits]}")
+        assert hits and hits[0]['title'] == expected
+    
+    # Search-as-you-type: a partial last word completes
+    assert any('Engineering' in hit['title'] for hit in index.search('engin', limit=5))
+    assert index.search('engin', prefix=False) == []
+    
+    manchester = index.search('bootcamp in Manchester', kind='programme', limit=3)
+    assert manchester[0]['title'] == 'Northcoders - Software Development'
+    assert all(hit['kind'] == 'programme' for hit in manchester)
+    assert index.search('the of and') == []
+    
+    # Larger catalogue stays interactive (uncached queries)
+    big = CatalogSearch({f: cs * 100 for f, cs in UK_CAREERS.items()}, {p: ps * 100 for p, ps in UK_PROGRAMMES.items()})
+    started = time.perf_counter()
+    for i in range(20):
+        big.search(f'software data engineer manch{i}')
+    elapsed = (time.perf_counter() - started) / 20
+    print(f"✓ {len(big):,} docs: {elapsed * 1000:.1f}ms per query")
+    assert elapsed < 0.2
+    
+    print("\n✅ Catalog Search: PASSED\n")
+
+
+def test_related_careers():
+    """Test the precomputed related-careers graph"""
+    print("=" * 60)
+    print("TEST 24: Related Careers")
+    print("=" * 60)
+    
+    import tempfile
+    import time
+    from pathlib import Path
+    from modules.related_careers import RelatedCareersGraph, build_related_graph, get_related_careers
+    from modules.uk_careers import UK_CAREERS
+    
+    graph = build_related_graph(UK_CAREERS, k=3)
+    for title in ['Software Developer', 'Electrician', 'Cloud Architect']:
+        print(f"✓ {title} -> {graph.related(title)}")
+    
+    assert graph.related('Cloud Architect')[0][0] == 'DevOps Engineer'  # Shares AWS
+    assert graph.related('Electrician')[0][0] == 'Plumber'
+    scores = [score for _, score in graph.related('Software Developer')]
+    assert scores == sorted(scores, reverse=True) and all(0 < score <= 1 for score in scores)
+    assert all(title != 'Software Developer' for title, _ in graph.related('Software Developer'))
+    assert graph.related('Astronaut') == []
+    
+    # Careers sharing nothing get no neighbours rather than arbitrary ones
+    lonely_careers = {'A': [{'title': 'X', 'skills': ['Juggling']}, {'title': 'Y', 'skills': ['Welding']}]}
+    lonely = build_related_graph(lonely_careers)
+    assert lonely.related('X') == []
+    
+    # Round trip through the compact file
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'related.bin'
+        graph.save(path)
+        loaded = RelatedCareersGraph.load(path)
+        assert loaded.related('Software Developer') == graph.related('Software Developer')
+        print(f"✓ {len(graph)} careers in {path.stat().st_size:,} bytes")
+        
+        # The graph is tied to the careers' content, not the artifact's version number:
+        # a recompiled artifact restarts at version 1 but other careers never match
+        from modules.catalog_store import CatalogReader, write_catalog
+        first, second = Path(tmp) / 'first.bin', Path(tmp) / 'second.bin'
+        assert write_catalog({'careers': UK_CAREERS}, first) == write_catalog({'careers': lonely_careers}, second) == 1
+        first_table, second_table = CatalogReader(first).table('careers'), CatalogReader(second).table('careers')
+        assert loaded.catalog_digest == first_table.digest != second_table.digest
+        first_table._digest = None  # As for an artifact compiled before digests were recorded
+        assert first_table.digest == loaded.catalog_digest
+    
+    related = get_related_careers('Data Analyst', limit=2)
+    assert len(related) == 2 and related[0]['field'] and related[0]['similarity'] > 0
+    
+    # Sparse build scales with overlap, not pairs
+    skills = [f'Skill {i}' for i in range(3000)]
+    big = {'Field': [{'title': f'Career {i}', 'skills': skills[i % 3000:i % 3000 + 4],
+                      'required_education': ['Degree']} for i in range(5000)]}
+    started = time.perf_counter()
+    big_graph = build_related_graph(big)
+    elapsed = time.perf_counter() - started
+    print(f"✓ Built {len(big_graph):,}-career graph in {elapsed:.2f}s")
+    assert big_graph.related('Career 10')[0][0] in ('Career 9', 'Career 11', 'Career 3010')
+    
+    print("\n✅ Related Careers: PASSED\n")
+
+
+def test_catalog_ingest():
+    """Test streaming CSV ingestion into the compiled catalog"""
+    print("=" * 60)
+    print("TEST 25: Catalog Ingestion")
+    print("=" * 60)
+    
+    import csv
+    import json
+    import os
+    import shutil
+    import tempfile
+    import time
+    from pathlib import Path
+    from modules.catalog_ingest import ingest, normalise_key, normalise_row
+    from modules.catalog_store import SOURCE_PATHS, CatalogReader, CatalogStore
+    from modules.uk_programmes import UK_PROGRAMMES
+    
+    assert normalise_key('Le Wagon – Full-Stack Web Dev.') == normalise_key('le wagon full stack web dev')
+    _, record = normalise_row('careers', {
+        'field': 'Tech', 'title': '  Data   Engineer ', 'entry_salary': '£32,000', 'year_5_salary': '50k',
+        'senior_salary': 75000, 'growth_rate': '12%', 'skills': 'SQL; Python;Spark', 'remote_friendly': 'Yes'
+    })
+    assert record['title'] == 'Data Engineer' and record['year_5_salary'] == 50000
+    assert record['growth_rate'] == 0.12 and record['skills'] == ['SQL', 'Python', 'Spark']
+    assert record['remote_friendly'] is True
+    
+    # Growth rates: '%' means percent, a bare number is a fraction, and never both readings
+    career = {'field': 'Tech', 'title': 'X', 'entry_salary': 1, 'year_5_salary': 1, 'senior_salary': 1}
+    for raw, rate in [('12%', 0.12), ('0.12', 0.12), ('0.5', 0.5), ('0.5%', 0.005), ('1', 1.0), ('2%', 0.02), (0.08, 0.08)]:
+        assert normalise_row('careers', dict(career, growth_rate=raw))[1]['growth_rate'] == rate, raw
+    for raw in ('2', '12', 15):
+        try:
+            normalise_row('careers', dict(career, growth_rate=raw))
+            assert False, f"{raw!r} should be rejected"
+        except ValueError as e:
+            assert 'growth_rate' in str(e)
+    
+    header = ['Pathway', 'Programme Name', 'Type', 'Location', 'Duration', 'Cost',
+              'Entry Requirements', 'Starting Salary', 'Link', 'Tags', 'Ranking']
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        export = Path(tmp) / 'programmes.csv'
+        artifact = Path(tmp) / 'catalog.bin'
+        sources = {name: Path(tmp) / path.name for name, path in SOURCE_PATHS.items()}
+        for name, path in SOURCE_PATHS.items():
+            shutil.copy(path, sources[name])
+        with open(export, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerow(['Micro-Credentials', 'Northcoders - Data Engineering', 'Bootcamp', 'Leeds (+ Remote)',
+                             '13 weeks', '£8,500', 'None', '£29,000', 'https://northcoders.com', 'Intensive; Career Switcher', ''])
+            # Near-duplicate of the row above - replaces it
+            writer.writerow(['Micro-Credentials', 'NORTHCODERS – Data Engineering.', 'Bootcamp', 'Leeds, UK',
+                             '13 weeks', '8500', 'None', '30000', 'https://northcoders.com', 'intensive', ''])
+            # Updates a programme already in the catalog
+            writer.writerow(['Apprenticeship', 'Google Software Engineering Apprenticeship', 'Apprenticeship',
+                             'London, UK', '3 years', '-60000', 'A-Levels', '48000', 'https://google.com', '', '2'])
+            writer.writerow(['', 'No pathway', 'Bootcamp', 'Leeds', '1 year', 'free', '', '1', 'not a link', '', ''])
+        
+        report = ingest('programmes', export, source_paths=sources, artifact_path=artifact)
+        print(f"✓ {report['rows']} rows: {report['accepted']} accepted, {report['rejected']} rejected, "
+              f"{report['duplicates']} duplicate, {report['updated']} updated")
+        assert (report['accepted'], report['rejected'], report['duplicates'], report['updated']) == (3, 1, 1, 1)
+        assert report['errors'][0][0] == 5 and 'pathway is required' in report['errors'][0][1]
+        
+        programmes = CatalogReader(artifact).table('programmes').grouped()
+        leeds = [p for p in programmes['Micro-Credentials'] if 'Data Engineering' in p['name']]
+        assert len(leeds) == 1 and leeds[0]['starting_salary'] == 30000 and leeds[0]['fit_tags'] == ['intensive']
+        google = [p for p in programmes['Apprenticeship'] if p['name'].startswith('Google')]
+        assert len(google) == 1 and google[0]['starting_salary'] == 48000 and google[0]['ranking'] == 2
+        assert sum(map(len, programmes.values())) == sum(map(len, UK_PROGRAMMES.values())) + 1
+        
+        # The data file holds the merge, and hand edits to it still recompile
+        assert json.loads(sources['programmes'].read_text()) == programmes
+        store = CatalogStore(artifact, sources, check_seconds=0)
+        version = store.version
+        edited = json.loads(sources['programmes'].read_text())
+        edited['Apprenticeship'][0]['cost'] = -1
+        sources['programmes'].write_text(json.dumps(edited))
+        os.utime(sources['programmes'], ns=(1, 1))  # Guarantee a different mtime
+        assert store.version == version + 1
+        assert store.snapshot('programmes')[1]['Apprenticeship'][0]['cost'] == -1
+        
+        # Bulk export: thousands of rows, a third of them repeats
+        with open(export, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for i in range(30000):
+                n = i % 20000
+                writer.writerow(['Local University', f'Provider {n} - Course {n % 97}', 'University', 'Leeds, UK',
+                                 '3 years', f'£{20000 + n:,}', 'BBB', '27,000', 'https://example.ac.uk', 'structured', ''])
+        started = time.perf_counter()
+        report = ingest('programmes', export, replace=True, source_paths=sources, artifact_path=artifact)
+        elapsed = time.perf_counter() - started
+        print(f"✓ {report['rows']:,} rows -> {report['records']:,} programmes in {elapsed:.2f}s")
+        assert report['records'] == 20000 and report['duplicates'] == 10000
+        assert elapsed < 10
+    
+    print("\n✅ Catalog Ingestion: PASSED\n")
+
+
+def test_import_budget():
+    """Test that cold start stays cheap: nothing heavy is imported until it's needed"""
+    print("=" * 60)
+    print("TEST 26: Import-Time Budget")
+    print("=" * 60)
+    
+    import json
+    import subprocess
+    import sys
+    from pathlib import Path
+    
+    IMPORT_BUDGET_SECONDS = 0.05  # Cold `import modules`, and `import app`, in a fresh interpreter
+    HEAVY_MODULES = ['pandas', 'numpy', 'plotly', 'requests', 'sqlite3', 'streamlit']
+    root = Path(__file__).resolve().parent
+    
+    # Fresh interpreter, like a new Streamlit worker; best of 3 to ignore scheduler noise
+    probe = (
+        "import json, sys, time\n"
+        "started = time.perf_counter()\n"
+        "import modules\n"
+        "elapsed = time.perf_counter() - started\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "lazy = 'modules.roi_calculator' not in sys.modules\n"
+        "calculator = modules.ROICalculator\n"
+        "print(json.dumps({'elapsed': elapsed, 'heavy': heavy, 'lazy': lazy, 'resolved': calculator.__name__}))\n"
+    )
+    runs = []
+    for _ in range(3):
+        output = subprocess.run([sys.executable, '-c', probe], cwd=root, capture_output=True, text=True, check=True)
+        runs.append(json.loads(output.stdout))
+    best = min(runs, key=lambda run: run['elapsed'])
+    
+    print(f"✓ import modules: {best['elapsed'] * 1000:.1f}ms (budget {IMPORT_BUDGET_SECONDS * 1000:.0f}ms)")
+    assert best['heavy'] == [], f"Heavy modules imported eagerly: {best['heavy']}"
+    assert best['lazy'], "Submodules should load on first attribute access"
+    assert best['resolved'] == 'ROICalculator'
+    assert best['elapsed'] < IMPORT_BUDGET_SECONDS, f"Cold import regressed: {best['elapsed']:.3f}s"
+    
+    # app.py's top level, the way a new worker runs it: streamlit itself is replaced by
+    # a no-op stub so only app.py's own import work is timed - an eager pandas/requests
+    # import at the top would blow the budget (or fail outright where they're missing)
+    app_probe = (
+        "import json, sys, time, types\n"
+        "def stub(*args, **kwargs):\n"  # st.markdown(...), and @st.cache_resource with or without args
+        "    return args[0] if len(args) == 1 and callable(args[0]) else stub\n"
+        "streamlit = types.ModuleType('streamlit')\n"
+        "streamlit.__getattr__ = lambda name: stub\n"
+        "streamlit.session_state = {}\n"
+        "sys.modules['streamlit'] = streamlit\n"
+        "started = time.perf_counter()\n"
+        "import app\n"
+        "elapsed = time.perf_counter() - started\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules and m != 'streamlit']\n"
+        "print(json.dumps({'elapsed': elapsed, 'heavy': heavy}))\n"
+    )
+    runs = []
+    for _ in range(3):
+        output = subprocess.run([sys.executable, '-c', app_probe], cwd=root, capture_output=True, text=True)
+        assert output.returncode == 0, f"import app failed:\n{output.stderr}"
+        runs.append(json.loads(output.stdout))
+    best = min(runs, key=lambda run: run['elapsed'])
+    
+    print(f"✓ import app: {best['elapsed'] * 1000:.1f}ms (budget {IMPORT_BUDGET_SECONDS * 1000:.0f}ms)")
+    assert best['heavy'] == [], f"app.py imports heavy modules at the top: {best['heavy']}"
+    assert best['elapsed'] < IMPORT_BUDGET_SECONDS, f"app.py cold import regressed: {best['elapsed']:.3f}s"
+    
+    print("\n✅ Import-Time Budget: PASSED\n")
+
+
+def test_adzuna_client():
+    """Test AdzunaAPI end to end against the fake server: paging, retries, fallbacks, coalescing"""
+    print("=" * 60)
+    print("TEST 27: Adzuna Client")
+    print("=" * 60)
+    
+    try:
+        import requests  # noqa: F401
+    except ImportError:
+        print("\n⚠️  requests not installed - skipping\n")
+        return
+    
+    import json
+    import tempfile
+    import threading
+    from pathlib import Path
+    from fake_adzuna_server import fixture_name, start_fake_server
+    from modules.adzuna_api import BACKOFF_CAP_SECONDS, AdzunaAPI, _job_demand_flights
+    from modules.adzuna_cache import JobDataCache
+    from modules.quota_scheduler import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, QuotaScheduler
+    from modules.rate_limiter import RateLimiter
+    
+    def client(base_url, **options):
+        api = AdzunaAPI('test', 'test', base_url=base_url, limiter=options.pop('limiter', RateLimiter([(1000, 60)])),
+                        session=requests.Session(), **options)
+        # Record the backoff the client chose, but don't actually wait
+        api.delays = []
+        choose = api._backoff_delay
+        api._backoff_delay = lambda attempt, retry_after=None: api.delays.append(choose(attempt, retry_after)) or 0
+        return api
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = Path(tmp)
+        jobs = [{'id': str(i), 'salary_min': 30000, 'salary_max': 40000} for i in range(25)]
+        (fixtures / fixture_name('Exact')).write_text(json.dumps({'count': 20, 'results': jobs[:20]}))
+        (fixtures / fixture_name('Short')).write_text(json.dumps({'count': 25, 'results': jobs}))
+        (fixtures / fixture_name('Overstated')).write_text(json.dumps({'count': 100, 'results': jobs}))
+        
+        server, base_url = start_fake_server(fixtures_dir=fixtures)
+        state = server.RequestHandlerClass.state
+        try:
+            api = client(base_url)
+            
+            # Paging stops at the reported count (on a full or a short last page),
+            # at an empty page when the count overstates, and at max_pages
+            for query, max_pages, pages, postings in [('Exact', None, 2, 20), ('Short', None, 3, 25),
+                                                      ('Overstated', None, 4, 25), ('Short', 2, 2, 20)]:
+                state.stats['requests'] = 0
+                got = list(api.iter_job_results(query, results_per_page=10, max_pages=max_pages))
+                assert (state.stats['requests'], len(got)) == (pages, postings), (query, max_pages)
+            print("✓ Paging stops at the count, an empty page and max_pages")
+            
+            # 5xx is retried with backoff
+            def recover(attempt, retry_after=None):
+                api.delays.append(attempt)
+                state.error_rate = 0.0
+                return 0
+            state.error_rate = 1.0
+            api._backoff_delay = recover
+            assert api.get_job_demand('Retried')['success'] and api.delays == [0]
+            
+            # 429 is retried after the server's Retry-After (capped)
+            api = client(base_url)
+            state.rate_limit_per_minute = 1
+            api.get_job_demand('Throttled A')
+            
+            def lift_throttle(attempt, retry_after=None):
+                api.delays.append(AdzunaAPI._backoff_delay(api, attempt, retry_after))
+                state.rate_limit_per_minute = None
+                return 0
+            api._backoff_delay = lift_throttle
+            assert api.get_job_demand('Throttled B')['success']
+            assert api.delays == [BACKOFF_CAP_SECONDS]  # Retry-After ~60s, not the 0-0.5s jitter
+            print(f"✓ 5xx and 429 retried (429 waited {api.delays[0]}s)")
+            
+            # Upstream keeps failing: the last cached answer is served, marked stale
+            cached = client(base_url, cache=JobDataCache(path=None, ttl_seconds=0), max_retries=1)
+            fresh = cached.get_job_demand('Stale Fallback')
+            state.error_rate = 1.0
+            stale = cached.get_job_demand('Stale Fallback')
+            state.error_rate = 0.0
+            assert stale['stale'] and stale['total_jobs'] == fresh['total_jobs']
+            assert len(cached.delays) == 1  # The failure was retried before falling back
+            print("✓ Stale cache served while upstream fails")
+            
+            # Identical titles - within a call and across concurrent calls - cost one request each
+            state.latency_ms = 200
+            state.stats['requests'] = 0
+            coalesced = _job_demand_flights.coalesced
+            api = client(base_url)
+            titles = ['Flight A', 'Flight B', 'Flight A']
+            workers = [threading.Thread(target=api.get_job_demand_many, args=(titles,)) for _ in range(3)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            state.latency_ms = 0
+            assert state.stats['requests'] == 2
+            assert _job_demand_flights.coalesced - coalesced == 4
+            print("✓ 3 concurrent calls for the same 2 titles -> 2 upstream requests")
+            
+            # A request the monthly quota refuses is never sent and gives back its token
+            scheduler = QuotaScheduler(Path(tmp) / 'quota.sqlite3', monthly_quota=10)
+            for _ in range(7):
+                scheduler.try_acquire(PRIORITY_INTERACTIVE)
+            limiter = RateLimiter([(5, 60)])
+            api = client(base_url, limiter=limiter, scheduler=scheduler)
+            state.stats['requests'] = 0
+            refused = api.get_job_demand('Background Refresh', priority=PRIORITY_BACKGROUND)
+            assert not refused['success'] and 'quota' in refused['error']
+            assert state.stats['requests'] == 0 and limiter.remaining()['per_60s'] == 5
+            print("✓ Quota refusal releases the rate-limit token")
+        finally:
+            server.shutdown()
+    
+    print("\n✅ Adzuna Client: PASSED\n")
+
+
 def run_full_simulation():
     """Run a complete user simulation"""
     print("\n" + "=" * 60)
@@ -219,6 +1467,29 @@ if __name__ == "__main__":
     recommendation = test_recommendation_engine(scores)
     roi_data = test_roi_calculator()
     test_edge_cases()
+    test_job_data_cache()
+    test_rate_limiter()
+    test_single_flight()
+    test_job_market_snapshot()
+    test_quantile_sketch()
+    test_job_history()
+    test_fake_adzuna_server()
+    test_quota_scheduler()
+    test_outcome_store()
+    test_outcome_index()
+    test_outcome_cohorts()
+    test_prediction_accuracy_batch()
+    test_follow_up_scheduler()
+    test_salary_calibration()
+    test_career_catalog()
+    test_programme_search()
+    test_programme_roi()
+    test_catalog_store()
+    test_catalog_search()
+    test_related_careers()
+    test_catalog_ingest()
+    test_import_budget()
+    test_adzuna_client()
     run_full_simulation()
     
     print("\n" + "=" * 60)